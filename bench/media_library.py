@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+
+from pathlib import Path
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from modules.media_library import MediaLibrary
+
+
+def glob_listing(root: Path) -> list[str]:
+    """What /list did before the library index, on every request"""
+    return [str(x.stem + x.suffix) for x in root.glob('*') if x.is_file()]
+
+
+def per_call_ms(fn, count: int) -> float:
+    started = time.perf_counter()
+    for _ in range(count):
+        fn()
+    return (time.perf_counter() - started) / count * 1e3
+
+
+def main():
+    """Lists a media directory of many files with the old per-request glob
+        and with the MediaLibrary index. Files are created in a temporary
+        directory unless --root points at an existing one, e.g. an NFS
+        mount.
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--files', type=int, default=100000, help='number of files to create')
+    parser.add_argument('--root', type=Path, help='existing media directory to list instead')
+    parser.add_argument('--calls', type=int, default=20, help='listings per variant')
+    args = parser.parse_args()
+    root = args.root
+    if root is None:
+        root = Path(tempfile.mkdtemp(prefix='pympvremote-bench-'))
+        for index in range(args.files):
+            Path(root, f'{index % 100:02d}-file{index:06d}.mkv').touch()
+    try:
+        started = time.perf_counter()
+        library = MediaLibrary(root, rescan_interval=3600)
+        print(f'index built in {(time.perf_counter() - started) * 1e3:.0f} ms, {library.listing(limit=0)[0]} files')
+        print(f'glob, all files           {per_call_ms(lambda: glob_listing(root), args.calls):10.3f} ms per request')
+        for label, kwargs in (('index, all files', {}),
+                              ('index, first 100', {'limit': 100}),
+                              ('index, page 500', {'offset': 50000, 'limit': 100}),
+                              ('index, prefix', {'prefix': '42-', 'limit': 100}),
+                              ('index, by size desc', {'sort': 'size', 'descending': True, 'limit': 100}),
+                              ('index, by mtime', {'sort': 'mtime', 'limit': 100})):
+            print(f'{label:25} {per_call_ms(lambda: library.listing(**kwargs), args.calls):10.3f} ms per request')
+        started = time.perf_counter()
+        library.rescan()
+        print(f'rescan fallback           {(time.perf_counter() - started) * 1e3:10.3f} ms')
+        library.stop()
+    finally:
+        if args.root is None:
+            shutil.rmtree(root)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+
+from pathlib import Path
+import argparse
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from modules.mpv import MPV
+from modules.mpvplayer import STATUS_PROPERTY_FORMATS
+
+
+def per_call_us(fn, count: int) -> float:
+    started = time.perf_counter()
+    for _ in range(count):
+        fn()
+    return (time.perf_counter() - started) / count * 1e6
+
+
+def main():
+    """Compares reading the status properties one by one with
+        MPV.get_properties, decoding nodes and with native formats.
+        Needs libmpv. Pass media to play so the properties have values.
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--calls', type=int, default=20000, help='status reads per variant')
+    parser.add_argument('media', nargs='*', help='files or urls to load before measuring')
+    args = parser.parse_args()
+    player = MPV(vo='null', ao='null')
+    for item in args.media:
+        player.loadfile(item, 'append-play')
+    if args.media:
+        player.wait_until_playing()
+    names = list(STATUS_PROPERTY_FORMATS)
+
+    def one_by_one():
+        return {name: player._get_property(name) for name in names}
+
+    print(f'{len(names)} properties per read, {args.calls} reads each')
+    for label, fn in (('one by one', one_by_one),
+                      ('get_properties, nodes', lambda: player.get_properties(names)),
+                      ('get_properties, native', lambda: player.get_properties(STATUS_PROPERTY_FORMATS))):
+        us = per_call_us(fn, args.calls)
+        print(f'{label:24} {us:8.2f} us per read {us / len(names):8.2f} us per property')
+    player.terminate()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import argparse
+import asyncio
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from fastapi import FastAPI
+import uvicorn
+
+from modules.requester import Requester
+from modules.async_requester import AsyncRequester
+from settings.client_settings import REQUEST_POOL_SIZE
+
+
+def stub_server(port: int) -> uvicorn.Server:
+    """Serves /mute and /status like the real server does, without mpv
+        behind them, so only the client and HTTP overhead is measured"""
+    app = FastAPI()
+    state = {'mute': False}
+
+    @app.post('/mute', status_code=202)
+    async def mute():
+        state['mute'] = not state['mute']
+        return {'message': f'mute set to {state["mute"]}'}
+
+    @app.get('/status')
+    async def status():
+        return {'mute': state['mute'], 'volume': 100.0, 'pause': False, 'filename': None, 'playlist_names': []}
+
+    server = uvicorn.Server(uvicorn.Config(app, host='127.0.0.1', port=port, log_level='warning'))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def summary(label: str, latencies: list[float]) -> None:
+    latencies = sorted(x * 1e3 for x in latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f'{label:28} p50 {statistics.median(latencies):7.2f} ms  p95 {p95:7.2f} ms')
+
+
+def timed(fn) -> float:
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+async def timed_async(coro) -> float:
+    started = time.perf_counter()
+    await coro
+    return time.perf_counter() - started
+
+
+async def async_runs(server: str, count: int, concurrency: int) -> None:
+    requester = AsyncRequester(server)
+    await requester.status()  # connect first
+    summary(f'httpx (http2={requester.http2}) mute', [await timed_async(requester.mute()) for _ in range(count)])
+    summary('httpx status', [await timed_async(requester.status()) for _ in range(count)])
+    started = time.perf_counter()
+    latencies = await asyncio.gather(*[timed_async(requester.mute()) for _ in range(concurrency)])
+    summary(f'httpx {concurrency} concurrent mute', latencies)
+    print(f'{"":28} all done after {(time.perf_counter() - started) * 1e3:.0f} ms')
+    await requester.close()
+
+
+def main():
+    """Compares command round-trip latency of the requests and httpx
+        backends, one command at a time and with many in flight. Starts a
+        stub server unless --server points at a running one.
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--server', help='e.g. http://127.0.0.1:5555, mute is toggled on it')
+    parser.add_argument('--port', type=int, default=5598, help='port of the stub server')
+    parser.add_argument('--count', type=int, default=500, help='sequential commands per variant')
+    parser.add_argument('--concurrency', type=int, default=100, help='commands sent at once')
+    args = parser.parse_args()
+    server = args.server
+    if server is None:
+        stub = stub_server(args.port)
+        server = f'http://127.0.0.1:{args.port}'
+    requester = Requester(server)
+    requester.status()  # connect first
+    summary('requests mute', [timed(requester.mute) for _ in range(args.count)])
+    summary('requests status', [timed(requester.status) for _ in range(args.count)])
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=REQUEST_POOL_SIZE) as executor:
+        latencies = list(executor.map(lambda _: timed(requester.mute), range(args.concurrency)))
+    summary(f'requests {args.concurrency} concurrent mute', latencies)
+    print(f'{"":28} all done after {(time.perf_counter() - started) * 1e3:.0f} ms')
+    asyncio.run(async_runs(server, args.count, args.concurrency))
+    if args.server is None:
+        stub.should_exit = True
+
+
+if __name__ == '__main__':
+    main()
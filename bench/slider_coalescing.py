@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+
+from pathlib import Path
+import argparse
+import sys
+import threading
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from PyQt6 import QtCore
+
+from qt.request_worker import RequestDispatcher, CommandCoalescer
+from settings.client_settings import REQUEST_POOL_SIZE, SLIDER_SEND_INTERVAL
+
+
+class FakeServer():
+    def __init__(self, latency: float) -> None:
+        """Stands in for the /seek endpoint, every request takes latency
+            seconds and the last value it received is what mpv plays
+
+        Args:
+            latency (float): seconds per request
+        """
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.received = 0
+        self.running = 0
+        self.peak = 0
+        self.value = None
+        self.applied = None
+
+    def seek(self, value: int, exact: bool = True) -> dict:
+        with self.lock:
+            self.received += 1
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        time.sleep(self.latency)
+        with self.lock:
+            self.running -= 1
+            self.value = value
+            self.applied = time.monotonic()
+        return {'success': True}
+
+
+class CountingDispatcher(RequestDispatcher):
+    """RequestDispatcher that counts the requests handed to it"""
+    dispatched = 0
+
+    def dispatch(self, fn, *args, **kwargs):
+        self.dispatched += 1
+        return super(CountingDispatcher, self).dispatch(fn, *args, **kwargs)
+
+
+def drag(app: QtCore.QCoreApplication, steps: int, rate: float, latency: float, coalesce: bool) -> dict:
+    """Moves a simulated slider through steps positions at rate events per
+        second and releases it, either sending every step through the
+        dispatcher or through a CommandCoalescer
+    """
+    pool = QtCore.QThreadPool()
+    pool.setMaxThreadCount(REQUEST_POOL_SIZE)
+    dispatcher = CountingDispatcher(pool)
+    coalescer = CommandCoalescer(dispatcher, SLIDER_SEND_INTERVAL)
+    server = FakeServer(latency)
+    result = {}
+
+    def send(position: int, final: bool) -> None:
+        if coalesce:
+            coalescer.submit('seek', server.seek, position, exact=final, final=final)
+        else:
+            dispatcher.dispatch(server.seek, position, exact=final, key='seek')
+
+    position = iter(range(steps))
+    timer = QtCore.QTimer()
+    timer.setInterval(int(1000 / rate))
+
+    def move() -> None:
+        step = next(position, None)
+        if step is None:
+            timer.stop()
+            result['released'] = time.monotonic()
+            send(steps - 1, True)
+            return
+        send(step, False)
+
+    timer.timeout.connect(move)
+    timer.start()
+    started = time.monotonic()
+    while (server.value != steps - 1 or server.running or pool.activeThreadCount()
+           or 'released' not in result):
+        app.processEvents(QtCore.QEventLoop.ProcessEventsFlag.AllEvents, 10)
+        if time.monotonic() - started > 60:
+            raise TimeoutError('drag did not settle')
+    pool.waitForDone()
+    result.update(sent=dispatcher.dispatched, received=server.received, peak=server.peak,
+                  settle_ms=(server.applied - result['released']) * 1e3)
+    return result
+
+
+def main():
+    """Drags a simulated playback slider and counts the seek requests it
+        causes, sending one request per slider step against coalescing them
+        with CommandCoalescer. The server is a stand-in that sleeps for the
+        given latency, so neither mpv nor a running server is needed.
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--steps', type=int, default=240, help='slider positions passed during the drag')
+    parser.add_argument('--rate', type=float, default=120, help='slider move events per second')
+    parser.add_argument('--latency', type=float, default=0.03, help='seconds one seek request takes')
+    args = parser.parse_args()
+    app = QtCore.QCoreApplication(sys.argv)
+    print(f'{args.steps} steps at {args.rate:.0f}/s, {args.latency * 1e3:.0f} ms per request, '
+          f'interval {SLIDER_SEND_INTERVAL * 1e3:.0f} ms')
+    for label, coalesce in (('per step', False), ('coalesced', True)):
+        res = drag(app, args.steps, args.rate, args.latency, coalesce)
+        print(f'{label:10} {res["sent"]:5} sent {res["received"]:5} reached server '
+              f'{res["peak"]:3} at once, final value applied {res["settle_ms"]:7.1f} ms after release')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+
+from pathlib import Path
+import argparse
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from fastapi.testclient import TestClient
+
+from modules import mpvapi
+
+
+def poll_uncached(player) -> dict:
+    """Reads the status the way /status did before the state cache, one
+        libmpv call per field"""
+    return {
+        'time_pos': player.time_pos,
+        'percent_pos': player.percent_pos,
+        'time_remaining': player.time_remaining,
+        'duration': player.duration,
+        'pause': player.pause,
+        'filename': player.filename,
+        'playlist_names': player.playlist_filenames,
+        'mute': player.mute,
+        'fullscreen': player.fullscreen,
+        'repeat': player.loop_playlist,
+        'volume': player.volume,
+        'playlist_pos': player.playlist_pos
+    }
+
+
+@mpvapi.app.get('/bench/status-uncached')
+def status_uncached():
+    return poll_uncached(mpvapi.player)
+
+
+def rate(fn, count: int) -> float:
+    started = time.perf_counter()
+    for _ in range(count):
+        fn()
+    return count / (time.perf_counter() - started)
+
+
+def main():
+    """Compares requests/sec of /status served from the state cache with
+        reading every field from libmpv per request. Starts the server's
+        mpv instance, so libmpv is required. Pass media to play so the
+        playback fields have values.
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--requests', type=int, default=2000, help='requests per variant')
+    parser.add_argument('media', nargs='*', help='files or urls to load before measuring')
+    args = parser.parse_args()
+    for item in args.media:
+        mpvapi.player.loadfile(item, 'append-play')
+    if args.media:
+        mpvapi.player.wait_until_playing()
+    client = TestClient(mpvapi.app)
+    etag = client.get('/status').headers['etag']
+    print(f'{args.requests} requests each, in process')
+    print(f'uncached /status    {rate(lambda: client.get("/bench/status-uncached"), args.requests):10.0f} req/s')
+    print(f'cached /status      {rate(lambda: client.get("/status"), args.requests):10.0f} req/s')
+    print(f'cached, 304         {rate(lambda: client.get("/status", headers={"If-None-Match": etag}), args.requests):10.0f} req/s')
+    # the status itself, without the HTTP stack around it
+    calls = args.requests * 10
+    print(f'poll per field      {rate(lambda: poll_uncached(mpvapi.player), calls):10.0f} calls/s')
+    print(f'cache snapshot      {rate(mpvapi.player_instance.state.snapshot, calls):10.0f} calls/s')
+    mpvapi.player.terminate()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+
+from ctypes import POINTER, byref, c_char, create_string_buffer
+from pathlib import Path
+import argparse
+import collections
+import ctypes
+import ctypes.util
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+
+class _StubSymbol():
+    """Stands in for a libmpv function, accepts argtypes and the like"""
+    def __init__(self, result=0) -> None:
+        self.result = result
+
+    def __call__(self, *args):
+        return self.result
+
+
+class _StubLibmpv():
+    """Just enough of libmpv for modules.mpv to import, nothing is ever
+        played. The stream callbacks under test are pure python."""
+    def __init__(self) -> None:
+        self.mpv_client_api_version = _StubSymbol(2 << 16)
+
+    def __getattr__(self, name: str) -> _StubSymbol:
+        symbol = _StubSymbol()
+        setattr(self, name, symbol)
+        return symbol
+
+
+def import_mpv():
+    """Imports the real modules.mpv, with the real libmpv if there is one
+        and the stub otherwise"""
+    if ctypes.util.find_library('mpv') is not None:
+        import modules.mpv
+        return modules.mpv
+    find_library, cdll = ctypes.util.find_library, ctypes.CDLL
+    ctypes.util.find_library = lambda name: 'libmpv-stub'
+    ctypes.CDLL = lambda name, *args, **kwargs: _StubLibmpv()
+    try:
+        import modules.mpv
+    finally:
+        ctypes.util.find_library, ctypes.CDLL = find_library, cdll
+    return modules.mpv
+
+
+mpv = import_mpv()
+from modules.spool_stream import SpoolFile, SpoolStream
+
+
+def open_stream(open_fn):
+    """Opens a stream through MPV.register_stream_protocol the way libmpv
+        does, by calling the registered open callback
+
+    Returns:
+        mpv.StreamCallbackInfo: the callbacks libmpv would call
+    """
+    player = mpv.MPV.__new__(mpv.MPV)
+    player.handle = None
+    player._stream_protocol_cbs = {}
+    player._stream_protocol_frontends = collections.defaultdict(dict)
+    player.register_stream_protocol('bench', open_fn)
+    open_backend = player._stream_protocol_cbs['bench'][0]
+    info = mpv.StreamCallbackInfo()
+    if open_backend(None, b'bench://file', byref(info)) != 0:
+        raise RuntimeError('open failed')
+    return info
+
+
+def read_all(info, bufsize: int) -> int:
+    buf = create_string_buffer(bufsize)
+    pointer = ctypes.cast(buf, POINTER(c_char))
+    total = 0
+    while (read := info.read(None, pointer, bufsize)) > 0:
+        total += read
+    return total
+
+
+def throughput(open_fn, size: int, bufsize: int) -> float:
+    """Reads a whole stream through its read callback
+
+    Returns:
+        float: throughput in MB/s
+    """
+    info = open_stream(open_fn)
+    started = time.perf_counter()
+    if read_all(info, bufsize) != size:
+        raise RuntimeError('short read')
+    elapsed = time.perf_counter() - started
+    info.close(None)
+    return size / elapsed / 1e6
+
+
+def seek_rate(open_fn, size: int, bufsize: int, count: int) -> float:
+    """Seeks to random offsets through the seek callback and reads one
+        buffer after each, like mpv probing and scrubbing
+
+    Returns:
+        float: seeks per second
+    """
+    info = open_stream(open_fn)
+    buf = create_string_buffer(bufsize)
+    pointer = ctypes.cast(buf, POINTER(c_char))
+    offsets = [random.randrange(size - bufsize) for _ in range(count)]
+    started = time.perf_counter()
+    for offset in offsets:
+        if info.seek(None, offset) != offset:
+            raise RuntimeError('seek failed')
+        info.read(None, pointer, bufsize)
+    elapsed = time.perf_counter() - started
+    info.close(None)
+    return count / elapsed
+
+
+def per_byte_loop(data: bytes, bufsize: int) -> float:
+    """read_backend as it was before bulk copies, copying one byte at a
+        time, kept as the baseline since it is no longer in modules.mpv
+
+    Returns:
+        float: throughput in MB/s
+    """
+    chunks = (data[x:x + bufsize] for x in range(0, len(data), bufsize))
+    frontend = mpv.GeneratorStream(lambda: chunks, len(data))
+
+    def read_backend(_userdata, buf, size):
+        chunk = frontend.read(size)
+        for i in range(len(chunk)):
+            buf[i] = chunk[i]
+        return len(chunk)
+    read = mpv.StreamReadFn(read_backend)
+    buf = create_string_buffer(bufsize)
+    pointer = ctypes.cast(buf, POINTER(c_char))
+    started = time.perf_counter()
+    while read(None, pointer, bufsize) > 0:
+        pass
+    return len(data) / (time.perf_counter() - started) / 1e6
+
+
+def main():
+    """Reports MB/s and seeks/sec through the stream protocol callbacks of
+        MPV.register_stream_protocol, driving the frontends the server
+        uses: GeneratorStream (read), FileStream and SpoolStream
+        (readinto). modules.mpv is imported as is, without libmpv only its
+        library symbols are stubbed out.
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--megabytes', type=int, default=64, help='data read per frontend')
+    parser.add_argument('--bufsize', type=int, default=64 * 1024, help='libmpv read buffer size')
+    parser.add_argument('--loop-megabytes', type=int, default=4, help='data read with the slow per-byte loop')
+    parser.add_argument('--seeks', type=int, default=20000, help='random seeks per frontend')
+    args = parser.parse_args()
+    size = args.megabytes * 1024 * 1024
+    data = bytes(range(256)) * (size // 256)
+    with tempfile.TemporaryDirectory(prefix='pympvremote-bench-') as directory:
+        path = Path(directory, 'stream.bin')
+        path.write_bytes(data)
+        spool = SpoolFile(path, size)
+        spool.extend(size)
+        spool.finish()
+
+        def generator_stream(_uri):
+            return mpv.GeneratorStream(lambda: (data[x:x + args.bufsize] for x in range(0, size, args.bufsize)), size)
+
+        frontends = (('GeneratorStream', generator_stream),
+                     ('FileStream', lambda _uri: mpv.FileStream(path)),
+                     ('SpoolStream', lambda _uri: SpoolStream(spool)))
+        print(f'buffer size {args.bufsize} bytes, {"real" if ctypes.util.find_library("mpv") else "stubbed"} libmpv')
+        print(f'{"per-byte loop":16} {per_byte_loop(data[:args.loop_megabytes * 1024 * 1024], args.bufsize):10.1f} MB/s')
+        for label, open_fn in frontends:
+            print(f'{label:16} {throughput(open_fn, size, args.bufsize):10.1f} MB/s')
+        for label, open_fn in frontends[1:]:
+            print(f'{label + " seek":16} {seek_rate(open_fn, size, args.bufsize, args.seeks):10.0f} seeks/s')
+
+
+if __name__ == '__main__':
+    main()
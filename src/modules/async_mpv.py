@@ -0,0 +1,159 @@
+from typing import Union
+import asyncio
+
+from .mpv import MPV, PropertyUnavailableError, lazy_decoder
+
+
+def _resolve(future: asyncio.Future, result=None, exception: Union[BaseException, None] = None) -> None:
+    if future.done():
+        return
+    if exception is not None:
+        future.set_exception(exception)
+    else:
+        future.set_result(result)
+
+
+class AsyncMPV():
+    def __init__(self, player: MPV) -> None:
+        """asyncio facade over an MPV instance. Replies, property changes
+            and events arrive on mpv's event thread and are handed to the
+            awaiting event loop with call_soon_threadsafe, so no call in
+            here blocks a thread.
+
+        Args:
+            player (MPV): the mpv instance to drive
+        """
+        self.player = player
+
+    async def command(self, name: str, *args, **kwargs):
+        """Runs an mpv command asynchronously, see man mpv(1)
+
+        Args:
+            name (str): command name, e.g. 'loadfile'
+
+        Returns:
+            the command's result, if any
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def callback(error, result):
+            loop.call_soon_threadsafe(_resolve, future, result, error)
+
+        self.player.command_async(name, *args, callback=callback, **kwargs)
+        return await future
+
+    async def get(self, name: str):
+        """Reads a property asynchronously
+
+        Args:
+            name (str): mpv property name, e.g. 'time-pos'
+
+        Returns:
+            the decoded value, None if the property is unavailable
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def callback(error, value):
+            if isinstance(error, PropertyUnavailableError):
+                error = None
+            loop.call_soon_threadsafe(_resolve, future, value, error)
+
+        self.player.get_property_async(name, callback=callback)
+        return await future
+
+    async def observe(self, name: str):
+        """Async iterator over the values of a property, starting with the
+            current one. Stops observing once the iteration is left.
+
+        Args:
+            name (str): mpv property name, e.g. 'pause'
+        """
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+
+        def observer(_name, value):
+            loop.call_soon_threadsafe(queue.put_nowait, value)
+
+        self.player.observe_property(name, observer)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self.player.unobserve_property(name, observer)
+
+    async def events(self, *event_types: str):
+        """Async iterator over mpv events, as dicts since the event memory
+            is only valid on the event thread
+
+        Args:
+            event_types (str): event names to listen for, e.g. 'end-file',
+                all events if none are given
+        """
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+
+        @self.player.event_callback(*event_types)
+        def handler(event):
+            loop.call_soon_threadsafe(queue.put_nowait, event.as_dict(decoder=lazy_decoder))
+
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            handler.unregister_mpv_events()
+
+    async def wait_for_property(self, name: str, cond=lambda val: val, timeout: Union[float, None] = None):
+        """Waits until cond evaluates to a truthy value on the named property
+
+        Args:
+            name (str): mpv property name, e.g. 'core-idle'
+            cond (function): called with each new value of the property
+            timeout (Union[float, None]): seconds to wait, None waits forever
+
+        Raises:
+            asyncio.TimeoutError: if the condition was not met in time
+
+        Returns:
+            the value cond returned
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def observer(_name, value):
+            try:
+                rv = cond(value)
+            except Exception as e:
+                loop.call_soon_threadsafe(_resolve, future, None, e)
+                return
+            if rv:
+                loop.call_soon_threadsafe(_resolve, future, rv)
+
+        # mpv reports the current value right after observing, so a condition
+        # that is already met resolves immediately
+        self.player.observe_property(name, observer)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self.player.unobserve_property(name, observer)
+
+    async def wait_until_playing(self, timeout: Union[float, None] = None) -> None:
+        """Waits until playback of the current title has started
+
+        Args:
+            timeout (Union[float, None]): seconds to wait, None waits forever
+        """
+        await self.wait_for_property('core-idle', lambda idle: not idle, timeout)
+
+    async def wait_until_paused(self, timeout: Union[float, None] = None) -> None:
+        """Waits until playback of the current title is paused or done
+
+        Args:
+            timeout (Union[float, None]): seconds to wait, None waits forever
+        """
+        await self.wait_for_property('core-idle', timeout=timeout)
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,408 @@
+import asyncio
+import hashlib
+import json
+from pathlib import Path
+from typing import Union
+from urllib.parse import quote
+
+from .b64_helper import encode_uri
+from .requester import Requester, PendingUploads, file_digest, known_digest, remember_digest
+from settings.client_settings import UPLOAD_CHUNK_SIZE, UPLOAD_PARALLEL_CHUNKS, UPLOAD_CHUNK_RETRIES, VERIFY_TLS, \
+    REQUEST_POOL_SIZE, REQUEST_RETRIES, REQUEST_RETRY_BACKOFF, REQUEST_CONNECT_TIMEOUT, REQUEST_TIMEOUT, \
+    PLAY_REQUEST_TIMEOUT, UPLOAD_REQUEST_TIMEOUT
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+RETRY_STATUSES = (502, 503, 504)
+
+
+class AsyncRequester():
+    def __init__(self, server: str) -> None:
+        """Same api calls as Requester, as coroutines on an httpx client.
+            HTTP/2 is used when the h2 package is installed and the server
+            offers it, then all calls share one connection; otherwise
+            they share a pool of keep-alive HTTP/1.1 connections. All
+            calls must be awaited on the same event loop.
+
+        Args:
+            server (str): the server address and port to connect with,
+                for example 'http://127.0.0.1:5555'
+
+        Raises:
+            ImportError: if httpx is not installed
+        """
+        if httpx is None:
+            raise ImportError('the httpx request backend needs httpx, install it with pip install -r requirements.txt')
+        self.server = server
+        self.play_timeout = httpx.Timeout(PLAY_REQUEST_TIMEOUT, connect=REQUEST_CONNECT_TIMEOUT)
+        self.upload_timeout = httpx.Timeout(UPLOAD_REQUEST_TIMEOUT, connect=REQUEST_CONNECT_TIMEOUT)
+        limits = httpx.Limits(max_connections=REQUEST_POOL_SIZE, max_keepalive_connections=REQUEST_POOL_SIZE)
+        # the transport retries connection attempts only, nothing was sent yet
+        try:
+            transport = httpx.AsyncHTTPTransport(verify=VERIFY_TLS, http2=True, limits=limits, retries=REQUEST_RETRIES)
+            self.http2 = True
+        except ImportError:
+            # http2 needs the h2 package
+            transport = httpx.AsyncHTTPTransport(verify=VERIFY_TLS, limits=limits, retries=REQUEST_RETRIES)
+            self.http2 = False
+        self.client = httpx.AsyncClient(transport=transport,
+                                        timeout=httpx.Timeout(REQUEST_TIMEOUT, connect=REQUEST_CONNECT_TIMEOUT))
+        # the status stream is read by a blocking worker thread for the whole session
+        self.blocking = Requester(server)
+        self.pending_uploads = PendingUploads(server)
+
+    async def close(self) -> None:
+        """Closes all connections
+        """
+        await self.client.aclose()
+
+    async def _get(self, url: str, **kwargs) -> 'httpx.Response':
+        # GET is idempotent, so it is retried on server errors and broken connections
+        for attempt in range(REQUEST_RETRIES + 1):
+            try:
+                res = await self.client.get(url, **kwargs)
+                if res.status_code not in RETRY_STATUSES or attempt == REQUEST_RETRIES:
+                    return res
+            except httpx.TransportError:
+                if attempt == REQUEST_RETRIES:
+                    raise
+            await asyncio.sleep(REQUEST_RETRY_BACKOFF * 2 ** attempt)
+
+    async def play(self, uri: str, local: bool, replace: bool) -> 'httpx.Response':
+        """Play or stream a file immediately
+
+        Args:
+            uri (str): either an http stream or path to server-side file
+            local (bool): whether or not the file is locally stored on server
+            replace (bool): sets clobber, if true then playing another item
+                when one is already playing will start the new one
+
+        Returns:
+            httpx.Response: Generic response item
+        """
+        encoded_uri = encode_uri(uri)
+        return await self.client.post(f'{self.server}/play?uri={encoded_uri}&replace={replace}&local={local}',
+                                      timeout=self.play_timeout)
+
+    async def stop(self) -> 'httpx.Response':
+        """Stops playing the current playlist/file, if possible
+
+        Returns:
+            httpx.Response: Generic response item
+        """
+        return await self.client.post(self.server + '/stop')
+
+    async def status(self) -> 'httpx.Response':
+        """Gets status from the player, response contains a dict
+            with a variety of data.
+
+        Returns:
+            httpx.Response: Generic response item
+        """
+        return await self._get(self.server + '/status')
+
+    def status_stream(self):
+        """Opens the server-sent event stream of status changes, see
+            Requester.status_stream. Not a coroutine.
+
+        Returns:
+            requests.Response: Streamed response, read it with iter_lines()
+        """
+        return self.blocking.status_stream()
+
+    async def pause(self) -> 'httpx.Response':
+        """Toggles pause status
+
+        Returns:
+            httpx.Response: Generic response item
+        """
+        return await self.client.post(self.server + '/pause')
+
+    async def stream(self, file: Path) -> 'httpx.Response':
+        """Streams a file to the server, which starts playing it as soon
+            as the first chunks arrive while the rest is still uploading.
+            Nothing is sent if the file was hashed before and the server
+            already has the same content, see Requester.stream.
+
+        Args:
+            file (Path): Client-side file to upload
+
+        Returns:
+            httpx.Response: Generic response item
+        """
+        digest = known_digest(file)
+        if digest is not None:
+            res = await self.client.post(f'{self.server}/blobs/{digest}/play', timeout=self.play_timeout)
+            if res.status_code != 404:
+                return res
+        return await self.client.post(f'{self.server}/stream/progressive', params={'filename': file.name},
+                                      content=self._read_chunks(file), timeout=self.upload_timeout,
+                                      headers={'Content-Type': 'application/octet-stream'})
+
+    async def _read_chunks(self, file: Path):
+        digest = hashlib.sha256()
+        with file.open('rb') as fo:
+            while content := await asyncio.to_thread(fo.read, 1024 * 1024):
+                digest.update(content)
+                yield content
+        remember_digest(file, digest.hexdigest())
+
+    async def flist(self, offset: int = 0, limit: Union[int, None] = None, prefix: str = '', sort: str = 'name', order: str = 'asc') -> 'httpx.Response':
+        """Gets list of files in the server's media directory
+
+        Args:
+            offset (int): number of files to skip
+            limit (Union[int, None]): maximum number of files, None for all
+            prefix (str): only list files whose name starts with this
+            sort (str): sort by 'name', 'size', 'mtime' or 'duration'
+            order (str): 'asc' or 'desc'
+
+        Returns:
+            httpx.Response: Generic response item
+        """
+        params = {'offset': offset, 'prefix': prefix, 'sort': sort, 'order': order}
+        if limit is not None:
+            params['limit'] = limit
+        return await self._get(self.server + '/list', params=params)
+
+    def media_url(self, name: str) -> str:
+        """Url a file in the server's media directory can be downloaded or
+            streamed from. Not a coroutine.
+
+        Args:
+            name (str): name as returned by flist()
+
+        Returns:
+            str: the url
+        """
+        return f'{self.server}/media/{quote(name)}'
+
+    async def upload(self, file: Path, target: str = 'media') -> 'httpx.Response':
+        """Uploads a file to the server in chunks, several at a time, see
+            Requester.upload. With HTTP/2 the chunks share one connection.
+
+        Args:
+            file (Path): Client-side file to upload
+            target (str): 'media' to store it in the media directory,
+                'stream' to play it once uploaded
+
+        Returns:
+            httpx.Response: Generic response item
+        """
+        stat = file.stat()
+        digest = await asyncio.to_thread(file_digest, file)
+        if target == 'media':
+            res = await self._get(f'{self.server}/blobs/{digest}')
+            if res.status_code == 200:
+                return await self.client.post(f'{self.server}/blobs/{digest}/media', params={'filename': file.name})
+        else:
+            res = await self.client.post(f'{self.server}/blobs/{digest}/play', timeout=self.play_timeout)
+            if res.status_code != 404:
+                return res
+        key = (str(file.resolve()), stat.st_size, stat.st_mtime, target)
+        session_status = None
+        pending = self.pending_uploads.get(key)
+        if pending is not None:
+            res = await self._get(f'{self.server}/uploads/{pending}')
+            if res.status_code == 200:
+                session_status = res.json()
+        if session_status is None:
+            res = await self.client.post(f'{self.server}/uploads', json={
+                'filename': file.name, 'size': stat.st_size, 'chunk_size': UPLOAD_CHUNK_SIZE, 'target': target,
+                'sha256': digest})
+            if res.status_code != 201:
+                return res
+            session_status = res.json()
+        upload_id = session_status['upload_id']
+        await asyncio.to_thread(self.pending_uploads.set, key, upload_id)
+        chunk_size = session_status['chunk_size']
+        limit = asyncio.Semaphore(UPLOAD_PARALLEL_CHUNKS)
+        tasks = [asyncio.ensure_future(self._upload_chunk(file, upload_id, index * chunk_size, chunk_size, limit))
+                 for index in session_status['missing']]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # chunks not sent yet are dropped, the upload resumes from what the server has
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        res = await self.client.post(f'{self.server}/uploads/{upload_id}/complete', timeout=self.upload_timeout)
+        await asyncio.to_thread(self.pending_uploads.discard, key)
+        return res
+
+    async def _upload_chunk(self, file: Path, upload_id: str, offset: int, chunk_size: int,
+                            limit: asyncio.Semaphore) -> None:
+        async with limit:
+            data = await asyncio.to_thread(self._read_chunk, file, offset, chunk_size)
+            headers = {'Content-Type': 'application/octet-stream', 'X-Chunk-Sha256': hashlib.sha256(data).hexdigest()}
+            for attempt in range(UPLOAD_CHUNK_RETRIES + 1):
+                try:
+                    res = await self.client.put(f'{self.server}/uploads/{upload_id}', params={'offset': offset},
+                                                content=data, headers=headers, timeout=self.upload_timeout)
+                    res.raise_for_status()
+                    return
+                except httpx.HTTPError:
+                    if attempt == UPLOAD_CHUNK_RETRIES:
+                        raise
+
+    def _read_chunk(self, file: Path, offset: int, chunk_size: int) -> bytes:
+        with file.open('rb') as fo:
+            fo.seek(offset)
+            return fo.read(chunk_size)
+
+    async def mute(self) -> 'httpx.Response':
+        """Toggle mute status on the player
+
+        Returns:
+            httpx.Response: Generic response item
+        """
+        return await self.client.post(self.server + '/mute')
+
+    async def fullscreen(self) -> 'httpx.Response':
+        """Toggles fullscreen status on the player
+
+        Returns:
+            httpx.Response: Generic response item
+        """
+        return await self.client.post(self.server + '/fullscreen')
+
+    async def repeat(self) -> 'httpx.Response':
+        """Toggles infinite and zero playlist/single looping on player
+
+        Returns:
+            httpx.Response: Generic response item
+        """
+        return await self.client.post(self.server + '/repeat')
+
+    async def seek(self, percent: float, exact: bool = True) -> 'httpx.Response':
+        """Seek to the specified place in file, if possible
+
+        Args:
+            percent (float): absolute percent position to seek too
+            exact (bool): seek to the exact position, otherwise to the
+                nearest keyframe, which is faster
+
+        Returns:
+            httpx.Response: Generic response item
+        """
+        return await self.client.post(f'{self.server}/seek?percent_pos={percent}&exact={str(exact).lower()}')
+
+    async def volume(self, volume: int) -> 'httpx.Response':
+        """Sets volume on the player
+
+        Args:
+            volume (int): volume to set, should be between 0 and 100
+
+        Returns:
+            httpx.Response: Generic response item
+        """
+        return await self.client.post(f'{self.server}/volume?volume={volume}')
+
+    async def playlist(self, plist: list[str], new: bool, index: int) -> 'httpx.Response':
+        """Sends a playlist and begins playing the specified position
+
+        Args:
+            plist (list[str]): list of items to pass to player
+            new (bool): whether this is a new or updated playlist
+            index (int): the index item to start playing, starting at zero
+
+        Returns:
+            httpx.Response: response item with the entry count and how
+                long the server took to load the playlist in elapsed_ms
+        """
+        plist_json = json.dumps({'plist': plist, 'new': new, 'index': index})
+        return await self.client.post(f'{self.server}/playlist/', content=plist_json,
+                                      headers={'Content-type': 'application/json', 'Accept': 'application/json'})
+
+    async def playlist_ops(self, ops: list[dict]) -> 'httpx.Response':
+        """Changes the playlist on the server in place, see
+            Requester.playlist_ops
+
+        Args:
+            ops (list[dict]): playlist operations
+
+        Returns:
+            httpx.Response: Generic response item
+        """
+        return await self.client.post(f'{self.server}/playlist/ops', json={'ops': ops})
+
+    async def saved_playlists(self) -> 'httpx.Response':
+        """Lists the playlists saved on the server
+
+        Returns:
+            httpx.Response: response item with 'playlists', each with
+                name, count and updated
+        """
+        return await self._get(f'{self.server}/playlists')
+
+    async def save_playlist(self, name: str, plist: list[str]) -> 'httpx.Response':
+        """Saves a playlist on the server, replacing one of the same name
+
+        Args:
+            name (str): name to save the playlist as
+            plist (list[str]): items of the playlist
+
+        Returns:
+            httpx.Response: Generic response item
+        """
+        return await self.client.put(f'{self.server}/playlists/{quote(name, safe="")}', json={'plist': plist})
+
+    async def saved_playlist(self, name: str) -> 'httpx.Response':
+        """Gets the items of a saved playlist
+
+        Args:
+            name (str): name of the playlist
+
+        Returns:
+            httpx.Response: response item with the items in 'plist'
+        """
+        return await self._get(f'{self.server}/playlists/{quote(name, safe="")}')
+
+    async def load_playlist(self, name: str, index: int = 0) -> 'httpx.Response':
+        """Plays a saved playlist, the server loads it without the items
+            being sent again
+
+        Args:
+            name (str): name of the playlist
+            index (int): the index item to start playing, starting at zero
+
+        Returns:
+            httpx.Response: response item with the entry count and
+                elapsed_ms
+        """
+        return await self.client.post(f'{self.server}/playlists/{quote(name, safe="")}/load', params={'index': index})
+
+    async def delete_playlist(self, name: str) -> 'httpx.Response':
+        """Deletes a saved playlist
+
+        Args:
+            name (str): name of the playlist
+
+        Returns:
+            httpx.Response: Generic response item
+        """
+        return await self.client.delete(f'{self.server}/playlists/{quote(name, safe="")}')
+
+    async def next(self) -> 'httpx.Response':
+        """Plays next playlist item, if possible
+
+        Returns:
+            httpx.Response: Generic response item
+        """
+        return await self.client.post(self.server + '/next')
+
+    async def previous(self) -> 'httpx.Response':
+        """Plays previous playlist item, if possible
+
+        Returns:
+            httpx.Response: Generic response item
+        """
+        return await self.client.post(self.server + '/previous')
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,146 @@
+from pathlib import Path
+import hashlib
+import os
+import re
+import shutil
+import time
+
+from .file_io import copy_into, COPY_CHUNK_SIZE
+
+_DIGEST = re.compile('[0-9a-f]{64}')
+
+
+class BlobStore():
+    def __init__(self, root: Path) -> None:
+        """Content addressed file store, every distinct file is kept once
+            under its sha256 digest, e.g. root/ab/abcdef...
+
+        Args:
+            root (Path): directory to keep the blobs in
+        """
+        self.root = root
+
+    def path(self, digest: str) -> Path:
+        """Location of a blob, whether it exists or not
+
+        Args:
+            digest (str): sha256 hex digest
+
+        Raises:
+            ValueError: if digest is not a sha256 hex digest
+
+        Returns:
+            Path: where the blob is stored
+        """
+        if not _DIGEST.fullmatch(digest):
+            raise ValueError(f'invalid digest {digest}')
+        return Path(self.root, digest[:2], digest)
+
+    def has(self, digest: str) -> bool:
+        """Checks whether a blob is stored
+
+        Args:
+            digest (str): sha256 hex digest
+
+        Returns:
+            bool: True if the blob exists
+        """
+        try:
+            return self.path(digest).is_file()
+        except ValueError:
+            return False
+
+    def add(self, source: Path, digest: str) -> Path:
+        """Moves a file into the store. If the blob already exists the
+            file is a duplicate and is deleted instead.
+
+        Args:
+            source (Path): file to store, its sha256 must be digest
+            digest (str): sha256 hex digest of the file
+
+        Returns:
+            Path: location of the blob
+        """
+        blob = self.path(digest)
+        if blob.is_file():
+            source.unlink()
+            return blob
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        shutil.move(source, blob)
+        return blob
+
+    def add_fileobj(self, fo) -> str:
+        """Stores the content of a file object, e.g. an upload that was
+            already spooled to disk. The data is only read to hash it and
+            not written at all if the blob already exists, otherwise it is
+            copied with copy_into.
+
+        Args:
+            fo: file object to store, read from the start
+
+        Returns:
+            str: sha256 hex digest of the content
+        """
+        fo.seek(0)
+        digest = hashlib.sha256()
+        while content := fo.read(COPY_CHUNK_SIZE):
+            digest.update(content)
+        digest = digest.hexdigest()
+        if not self.has(digest):
+            self.root.mkdir(parents=True, exist_ok=True)
+            tempfile = Path(self.root, f'{str(time.time())}.part')
+            copy_into(fo, tempfile)
+            self.add(tempfile, digest)
+        return digest
+
+    def link(self, digest: str, destination: Path) -> None:
+        """Makes a blob available under another name, as a hard link if
+            possible and as a copy otherwise
+
+        Args:
+            digest (str): sha256 hex digest of a stored blob
+            destination (Path): name to make the blob available as
+        """
+        blob = self.path(digest)
+        try:
+            os.link(blob, destination)
+        except OSError:
+            shutil.copyfile(blob, destination)
+
+    def discard_unlinked(self, digest: str) -> bool:
+        """Deletes a blob that no other name is a hard link of, e.g. one
+            stored for an upload that lost the race for its name
+
+        Args:
+            digest (str): sha256 hex digest
+
+        Returns:
+            bool: True if the blob was deleted
+        """
+        blob = self.path(digest)
+        try:
+            if blob.stat().st_nlink > 1:
+                return False
+            blob.unlink()
+        except FileNotFoundError:
+            return False
+        return True
+
+    def is_linked(self, digest: str, other: Path) -> bool:
+        """Checks whether a file is a hard link of a blob
+
+        Args:
+            digest (str): sha256 hex digest
+            other (Path): file to compare with
+
+        Returns:
+            bool: True if both are the same file
+        """
+        try:
+            return os.path.samefile(self.path(digest), other)
+        except (OSError, ValueError):
+            return False
+
+
+if __name__ == '__main__':
+    pass
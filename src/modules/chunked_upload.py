@@ -0,0 +1,234 @@
+from pathlib import Path
+from typing import Union
+import asyncio
+import hashlib
+import threading
+import time
+import uuid
+
+import aiofiles
+
+
+class ChecksumMismatchError(ValueError):
+    pass
+
+
+class UploadSession():
+    def __init__(self, upload_id: str, filename: str, size: int, chunk_size: int, target: str, path: Path,
+                 sha256: Union[str, None] = None) -> None:
+        """State of a single chunked upload. The file is preallocated and
+            chunks are written to their offsets as they come in, in any
+            order. The digest of the whole file is built up along the way
+            over the received prefix.
+
+        Args:
+            upload_id (str): id the client addresses the upload with
+            filename (str): name of the file being uploaded
+            size (int): final size in bytes
+            chunk_size (int): size of every chunk but the last one
+            target (str): 'media' or 'stream', where the file goes once done
+            path (Path): partial file the chunks are written to
+            sha256 (Union[str, None]): expected digest of the whole file
+        """
+        self.upload_id = upload_id
+        self.filename = filename
+        self.size = size
+        self.chunk_size = chunk_size
+        self.target = target
+        self.path = path
+        self.chunk_count = max((size + chunk_size - 1) // chunk_size, 1)
+        self.sha256 = sha256
+        self.received = set()
+        self.updated = time.time()
+        self.digest = hashlib.sha256()
+        self.hashed = 0
+        self._hash_lock = None
+
+    @property
+    def hash_lock(self) -> asyncio.Lock:
+        """Serializes hashing of the prefix, created on first use from the
+            event loop since sessions are created on the threadpool"""
+        if self._hash_lock is None:
+            self._hash_lock = asyncio.Lock()
+        return self._hash_lock
+
+    @property
+    def missing(self) -> list[int]:
+        return [x for x in range(self.chunk_count) if x not in self.received]
+
+    @property
+    def offset(self) -> int:
+        """Last committed offset, everything before it has been received"""
+        index = 0
+        while index in self.received:
+            index += 1
+        return min(index * self.chunk_size, self.size)
+
+    @property
+    def complete(self) -> bool:
+        return len(self.received) == self.chunk_count
+
+    @property
+    def hexdigest(self) -> Union[str, None]:
+        """sha256 of the whole file, None until every chunk was hashed"""
+        if self.hashed < self.chunk_count:
+            return None
+        return self.digest.hexdigest()
+
+    def chunk_length(self, index: int) -> int:
+        return min(self.chunk_size, self.size - index * self.chunk_size)
+
+    def as_dict(self) -> dict:
+        return {
+            'upload_id': self.upload_id,
+            'filename': self.filename,
+            'size': self.size,
+            'chunk_size': self.chunk_size,
+            'offset': self.offset,
+            'missing': self.missing
+        }
+
+
+class UploadManager():
+    def __init__(self, upload_dir: Path, max_idle: Union[float, None] = None) -> None:
+        """Keeps track of chunked uploads in progress
+
+        Args:
+            upload_dir (Path): directory to keep partial files in
+            max_idle (Union[float, None]): seconds without new chunks after
+                which an upload is abandoned, None to keep uploads forever
+        """
+        self.upload_dir = upload_dir
+        self.max_idle = max_idle
+        self.sessions = {}
+        self.lock = threading.Lock()
+
+    def create(self, filename: str, size: int, chunk_size: int, target: str, sha256: Union[str, None] = None) -> UploadSession:
+        """Starts a new upload
+
+        Args:
+            filename (str): name of the file being uploaded
+            size (int): final size in bytes
+            chunk_size (int): size of every chunk but the last one
+            target (str): 'media' or 'stream'
+            sha256 (Union[str, None]): expected digest of the whole file
+
+        Returns:
+            UploadSession: the new upload
+        """
+        upload_id = uuid.uuid4().hex
+        self.upload_dir.mkdir(parents=True, exist_ok=True)
+        path = Path(self.upload_dir, f'{upload_id}.part')
+        with path.open('wb') as fo:
+            fo.truncate(size)
+        session = UploadSession(upload_id, filename, size, chunk_size, target, path, sha256)
+        with self.lock:
+            self.sessions[upload_id] = session
+        return session
+
+    def get(self, upload_id: str) -> Union[UploadSession, None]:
+        with self.lock:
+            return self.sessions.get(upload_id)
+
+    async def write_chunk(self, session: UploadSession, offset: int, chunks, checksum: Union[str, None]) -> None:
+        """Writes one chunk from an async iterator of body parts, hashing
+            it on the way. The chunk only counts as received if the
+            checksum matches.
+
+        Args:
+            session (UploadSession): the upload the chunk belongs to
+            offset (int): byte offset of the chunk, a multiple of chunk_size
+            chunks: async iterator of bytes, e.g. request.stream()
+            checksum (Union[str, None]): expected sha256 hex digest
+
+        Raises:
+            ValueError: if the offset or length does not fit the upload
+            ChecksumMismatchError: if the data does not match the checksum
+        """
+        index, remainder = divmod(offset, session.chunk_size)
+        if remainder or not 0 <= index < session.chunk_count:
+            raise ValueError(f'offset {offset} is not the start of a chunk')
+        expected = session.chunk_length(index)
+        with self.lock:
+            session.received.discard(index)  # rewritten chunks count again once verified
+        # the next chunk of the prefix is added to the file digest while it streams in
+        file_digest = session.digest.copy() if index == session.hashed else None
+        digest = hashlib.sha256()
+        length = 0
+        async with aiofiles.open(session.path, 'r+b') as out_file:
+            await out_file.seek(offset)
+            async for content in chunks:
+                if not content:
+                    continue
+                length += len(content)
+                if length > expected:
+                    raise ValueError(f'chunk {index} is longer than {expected} bytes')
+                digest.update(content)
+                if file_digest is not None:
+                    file_digest.update(content)
+                await out_file.write(content)
+        if length != expected:
+            raise ValueError(f'chunk {index} is {length} bytes, expected {expected}')
+        if checksum is not None and digest.hexdigest() != checksum.lower():
+            raise ChecksumMismatchError(f'checksum mismatch for chunk {index}')
+        with self.lock:
+            session.received.add(index)
+            session.updated = time.time()
+        async with session.hash_lock:
+            if file_digest is not None and session.hashed == index:
+                session.digest = file_digest
+                session.hashed = index + 1
+            await self._hash_received(session)
+
+    async def finish_digest(self, session: UploadSession) -> Union[str, None]:
+        """Hashes received chunks that were not hashed yet, e.g. when the
+            upload is completed while the last chunk is still being hashed
+
+        Args:
+            session (UploadSession): the upload
+
+        Returns:
+            Union[str, None]: sha256 of the whole file, None if chunks are
+                missing
+        """
+        async with session.hash_lock:
+            await self._hash_received(session)
+        return session.hexdigest
+
+    async def _hash_received(self, session: UploadSession) -> None:
+        # chunks that arrived ahead of the prefix are read back, usually
+        # straight from the page cache. Unbuffered, since a read-ahead buffer
+        # would hold data from before later chunks were written.
+        if session.hashed not in session.received:
+            return
+        async with aiofiles.open(session.path, 'rb', buffering=0) as in_file:
+            while session.hashed in session.received:
+                await in_file.seek(session.hashed * session.chunk_size)
+                session.digest.update(await in_file.read(session.chunk_length(session.hashed)))
+                session.hashed += 1
+
+    def expire(self) -> None:
+        """Removes uploads that have been idle for longer than max_idle
+        """
+        if self.max_idle is None:
+            return
+        cutoff = time.time() - self.max_idle
+        with self.lock:
+            expired = [x.upload_id for x in self.sessions.values() if x.updated < cutoff]
+        for upload_id in expired:
+            self.remove(upload_id)
+
+    def remove(self, upload_id: str) -> None:
+        """Forgets an upload and deletes its partial file
+
+        Args:
+            upload_id (str): id of the upload
+        """
+        with self.lock:
+            session = self.sessions.pop(upload_id, None)
+        if session is not None:
+            session.path.unlink(missing_ok=True)
+
+
+if __name__ == '__main__':
+    pass
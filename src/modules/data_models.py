@@ -1,4 +1,4 @@
-from typing import Union
+from typing import Literal, Union
 
 from pydantic import BaseModel
 
@@ -9,6 +9,21 @@ class PlaylistItem(BaseModel):
     index: int
 
 
+class PlaylistSaveItem(BaseModel):
+    plist: list[str]
+
+
+class PlaylistOp(BaseModel):
+    op: Literal['append', 'insert', 'move', 'remove', 'jump']
+    item: Union[str, None] = None
+    index: Union[int, None] = None
+    to: Union[int, None] = None
+
+
+class PlaylistOpsItem(BaseModel):
+    ops: list[PlaylistOp]
+
+
 class StatusItem(BaseModel):
     time_pos: Union[float, None]
     percent_pos: Union[float, None]
@@ -28,5 +43,82 @@ class GenericItem(BaseModel):
     message: str
 
 
+class MediaEntryItem(BaseModel):
+    name: str
+    size: int
+    mtime: float
+    duration: Union[float, None]
+
+
+class PlaylistLoadItem(GenericItem):
+    count: int = 0
+    elapsed_ms: float = 0.0
+
+
+class SavedPlaylistItem(BaseModel):
+    name: str
+    count: int
+    updated: float
+
+
+class SavedPlaylistsItem(GenericItem):
+    playlists: list[SavedPlaylistItem] = []
+
+
+class SavedPlaylistContentItem(GenericItem):
+    plist: list[str] = []
+
+
+class PlaylistOpsResultItem(GenericItem):
+    applied: int
+
+
 class ListItem(GenericItem):
-    files: list[str]
\ No newline at end of file
+    files: list[str]
+    total: int = 0
+    entries: Union[list[MediaEntryItem], None] = None
+
+class UploadCreateItem(BaseModel):
+    filename: str
+    size: int
+    chunk_size: int
+    target: Literal['media', 'stream'] = 'media'
+    sha256: Union[str, None] = None
+
+
+class UploadStatusItem(GenericItem):
+    upload_id: Union[str, None] = None
+    filename: Union[str, None] = None
+    size: Union[int, None] = None
+    chunk_size: Union[int, None] = None
+    offset: Union[int, None] = None
+    missing: Union[list[int], None] = None
+
+
+class BlobItem(GenericItem):
+    digest: str
+    media: bool
+    stream: bool
+
+
+class SpoolItem(GenericItem):
+    used_bytes: int
+    files: int
+    max_bytes: int
+    max_age: float
+    evicted_files: int
+    evicted_bytes: int
+
+
+class ResolverStatsItem(GenericItem):
+    available: bool
+    hits: int
+    misses: int
+    disk_hits: int
+    extractions: int
+    failures: int
+    extract_seconds: float
+    wait_seconds: float
+    saved_seconds: float
+    cached: int
+    pending: int
@@ -1,6 +1,12 @@
 from pathlib import Path
+from typing import Union
+import io
+import os
+import shutil
+import tempfile
 
 URL_FILE = Path(__file__).parent.parent.parent / '.urls'
+COPY_CHUNK_SIZE = 1024 * 1024
 
 
 def save_urls(urls: list[str]) -> None:
@@ -29,5 +35,75 @@ def load_urls() -> list[str]:
         return []
 
 
+def write_m3u(destination: Path, entries: list[str]) -> None:
+    """Writes a playlist file that mpv can load in one go with loadlist
+
+    Args:
+        destination (Path): file to create, should end in .m3u8
+        entries (list[str]): absolute paths or urls, one per line
+
+    Raises:
+        ValueError: if an entry contains a line break
+    """
+    if any('\n' in x or '\r' in x for x in entries):
+        raise ValueError('playlist entries cannot contain line breaks')
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    with destination.open('w', encoding='utf8') as fo:
+        fo.write('#EXTM3U\n')
+        fo.writelines(f'{x}\n' for x in entries)
+
+
+def disk_fileno(fo) -> Union[int, None]:
+    """File descriptor of a file object if its data lives on disk, without
+        forcing spooled temporary files out of memory
+
+    Args:
+        fo: a file object, e.g. UploadFile.file
+
+    Returns:
+        Union[int, None]: the descriptor, None for in-memory files
+    """
+    if isinstance(fo, tempfile.SpooledTemporaryFile) and not getattr(fo, '_rolled', True):
+        return None
+    try:
+        return fo.fileno()
+    except (OSError, AttributeError, io.UnsupportedOperation):
+        return None
+
+
+def copy_into(fo, destination: Path) -> int:
+    """Copies the whole content of a file object into a new file. Data on
+        disk is copied in the kernel with copy_file_range, which file
+        systems with reflinks turn into a clone without writing the data
+        again. Everything else is copied through userspace.
+
+    Args:
+        fo: file object to copy from, read from the start
+        destination (Path): file to create
+
+    Returns:
+        int: number of bytes copied
+    """
+    src_fd = disk_fileno(fo)
+    with destination.open('wb') as out_file:
+        if src_fd is not None and hasattr(os, 'copy_file_range'):
+            size = os.fstat(src_fd).st_size
+            copied = 0
+            try:
+                while copied < size:
+                    count = os.copy_file_range(src_fd, out_file.fileno(), size - copied, copied)
+                    if count == 0:
+                        break
+                    copied += count
+                return copied
+            except OSError:
+                # e.g. across file systems on older kernels
+                out_file.seek(0)
+                out_file.truncate()
+        fo.seek(0)
+        shutil.copyfileobj(fo, out_file, COPY_CHUNK_SIZE)
+        return out_file.tell()
+
+
 if __name__ == '__main__':
     pass
@@ -0,0 +1,349 @@
+from pathlib import Path
+from typing import TYPE_CHECKING, Union
+import bisect
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import threading
+
+if TYPE_CHECKING:
+    # only for annotations, the library is usable without libmpv
+    from .mpv import MPV
+
+# inotify(7) event masks
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+
+_EVENT_HEADER = struct.Struct('iIII')
+
+SORT_KEYS = {
+    'name': lambda entry: entry.name.casefold(),
+    'size': lambda entry: entry.size,
+    'mtime': lambda entry: entry.mtime,
+    'duration': lambda entry: -1.0 if entry.duration is None else entry.duration
+}
+
+
+class MediaEntry():
+    __slots__ = ('name', 'size', 'mtime', 'duration')
+
+    def __init__(self, name: str, size: int, mtime: float, duration: Union[float, None] = None) -> None:
+        """A single file in the media library
+
+        Args:
+            name (str): path relative to the media directory, using forward
+                slashes
+            size (int): size in bytes
+            mtime (float): last modification time
+            duration (Union[float, None]): length in seconds, known once the
+                file has been played
+        """
+        self.name = name
+        self.size = size
+        self.mtime = mtime
+        self.duration = duration
+
+    def as_dict(self) -> dict:
+        return {'name': self.name, 'size': self.size, 'mtime': self.mtime, 'duration': self.duration}
+
+
+class _Inotify():
+    def __init__(self) -> None:
+        """Minimal ctypes binding of inotify(7)
+
+        Raises:
+            OSError: if inotify is unavailable on this platform
+        """
+        name = ctypes.util.find_library('c')
+        if name is None:
+            raise OSError('libc not found')
+        self.libc = ctypes.CDLL(name, use_errno=True)
+        self.libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+
+    def add_watch(self, path: Path, mask: int) -> int:
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f'cannot watch {path}')
+        return wd
+
+    def rm_watch(self, wd: int) -> None:
+        self.libc.inotify_rm_watch(self.fd, wd)
+
+    def read_events(self, timeout: float) -> list[tuple[int, int, str]]:
+        """Waits for and reads pending events
+
+        Args:
+            timeout (float): seconds to wait for events
+
+        Returns:
+            list[tuple[int, int, str]]: (watch descriptor, mask, name) of
+                each event
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+            events.append((wd, mask, name))
+        return events
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class MediaLibrary():
+    def __init__(self, root: Path, player: Union['MPV', None] = None, rescan_interval: float = 300.0) -> None:
+        """Index of all files below the media directory. It is built once
+            and then kept current by inotify, with a periodic rescan as
+            fallback for platforms and file systems (e.g. NFS) where
+            changes are not reported. Hidden files and directories are
+            left out.
+
+        Args:
+            root (Path): the media directory
+            player (Union[MPV, None]): if given, durations of library files
+                are recorded as they are played
+            rescan_interval (float): seconds between full rescans
+        """
+        self.root = Path(root).resolve()
+        self.rescan_interval = rescan_interval
+        self.entries = {}
+        self.version = 0
+        self.orders = {}
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.watches = {}
+        # the watcher thread and rescans both add and drop watches
+        self.watch_lock = threading.Lock()
+        try:
+            self.inotify = _Inotify()
+        except (OSError, AttributeError):
+            self.inotify = None
+        self.rescan()
+        if self.inotify is not None:
+            threading.Thread(target=self._watch_loop, name='MediaLibraryWatcher', daemon=True).start()
+        threading.Thread(target=self._rescan_loop, name='MediaLibraryRescan', daemon=True).start()
+        if player is not None:
+            self._playing_path = None
+            player.observe_property('path', self._on_path_change)
+            player.observe_property('duration', self._on_duration_change)
+
+    def stop(self) -> None:
+        """Stops watching the media directory
+        """
+        self.stopped.set()
+
+    def rescan(self) -> None:
+        """Walks the whole media directory and replaces the index, keeping
+            known durations of files that did not change
+        """
+        found = {}
+        if self.root.is_dir():
+            self._scan(self.root, found)
+        with self.lock:
+            for name, entry in found.items():
+                old = self.entries.get(name)
+                if old is not None and old.size == entry.size and old.mtime == entry.mtime:
+                    entry.duration = old.duration
+            if found.keys() != self.entries.keys() or any(
+                    (e.size, e.mtime) != (self.entries[n].size, self.entries[n].mtime) for n, e in found.items()):
+                self.entries = found
+                self._changed()
+
+    def get(self, name: str) -> Union[MediaEntry, None]:
+        """Looks up a single file
+
+        Args:
+            name (str): path relative to the media directory
+
+        Returns:
+            Union[MediaEntry, None]: the entry, None if it is not indexed
+        """
+        with self.lock:
+            return self.entries.get(name)
+
+    def listing(self, offset: int = 0, limit: Union[int, None] = None, prefix: str = '', sort: str = 'name', descending: bool = False) -> tuple[int, list[MediaEntry]]:
+        """One page of the library
+
+        Args:
+            offset (int): number of matching entries to skip
+            limit (Union[int, None]): maximum number of entries, None for all
+            prefix (str): only include names starting with this, ignoring case
+            sort (str): one of 'name', 'size', 'mtime' or 'duration'
+            descending (bool): reverse the sort order
+
+        Returns:
+            tuple[int, list[MediaEntry]]: number of matching entries and the
+                requested page of them
+        """
+        with self.lock:
+            ordered = self._ordered(sort)
+            if prefix:
+                folded = prefix.casefold()
+                if sort == 'name':
+                    keys = self._ordered_keys()
+                    start = bisect.bisect_left(keys, folded)
+                    end = bisect.bisect_left(keys, folded + '\U0010ffff', start)
+                    ordered = ordered[start:end]
+                else:
+                    ordered = [x for x in ordered if x.name.casefold().startswith(folded)]
+        total = len(ordered)
+        if descending:
+            start = max(total - offset - (total if limit is None else limit), 0)
+            page = ordered[start:max(total - offset, 0)][::-1]
+        else:
+            page = ordered[offset:None if limit is None else offset + limit]
+        return total, page
+
+    def _ordered(self, sort: str) -> list[MediaEntry]:
+        if sort not in self.orders:
+            self.orders[sort] = sorted(self.entries.values(), key=SORT_KEYS[sort])
+        return self.orders[sort]
+
+    def _ordered_keys(self) -> list[str]:
+        if 'name-keys' not in self.orders:
+            self.orders['name-keys'] = [x.name.casefold() for x in self._ordered('name')]
+        return self.orders['name-keys']
+
+    def _changed(self) -> None:
+        self.version += 1
+        self.orders = {}
+
+    def _name_for(self, path: Path) -> str:
+        return path.relative_to(self.root).as_posix()
+
+    def _scan(self, directory: Path, found: dict) -> None:
+        if self.inotify is not None:
+            self._add_watch(directory)
+        try:
+            with os.scandir(directory) as it:
+                for item in it:
+                    if item.name.startswith('.'):
+                        continue
+                    try:
+                        if item.is_dir():
+                            self._scan(Path(item.path), found)
+                        elif item.is_file():
+                            stat = item.stat()
+                            name = self._name_for(Path(item.path))
+                            found[name] = MediaEntry(name, stat.st_size, stat.st_mtime)
+                    except OSError:
+                        continue  # vanished while scanning
+        except OSError:
+            pass
+
+    def _add_watch(self, directory: Path) -> None:
+        try:
+            wd = self.inotify.add_watch(directory, WATCH_MASK)
+        except OSError:
+            return  # e.g. out of watches, the periodic rescan still covers it
+        with self.watch_lock:
+            self.watches[wd] = directory
+
+    def _update_file(self, path: Path) -> None:
+        name = self._name_for(path)
+        try:
+            stat = path.stat()
+        except OSError:
+            self._remove(name)
+            return
+        with self.lock:
+            old = self.entries.get(name)
+            if old is not None and old.size == stat.st_size and old.mtime == stat.st_mtime:
+                return
+            self.entries[name] = MediaEntry(name, stat.st_size, stat.st_mtime)
+            self._changed()
+
+    def _update_dir(self, directory: Path) -> None:
+        found = {}
+        self._scan(directory, found)
+        with self.lock:
+            self.entries.update(found)
+            self._changed()
+
+    def _remove(self, name: str, is_dir: bool = False) -> None:
+        with self.lock:
+            if is_dir:
+                below = f'{name}/'
+                removed = [x for x in self.entries if x.startswith(below)]
+            else:
+                removed = [name] if name in self.entries else []
+            for x in removed:
+                del self.entries[x]
+            if removed:
+                self._changed()
+
+    def _watch_loop(self) -> None:
+        while not self.stopped.is_set():
+            for wd, mask, name in self.inotify.read_events(1.0):
+                if mask & IN_Q_OVERFLOW:
+                    self.rescan()
+                    continue
+                with self.watch_lock:
+                    if mask & IN_IGNORED:
+                        self.watches.pop(wd, None)
+                        continue
+                    directory = self.watches.get(wd)
+                if directory is None or not name or name.startswith('.'):
+                    continue
+                path = Path(directory, name)
+                if mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        self._update_dir(path)
+                    elif mask & (IN_DELETE | IN_MOVED_FROM):
+                        self._remove(self._name_for(path), is_dir=True)
+                elif mask & (IN_DELETE | IN_MOVED_FROM):
+                    self._remove(self._name_for(path))
+                else:
+                    self._update_file(path)
+        self.inotify.close()
+
+    def _rescan_loop(self) -> None:
+        while not self.stopped.wait(self.rescan_interval):
+            self.rescan()
+
+    def _on_path_change(self, _name: str, path: Union[str, None]) -> None:
+        self._playing_path = path
+
+    def _on_duration_change(self, _name: str, duration: Union[float, None]) -> None:
+        if duration is None or self._playing_path is None:
+            return
+        try:
+            name = self._name_for(Path(self._playing_path).resolve())
+        except (ValueError, OSError):
+            return  # not a library file
+        with self.lock:
+            entry = self.entries.get(name)
+            if entry is not None and entry.duration != duration:
+                entry.duration = duration
+                self.orders.pop('duration', None)
+
+
+if __name__ == '__main__':
+    pass
@@ -25,6 +25,7 @@ from functools import partial, wraps
 from contextlib import contextmanager
 from concurrent.futures import Future, InvalidStateError
 import collections
+import queue
 import re
 import traceback
 
@@ -376,6 +377,103 @@ MpvNodeList._fields_ = [('num', c_int),
                         ('values', POINTER(MpvNode)),
                         ('keys', POINTER(c_char_p))]
 
+class MpvNodeView:
+    """Lazy, read-only view of an mpv node that only decodes the parts that are accessed. Indexing an array or map
+    returns another view for nested arrays and maps and the decoded value for anything else. ``project(key)`` picks a
+    single key out of every map in an array, e.g. the filenames of the ``playlist`` property, without decoding the rest
+    of each entry.
+
+    A view points into memory owned by libmpv. It is only valid until that node is freed, i.e. until the
+    ``MPV.property_node`` block is left or, for lazy property observers, until the observer returns.
+    """
+
+    def __init__(self, val, fmt=MpvFormat.NODE, decoder=identity_decoder):
+        while fmt == MpvFormat.NODE and val.node:
+            val, fmt = val.node.contents.val, val.node.contents.format.value
+        self._val = val
+        self._fmt = fmt
+        self._decoder = decoder
+
+    @property
+    def is_array(self):
+        return self._fmt == MpvFormat.NODE_ARRAY and bool(self._val.list)
+
+    @property
+    def is_map(self):
+        return self._fmt == MpvFormat.NODE_MAP and bool(self._val.map)
+
+    def _child(self, node):
+        if node.format.value in (MpvFormat.NODE_ARRAY, MpvFormat.NODE_MAP):
+            return MpvNodeView(node.val, node.format.value, self._decoder)
+        return node.node_value(self._decoder)
+
+    def _find(self, key):
+        ekey = key.encode('utf-8')
+        lst = self._val.map.contents
+        for i in range(lst.num):
+            if lst.keys[i] == ekey:
+                return lst.values[i]
+        raise KeyError(key)
+
+    def __len__(self):
+        if self.is_array:
+            return self._val.list.contents.num
+        if self.is_map:
+            return self._val.map.contents.num
+        return 0
+
+    def __getitem__(self, key):
+        if self.is_array:
+            lst = self._val.list.contents
+            if key < 0:
+                key += lst.num
+            if not 0 <= key < lst.num:
+                raise IndexError(key)
+            return self._child(lst.values[key])
+        if self.is_map:
+            return self._child(self._find(key))
+        raise TypeError('mpv node is neither an array nor a map')
+
+    def __iter__(self):
+        if self.is_map:
+            return iter(self.keys())
+        return (self[i] for i in range(len(self)))
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        if not self.is_map:
+            return []
+        lst = self._val.map.contents
+        return [ lst.keys[i].decode('utf-8') for i in range(lst.num) ]
+
+    def value(self):
+        """Decode the whole node, same as a regular property read."""
+        return MpvNode.node_cast_value(self._val, self._fmt, self._decoder)
+
+    def project(self, key, default=None):
+        """Return the decoded value of ``key`` for every map in this array, or ``default`` for elements lacking it."""
+        if not self.is_array:
+            return []
+        ekey = key.encode('utf-8')
+        lst = self._val.list.contents
+        rv = []
+        for i in range(lst.num):
+            element = lst.values[i]
+            value = default
+            if element.format.value == MpvFormat.NODE_MAP and element.val.map:
+                entries = element.val.map.contents
+                for j in range(entries.num):
+                    if entries.keys[j] == ekey:
+                        value = entries.values[j].node_value(self._decoder)
+                        break
+            rv.append(value)
+        return rv
+
 class MpvEvent(Structure):
     _fields_ = [('event_id', MpvEventID),
                 ('error', c_int),
@@ -590,6 +688,9 @@ _handle_func('mpv_wait_event',              [c_double],
 _handle_func('mpv_wakeup',                  [],                                         None, errcheck=None)
 _handle_func('mpv_set_wakeup_callback',     [WakeupCallback, c_void_p],                 None, errcheck=None)
 
+_handle_func('mpv_hook_add',                [c_ulonglong, c_char_p, c_int],             c_int, ec_errcheck)
+_handle_func('mpv_hook_continue',           [c_ulonglong],                              c_int, ec_errcheck)
+
 _handle_func('mpv_stream_cb_add_ro',        [c_char_p, c_void_p, StreamOpenFn],         c_int, ec_errcheck)
 
 _handle_func('mpv_render_context_create',               [MpvRenderCtxHandle, MpvHandle, POINTER(MpvRenderParam)],   c_int, ec_errcheck,     ctx=None)
@@ -660,6 +761,14 @@ def _make_node_str_map(d):
     return char_ps, node_list, node, cast(pointer(node), c_void_p)
 
 
+# native formats get_properties can fetch without going through an mpv node
+_SCALAR_PROPERTY_FORMATS = {
+    float:  (MpvFormat.DOUBLE,  c_double),
+    int:    (MpvFormat.INT64,   c_int64),
+    bool:   (MpvFormat.FLAG,    c_int),
+}
+
+
 def _event_generator(handle):
     while True:
         event = _mpv_wait_event(handle, -1).contents
@@ -717,36 +826,224 @@ class _DecoderPropertyProxy(_PropertyProxy):
 
 class GeneratorStream:
     """Transform a python generator into an mpv-compatible stream object. The total size of the file can be indicated to
-    mpv using the size argument to __init__. Seeking is not supported.
+    mpv using the size argument to __init__. Seeking forward skips data, seeking backward restarts the generator. For
+    sources that can seek natively, use FileStream, RingBufferStream or HTTPRangeStream instead.
     """
 
     def __init__(self, generator_fun, size=None):
         self._generator_fun = generator_fun
         self.size = size
+        self._restart()
 
-    def seek(self, offset):
+    def _restart(self):
         self._read_iter = iter(self._generator_fun())
-        self._read_chunk = b''
-        return 0 # We only support seeking to the first byte atm
-        # implementation in case seeking to arbitrary offsets would be necessary
-        # while offset > 0:
-        #     offset -= len(self.read(offset))
-        # return offset
+        self._read_chunk = memoryview(b'')
+        self._pos = 0
+
+    def seek(self, offset):
+        if offset < self._pos:
+            self._restart()
+        while self._pos < offset:
+            if not self.read(offset - self._pos):
+                break
+        return self._pos
 
     def read(self, size):
         if not self._read_chunk:
             try:
-                self._read_chunk += next(self._read_iter)
+                self._read_chunk = memoryview(next(self._read_iter))
             except StopIteration:
                 return b''
+        # slicing the memoryview avoids copying the rest of the chunk on every call
         rv, self._read_chunk = self._read_chunk[:size], self._read_chunk[size:]
-        return rv
+        self._pos += len(rv)
+        return bytes(rv)
 
     def close(self):
         self._read_iter = iter([]) # make next read() call return EOF
+        self._read_chunk = memoryview(b'')
 
     def cancel(self):
         self._read_iter = iter([]) # make next read() call return EOF
+        self._read_chunk = memoryview(b'')
+
+
+class FileStream:
+    """mpv-compatible stream object reading a local file through mmap. Supports arbitrary seeks and reads straight
+    into libmpv's buffer.
+    """
+
+    def __init__(self, path):
+        import mmap
+        self._file = open(path, 'rb')
+        self.size = os.fstat(self._file.fileno()).st_size
+        # mmap refuses empty files
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b''
+        self._view = memoryview(self._map)
+        self._pos = 0
+
+    def seek(self, offset):
+        self._pos = max(0, min(offset, self.size))
+        return self._pos
+
+    def readinto(self, buf):
+        n = max(0, min(len(buf), self.size - self._pos))
+        buf[:n] = self._view[self._pos:self._pos+n]
+        self._pos += n
+        return n
+
+    def read(self, size):
+        rv = bytes(self._view[self._pos:self._pos+size])
+        self._pos += len(rv)
+        return rv
+
+    def close(self):
+        self._view.release()
+        if self.size:
+            self._map.close()
+        self._file.close()
+
+
+class RingBufferStream:
+    """mpv-compatible stream object fed by a producer thread through ``write``. The last ``capacity`` bytes are kept in
+    memory, so mpv can seek anywhere within that window without the producer starting over. Reads and seeks ahead of
+    the producer block until the data is written or ``finish`` is called. ``write`` blocks while the buffer is full of
+    data mpv has not read yet.
+    """
+
+    def __init__(self, capacity, size=None):
+        self.size = size
+        self._buf = memoryview(bytearray(capacity))
+        self._capacity = capacity
+        self._start = 0 # stream offset of the oldest byte still held
+        self._end = 0 # stream offset one past the newest byte written
+        self._pos = 0
+        self._finished = False
+        self._cancelled = False
+        self._cond = threading.Condition()
+
+    def write(self, data):
+        data = memoryview(data)
+        while data:
+            with self._cond:
+                self._cond.wait_for(lambda: self._end - self._pos < self._capacity or self._cancelled)
+                if self._cancelled:
+                    return
+                # never overwrite data mpv has not read yet
+                n = min(len(data), self._capacity - (self._end - self._pos))
+                self._copy_in(data[:n])
+                self._end += n
+                self._start = max(self._start, self._end - self._capacity)
+                self._cond.notify_all()
+            data = data[n:]
+
+    def finish(self):
+        with self._cond:
+            self._finished = True
+            if self.size is None:
+                self.size = self._end
+            self._cond.notify_all()
+
+    def _copy_in(self, data):
+        off = self._end % self._capacity
+        first = min(len(data), self._capacity - off)
+        self._buf[off:off+first] = data[:first]
+        self._buf[:len(data)-first] = data[first:]
+
+    def _wait_readable(self):
+        self._cond.wait_for(lambda: self._end > self._pos or self._finished or self._cancelled)
+        return 0 if self._cancelled else self._end - self._pos
+
+    def readinto(self, buf):
+        with self._cond:
+            n = min(len(buf), self._wait_readable())
+            off = self._pos % self._capacity
+            first = min(n, self._capacity - off)
+            buf[:first] = self._buf[off:off+first]
+            buf[first:n] = self._buf[:n-first]
+            self._pos += n
+            self._cond.notify_all()
+            return n
+
+    def read(self, size):
+        buf = bytearray(size)
+        return bytes(buf[:self.readinto(memoryview(buf))])
+
+    def seek(self, offset):
+        with self._cond:
+            if offset < self._start:
+                return ErrorCode.GENERIC # already dropped from the window
+            self._cond.wait_for(lambda: self._end >= offset or self._finished or self._cancelled)
+            self._pos = min(offset, self._end)
+            self._cond.notify_all()
+            return self._pos
+
+    def close(self):
+        self.cancel()
+
+    def cancel(self):
+        with self._cond:
+            self._cancelled = True
+            self._cond.notify_all()
+
+
+class HTTPRangeStream:
+    """mpv-compatible stream object reading a remote file over HTTP. Seeking opens a new request with a ``Range``
+    header starting at the target offset instead of downloading everything before it.
+    """
+
+    def __init__(self, url, headers=None, timeout=30):
+        self.url = url
+        self._headers = headers or {}
+        self._timeout = timeout
+        self._response = None
+        self._pos = 0
+        self.size = None
+        self._open(0)
+
+    def _open(self, offset):
+        import urllib.request
+        if self._response is not None:
+            self._response.close()
+        req = urllib.request.Request(self.url, headers={**self._headers, 'Range': f'bytes={offset}-'})
+        self._response = urllib.request.urlopen(req, timeout=self._timeout)
+        content_range = self._response.headers.get('Content-Range')
+        if self._response.status == 206 and content_range:
+            total = content_range.rpartition('/')[2]
+            self.size = int(total) if total.isdigit() else None
+            self._pos = offset
+        else:
+            # server ignored the range, skip ahead the hard way
+            length = self._response.headers.get('Content-Length')
+            self.size = int(length) if length is not None else None
+            self._pos = 0
+            while self._pos < offset:
+                skipped = len(self._response.read(min(offset - self._pos, 1024*1024)))
+                if not skipped:
+                    break
+                self._pos += skipped
+
+    def seek(self, offset):
+        if offset != self._pos:
+            self._open(offset)
+        return self._pos
+
+    def readinto(self, buf):
+        n = self._response.readinto(buf) or 0
+        self._pos += n
+        return n
+
+    def read(self, size):
+        rv = self._response.read(size)
+        self._pos += len(rv)
+        return rv
+
+    def close(self):
+        if self._response is not None:
+            self._response.close()
+
+    def cancel(self):
+        self.close()
 
 
 class ImageOverlay:
@@ -868,8 +1165,11 @@ class MPV(object):
         self._command_reply_callbacks = {}
         self._event_handler_lock = threading.Lock()
         self._property_handlers = collections.defaultdict(lambda: [])
+        self._lazy_property_handlers = collections.defaultdict(lambda: [])
         self._quit_handlers = set()
         self._message_handlers = {}
+        self._hook_handlers = {}
+        self._hook_queue = None
         self._key_binding_handlers = {}
         self._event_handle = _mpv_create_client(self.handle, b'py_event_handler')
         self._log_handler = log_handler
@@ -877,6 +1177,11 @@ class MPV(object):
         self._stream_protocol_frontends = collections.defaultdict(lambda: {})
         self.register_stream_protocol('python', self._python_stream_open)
         self._python_streams = {}
+        self._python_stream_frontends = {}
+        self._property_buf_lock = threading.Lock()
+        self._property_node = MpvNode()
+        self._property_scalars = { kind: (fmt, ctype()) for kind, (fmt, ctype) in _SCALAR_PROPERTY_FORMATS.items() }
+        self._encoded_property_names = {}
         self._python_stream_catchall = None
         self.overlay_ids = set()
         self.overlays = {}
@@ -903,9 +1208,16 @@ class MPV(object):
 
                 if eid == MpvEventID.PROPERTY_CHANGE:
                     pc = event.data
-                    name, value, _fmt = pc.name, pc.value, pc.format
-                    for handler in self._property_handlers[name]:
-                        handler(name, value)
+                    name, _fmt = pc.name, pc.format
+                    # only decode the whole value if someone asked for it
+                    if self._property_handlers[name]:
+                        value = pc.value
+                        for handler in self._property_handlers[name]:
+                            handler(name, value)
+                    if self._lazy_property_handlers[name]:
+                        view = MpvNodeView(pc.data, pc.format.value, lazy_decoder)
+                        for handler in self._lazy_property_handlers[name]:
+                            handler(name, view)
 
                 if eid == MpvEventID.LOG_MESSAGE and self._log_handler is not None:
                     ev = event.data
@@ -918,7 +1230,12 @@ class MPV(object):
                     if target in self._message_handlers:
                         self._message_handlers[target](*args)
 
-                if eid == MpvEventID.COMMAND_REPLY:
+                if eid == MpvEventID.HOOK:
+                    # mpv waits for mpv_hook_continue, run the handler off the event thread so it may block
+                    ev = event.data
+                    self._hook_queue.put((self._hook_handlers.get(event.reply_userdata), ev.name, ev.id))
+
+                if eid in (MpvEventID.COMMAND_REPLY, MpvEventID.GET_PROPERTY_REPLY):
                     key = event.reply_userdata
                     callback = self._command_reply_callbacks.pop(key, None)
                     if callback:
@@ -1177,6 +1494,40 @@ class MPV(object):
         return future
 
 
+    def get_property_async(self, name, callback=None, decoder=lazy_decoder):
+        """Same as reading a property, but without blocking the calling thread. If you provide a callback, that callback
+        will be called with ``(error, value)`` on the event thread after completion or on error. This method returns a
+        future that evaluates to the result of the callback (if given), and the property value otherwise.
+
+        Usage example:
+
+            future = player.get_property_async('volume')
+            print('The volume is', future.result())
+        """
+
+        future = Future()
+        future.set_running_or_notify_cancel()
+
+        if callback is None:
+            def callback(error, value):
+                if error:
+                    raise error
+                return value
+
+        def wrapper(error, result):
+            try:
+                value = None if error else MpvNode.node_cast_value(result.data, result.format.value, decoder)
+                future.set_result(callback(error, value))
+            except Exception as e:
+                try:
+                    future.set_exception(e)
+                except InvalidStateError:
+                    pass
+
+        self._command_reply_callbacks[id(future)] = wrapper
+        _mpv_get_property_async(self._event_handle, id(future), name.encode('utf-8'), MpvFormat.NODE)
+        return future
+
     def node_command(self, name, *args, decoder=strict_decoder):
         self.command(name, *args, decoder=decoder)
 
@@ -1476,7 +1827,7 @@ class MPV(object):
     def af_command(self, label, command, argument):
         self.command('af_command', label, command, argument)
 
-    def observe_property(self, name, handler):
+    def observe_property(self, name, handler, lazy=False):
         """Register an observer on the named property. An observer is a function that is called with the new property
         value every time the property's value is changed. The basic function signature is ``fun(property_name,
         new_value)`` with new_value being the decoded property value as a python object. This function can be used as a
@@ -1493,8 +1844,15 @@ class MPV(object):
 
         exit_handler is a function taking no arguments that is called when the underlying mpv handle is terminated (e.g.
         from calling MPV.terminate() or issuing a "quit" input command).
+
+        If ``lazy`` is set, the handler is passed an ``MpvNodeView`` instead of the decoded value. The view is only
+        valid until the handler returns, which lets handlers interested in a small part of a large property such as
+        ``playlist`` skip decoding the rest of it.
         """
-        self._property_handlers[name].append(handler)
+        if lazy:
+            self._lazy_property_handlers[name].append(handler)
+        else:
+            self._property_handlers[name].append(handler)
         _mpv_observe_property(self._event_handle, hash(name)&0xffffffffffffffff, name.encode('utf-8'), MpvFormat.NODE)
 
     def property_observer(self, name):
@@ -1510,8 +1868,11 @@ class MPV(object):
         was originally registered as one handler could be registered for several properties. To unregister a handler
         from *all* observed properties see ``unobserve_all_properties``.
         """
-        self._property_handlers[name].remove(handler)
-        if not self._property_handlers[name]:
+        if handler in self._lazy_property_handlers[name]:
+            self._lazy_property_handlers[name].remove(handler)
+        else:
+            self._property_handlers[name].remove(handler)
+        if not self._property_handlers[name] and not self._lazy_property_handlers[name]:
             _mpv_unobserve_property(self._event_handle, hash(name)&0xffffffffffffffff)
 
     def unobserve_all_properties(self, handler):
@@ -1572,6 +1933,43 @@ class MPV(object):
             return handler
         return register
 
+    def register_hook(self, name, handler, priority=0):
+        """Register a handler for an mpv hook such as ``on_load``, see the HOOKS section of man mpv(1). mpv suspends
+        whatever triggered the hook until the handler returns. Handlers are called with the hook name, one after the
+        other on a worker thread, so they may block without holding up the event loop. libmpv has no way to remove a
+        hook again.
+
+            player = mpv.MPV()
+            @player.hook('on_load')
+            def my_handler(name):
+                print(player.stream_open_filename)
+        """
+        if self._hook_queue is None:
+            self._hook_queue = queue.Queue()
+            threading.Thread(target=self._hook_loop, name='MPVHookThread', daemon=True).start()
+        userdata = len(self._hook_handlers) + 1
+        self._hook_handlers[userdata] = handler
+        _mpv_hook_add(self._event_handle, userdata, name.encode('utf-8'), priority)
+
+    def hook(self, name, priority=0):
+        """Decorator to register a mpv hook handler, see ``register_hook``."""
+        def register(handler):
+            self.register_hook(name, handler, priority)
+            return handler
+        return register
+
+    def _hook_loop(self):
+        while True:
+            handler, name, hook_id = self._hook_queue.get()
+            try:
+                if handler is not None:
+                    handler(name)
+            except Exception:
+                print('Exception inside python-mpv hook handler:', file=sys.stderr)
+                traceback.print_exc()
+            finally:
+                _mpv_hook_continue(self._event_handle, hook_id)
+
     def register_event_callback(self, callback):
         """Register a blanket event callback receiving all event types.
 
@@ -1750,6 +2148,10 @@ class MPV(object):
                     return read # non-empty bytes object with input
                     return b'' # empty byte object signals permanent EOF
 
+                def readinto(self, buf): # optional, preferred over read() if present
+                    ...
+                    return n # number of bytes written into the writable memoryview buf, 0 signals EOF
+
                 def seek(self, pos): # optional
                     return new_offset # integer with new byte offset. The new offset may be before the requested offset
                     in case an exact seek is inconvenient.
@@ -1771,11 +2173,16 @@ class MPV(object):
                 except ValueError:
                     return ErrorCode.LOADING_FAILED
 
-                def read_backend(_userdata, buf, bufsize):
-                    data = frontend.read(bufsize)
-                    for i in range(len(data)):
-                        buf[i] = data[i]
-                    return len(data)
+                if hasattr(frontend, 'readinto'):
+                    def read_backend(_userdata, buf, bufsize):
+                        # Let the frontend fill libmpv's buffer directly without an intermediate bytes object
+                        view = memoryview((c_char * bufsize).from_address(addressof(buf.contents))).cast('B')
+                        return frontend.readinto(view) or 0
+                else:
+                    def read_backend(_userdata, buf, bufsize):
+                        data = frontend.read(bufsize)
+                        memmove(buf, data, len(data))
+                        return len(data)
 
                 cb_info.contents.cookie = None
                 read = cb_info.contents.read = StreamReadFn(read_backend)
@@ -1813,7 +2220,34 @@ class MPV(object):
     @property
     def playlist_filenames(self):
         """Return all playlist item file names/URLs as a list of strs."""
-        return [element['filename'] for element in self.playlist]
+        return self.project_property('playlist', 'filename') or []
+
+    @contextmanager
+    def property_node(self, name, decoder=lazy_decoder):
+        """Context manager yielding a lazy ``MpvNodeView`` of the named property, or None if it is unavailable. The
+        node is freed when the block is left, so nothing taken from the view may be used afterwards unless it was
+        decoded.
+
+            with player.property_node('track-list') as tracks:
+                langs = tracks.project('lang')
+        """
+        self.check_core_alive()
+        node = MpvNode()
+        try:
+            _mpv_get_property(self.handle, name.encode('utf-8'), MpvFormat.NODE, byref(node))
+        except PropertyUnavailableError:
+            yield None
+            return
+        try:
+            yield MpvNodeView(node.val, node.format.value, decoder)
+        finally:
+            _mpv_free_node_contents(byref(node))
+
+    def project_property(self, name, key, decoder=lazy_decoder):
+        """Return the value of ``key`` for every element of an array property such as ``playlist`` or ``track-list``,
+        decoding nothing else. Returns None if the property is unavailable."""
+        with self.property_node(name, decoder) as view:
+            return None if view is None else view.project(key)
 
     def playlist_append(self, filename, **options):
         """Append a path or URL to the playlist. This does not start playing the file automatically. To do that, use
@@ -1828,7 +2262,9 @@ class MPV(object):
         """
         name, = re.fullmatch('python://(.*)', uri).groups()
 
-        if name in self._python_streams:
+        if name in self._python_stream_frontends:
+            return self._python_stream_frontends[name]()
+        elif name in self._python_streams:
             generator_fun, size = self._python_streams[name]
         else:
             if self._python_stream_catchall is not None:
@@ -1875,6 +2311,33 @@ class MPV(object):
             return cb
         return register
 
+    def python_stream_frontend(self, name):
+        """Register a function returning a ready-made stream object (see ``register_stream_protocol``) for the python
+        stream with the given name. Unlike generators registered through @python_stream, objects such as FileStream,
+        RingBufferStream or HTTPRangeStream let libmpv seek without replaying the stream from its first byte.
+
+        The function is called each time libmpv opens the stream. To unregister it, call the .unregister function set
+        on the callback.
+
+        @mpv.python_stream_frontend('foobar')
+        def opener():
+            return FileStream('/path/to/file.mkv')
+        mpv.play('python://foobar')
+        mpv.wait_for_playback()
+        opener.unregister()
+        """
+        def register(cb):
+            if name in self._python_stream_frontends or name in self._python_streams:
+                raise KeyError('Python stream name "{}" is already registered'.format(name))
+            self._python_stream_frontends[name] = cb
+            def unregister():
+                if self._python_stream_frontends.get(name) is not cb:
+                    raise RuntimeError('Python stream has already been unregistered')
+                del self._python_stream_frontends[name]
+            cb.unregister = unregister
+            return cb
+        return register
+
     def python_stream_catchall(self, cb):
         """ Register a catch-all python stream to be called when no name matches can be found. Use this decorator on a
         function that takes a name argument and returns a (generator, size) tuple (with size being None if unknown).
@@ -1929,6 +2392,39 @@ class MPV(object):
         except PropertyUnavailableError as ex:
             return None
 
+    def get_properties(self, names, decoder=lazy_decoder):
+        """Read several properties in one pass and return a dict mapping each name to its value, with None for
+        unavailable properties.
+
+        ``names`` is either an iterable of property names or a dict mapping each name to ``float``, ``int`` or ``bool``
+        to fetch that property in the given native format, skipping mpv node allocation and decoding, or ``None`` to
+        fetch it as a regular node. The same node and scalar buffers are reused for every call.
+
+            player.get_properties({'volume': float, 'pause': bool, 'playlist-pos': int, 'filename': None})
+        """
+        self.check_core_alive()
+        if not isinstance(names, dict):
+            names = dict.fromkeys(names)
+        rv = {}
+        with self._property_buf_lock:
+            node = self._property_node
+            for name, kind in names.items():
+                ename = self._encoded_property_names.get(name)
+                if ename is None:
+                    ename = self._encoded_property_names[name] = name.encode('utf-8')
+                try:
+                    if kind in self._property_scalars:
+                        fmt, buf = self._property_scalars[kind]
+                        _mpv_get_property(self.handle, ename, fmt, byref(buf))
+                        rv[name] = kind(buf.value)
+                    else:
+                        _mpv_get_property(self.handle, ename, MpvFormat.NODE, byref(node))
+                        rv[name] = node.node_value(decoder=decoder)
+                        _mpv_free_node_contents(byref(node))
+                except PropertyUnavailableError:
+                    rv[name] = None
+        return rv
+
     def _set_property(self, name, value):
         self.check_core_alive()
         ename = name.encode('utf-8')
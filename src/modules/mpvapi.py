@@ -1,21 +1,41 @@
 from pathlib import Path
+from typing import Literal, Union
+import asyncio
+import hashlib
+import json
+import os
 import time
 
-from fastapi import FastAPI, UploadFile, File, Response
+from fastapi import FastAPI, UploadFile, File, Header, Request, Response
 from fastapi import status as fast_status
+from fastapi.responses import StreamingResponse, JSONResponse
+from fastapi.concurrency import run_in_threadpool
 import aiofiles
 
-from modules.data_models import PlaylistItem, StatusItem, GenericItem, ListItem
-from settings.server_settings import TEMP_DIR, MEDIA_DIR
+from modules.data_models import PlaylistItem, PlaylistLoadItem, PlaylistSaveItem, SavedPlaylistsItem, SavedPlaylistContentItem, PlaylistOpsItem, PlaylistOpsResultItem, StatusItem, GenericItem, ListItem, UploadCreateItem, UploadStatusItem, \
+    BlobItem, SpoolItem, ResolverStatsItem
+from settings.server_settings import TEMP_DIR, MEDIA_DIR, STATUS_STREAM_INTERVAL, STATUS_STREAM_KEEPALIVE, PROGRESSIVE_START_BYTES, \
+    PLAY_TIMEOUT, PAUSE_TIMEOUT, LIBRARY_RESCAN_INTERVAL, MAX_UPLOAD_CHUNK_SIZE, \
+    SPOOL_MAX_BYTES, SPOOL_MAX_AGE, SPOOL_CHECK_INTERVAL, PLAYLIST_DB, \
+    YTDL_FORMAT, YTDL_CACHE_TTL, YTDL_WORKERS, YTDL_PREFETCH_COUNT, YTDL_HOOK_TIMEOUT, YTDL_CACHE_DB
 from modules.mpvplayer import Player
+from modules.status_stream import StatusBroadcaster
+from modules.spool_stream import SpoolRegistry
+from modules.async_mpv import AsyncMPV
+from modules.media_library import MediaLibrary
+from modules.chunked_upload import UploadManager, ChecksumMismatchError
+from modules.blob_store import BlobStore
+from modules.spool_manager import SpoolManager
+from modules.range_response import RangeFileResponse
+from modules.playlist_store import PlaylistStore
+from modules.ytdl_resolver import YtdlResolver
 from modules.b64_helper import decode_uri
+from modules.file_io import write_m3u
 
 # how to stream data from python to mpv
-#     @player.python_stream('stream')
+#     @player.python_stream_frontend('stream')
 #     def stream_helper():
-#         with open(testfile, 'rb') as tfile:
-#             while True:
-#                 yield tfile.read(1024*1024)
+#         return FileStream(testfile)  # seekable, unlike a @player.python_stream generator
 
 #     player.loadfile('python://stream', 'replace')
 #     player.wait_until_playing()
@@ -24,24 +44,119 @@ from modules.b64_helper import decode_uri
 
 player_instance = Player()
 player = player_instance.get_player()
+aplayer = AsyncMPV(player)
+status_broadcaster = StatusBroadcaster(player_instance.state)
+spool_registry = SpoolRegistry(player, Path(TEMP_DIR, 'spool'))
+MEDIA_ROOT = MEDIA_DIR.resolve()
+media_library = MediaLibrary(MEDIA_DIR, player, LIBRARY_RESCAN_INTERVAL)
+upload_manager = UploadManager(Path(TEMP_DIR, 'uploads'), SPOOL_MAX_AGE)
+# uploads are stored once per content, media blobs stay on the media file system so names can be hard links
+media_blobs = BlobStore(Path(MEDIA_DIR, '.blobs'))
+stream_blobs = BlobStore(Path(TEMP_DIR, 'blobs'))
+# finished streams are kept as stream blobs, uploads/ is left to the upload manager
+spool_manager = SpoolManager([spool_registry.spool_dir, stream_blobs.root, Path(TEMP_DIR, 'playlists')], player,
+                             player_instance.state, SPOOL_MAX_BYTES, SPOOL_MAX_AGE, SPOOL_CHECK_INTERVAL,
+                             resolve_uri=lambda uri: spool_registry.resolve(uri) if '://' in uri else Path(uri))
+spool_manager.add_protector(spool_registry.active_paths)
+spool_manager.add_cleanup(spool_registry.prune)
+spool_manager.add_cleanup(lambda entries: upload_manager.expire())
+playlist_store = PlaylistStore(PLAYLIST_DB)
+# resolves upcoming remote playlist items ahead of time so tracks change without waiting on yt-dlp
+ytdl_resolver = YtdlResolver(player, player_instance.state, YTDL_FORMAT, YTDL_CACHE_TTL, YTDL_WORKERS,
+                             YTDL_PREFETCH_COUNT, YTDL_HOOK_TIMEOUT, YTDL_CACHE_DB)
 app = FastAPI()
 
+
+@app.on_event('shutdown')
+def stop_workers():
+    ytdl_resolver.close()
+
+
+def publish_blob(digest: str, filename: str) -> bool:
+    """Makes stored content available in the media directory under a name
+
+    Args:
+        digest (str): sha256 of a blob in either store
+        filename (str): name in the media directory
+
+    Returns:
+        bool: False if the name is already taken by different content
+    """
+    newfile = Path(MEDIA_DIR, filename)
+    if newfile.exists():
+        return media_blobs.is_linked(digest, newfile)
+    if not media_blobs.has(digest):
+        media_blobs.path(digest).parent.mkdir(parents=True, exist_ok=True)
+        stream_blobs.link(digest, media_blobs.path(digest))
+    media_blobs.link(digest, newfile)
+    return True
+
+
+def playlist_entry(item: str) -> str:
+    """Turns a playlist item sent by a client into something mpv can load
+
+    Args:
+        item (str): an http url or a file name in the media directory
+
+    Returns:
+        str: the url or the absolute path of the file
+    """
+    # normalised without touching the disk, large playlists have thousands of entries
+    return item if item[:4] == 'http' else os.path.normpath(Path(MEDIA_ROOT, item))
+
+
+async def load_playlist(items: list[str], index: int) -> dict:
+    """Replaces the playlist and starts playing it. The entries are written
+        to a temporary m3u8 and loaded with a single loadlist command
+        instead of a loadfile per entry.
+
+    Args:
+        items (list[str]): entries as sent by the client
+        index (int): item to start playing
+
+    Raises:
+        ValueError: if an entry cannot be written to a playlist file
+
+    Returns:
+        dict: response with the entry count and elapsed_ms
+    """
+    started = time.perf_counter()
+    parsed_list = [playlist_entry(x) for x in items]
+    listfile = Path(TEMP_DIR, 'playlists', f'{str(time.time())}.m3u8')
+    await run_in_threadpool(write_m3u, listfile, parsed_list)
+    try:
+        playlist_pos = await aplayer.get('playlist-pos')
+        if playlist_pos is not None and playlist_pos > -1:
+            await aplayer.command('stop')
+        await aplayer.command('playlist-clear')
+        # mpv has parsed the file once the command returns
+        await aplayer.command('loadlist', str(listfile), 'append')
+    finally:
+        listfile.unlink(missing_ok=True)
+    await aplayer.command('playlist-play-index', index)
+    return {'message': f'playing playlist starting at index {index}', 'count': len(parsed_list),
+            'elapsed_ms': (time.perf_counter() - started) * 1000}
+
+
 # documentation for methods can be viewed by visiting '/docs' in your browser
 
 @app.post("/play", status_code=fast_status.HTTP_200_OK, response_model=GenericItem)
-def play(uri: str, local: bool, replace: bool, response: Response):  
+async def play(uri: str, local: bool, replace: bool, response: Response):  
     try:
         decoded_uri = decode_uri(uri)
-        if player.filename is None or replace:
+        if await aplayer.get('filename') is None or replace:
             if local and Path(MEDIA_DIR, decoded_uri).is_file():
-                player.loadfile(str(Path(MEDIA_DIR, decoded_uri)), 'replace')
-                player.command('set', 'pause', 'no')
-                player.wait_until_playing()
+                await aplayer.command('loadfile', str(Path(MEDIA_DIR, decoded_uri)), 'replace')
+                await aplayer.command('set', 'pause', 'no')
+                await aplayer.wait_until_playing(PLAY_TIMEOUT)
                 return {'message': 'playing local'}
             elif not local and decoded_uri[:4] == 'http':
-                player.loadfile(decoded_uri, 'replace')
-                player.command('set', 'pause', 'no')
-                player.wait_until_playing()
+                if ytdl_resolver.wants(decoded_uri):
+                    # a cached extraction is in memory before mpv asks for it, otherwise it starts right away
+                    await run_in_threadpool(ytdl_resolver.prefetch, decoded_uri)
+                await aplayer.command('loadfile', decoded_uri, 'replace')
+                await aplayer.command('set', 'pause', 'no')
+                await aplayer.wait_until_playing(PLAY_TIMEOUT)
                 return {'message': 'playing remote'}
             else:
                 response.status_code = fast_status.HTTP_404_NOT_FOUND
@@ -49,6 +164,9 @@ def play(uri: str, local: bool, replace: bool, response: Response):
         else:
             response.status_code = fast_status.HTTP_403_FORBIDDEN
             return {'message': 'replace is set to false, cannot override current video'}
+    except asyncio.TimeoutError:
+        response.status_code = fast_status.HTTP_504_GATEWAY_TIMEOUT
+        return {'message': 'timed out waiting for playback to start'}
     except:
         response.status_code = fast_status.HTTP_422_UNPROCESSABLE_ENTITY
         return {'message': 'internal error on decoding b64 uri'}
@@ -95,14 +213,40 @@ def repeat():
 
 
 @app.get("/status", status_code=fast_status.HTTP_200_OK, response_model=StatusItem)
-def status():
-    return player_instance.get_player_status()
+async def status(response: Response, if_none_match: Union[str, None] = Header(default=None)):
+    current_status, etag = player_instance.state.snapshot_with_etag()
+    if if_none_match == etag:
+        return Response(status_code=fast_status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+    response.headers['ETag'] = etag
+    return current_status
+
+
+@app.get("/status/stream", status_code=fast_status.HTTP_200_OK)
+async def status_stream():
+    async def event_source():
+        subscriber = status_broadcaster.subscribe(asyncio.get_running_loop())
+        try:
+            # full status first, only changed fields afterwards
+            yield f'data: {json.dumps(player_instance.get_player_status())}\n\n'
+            while True:
+                try:
+                    changes = await asyncio.wait_for(subscriber.changes(), STATUS_STREAM_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield ': keep-alive\n\n'
+                    continue
+                yield f'data: {json.dumps(changes)}\n\n'
+                # let fast changing fields like time_pos pile up before the next send
+                await asyncio.sleep(STATUS_STREAM_INTERVAL)
+        finally:
+            status_broadcaster.unsubscribe(subscriber)
+    return StreamingResponse(event_source(), media_type='text/event-stream')
 
 
 @app.post("/seek", status_code=fast_status.HTTP_202_ACCEPTED, response_model=GenericItem)
-def seek(percent_pos: float, response: Response):
+def seek(percent_pos: float, response: Response, exact: bool = True):
     if player.percent_pos is not None:
-        player.seek(percent_pos, 'absolute-percent')
+        # keyframe seeks are cheap enough to follow a slider being dragged, the final position is seeked exactly
+        player.seek(percent_pos, 'absolute-percent', 'exact' if exact else 'keyframes')
         return {'message': f'seeked to {percent_pos}%'}
     else:
         response.status_code = fast_status.HTTP_406_NOT_ACCEPTABLE
@@ -110,13 +254,18 @@ def seek(percent_pos: float, response: Response):
 
 
 @app.post('/pause', status_code=fast_status.HTTP_200_OK, response_model=GenericItem)
-def pause(response: Response):
-    if not player.pause and player.filename is not None:
-        player.command('set', 'pause', 'yes')
-        player.wait_until_paused()
+async def pause(response: Response):
+    paused, filename = await asyncio.gather(aplayer.get('pause'), aplayer.get('filename'))
+    if not paused and filename is not None:
+        await aplayer.command('set', 'pause', 'yes')
+        try:
+            await aplayer.wait_until_paused(PAUSE_TIMEOUT)
+        except asyncio.TimeoutError:
+            response.status_code = fast_status.HTTP_504_GATEWAY_TIMEOUT
+            return {'message': 'timed out waiting for the player to pause'}
         return {'message': 'player is paused'}
-    elif player.pause and player.filename is not None:
-        player.command('set', 'pause', 'no')
+    elif paused and filename is not None:
+        await aplayer.command('set', 'pause', 'no')
         return {'message': 'player is unpaused'}
     else:
         response.status_code = fast_status.HTTP_406_NOT_ACCEPTABLE
@@ -125,37 +274,241 @@ def pause(response: Response):
 
 @app.post('/stream/', status_code=fast_status.HTTP_202_ACCEPTED, response_model=GenericItem)
 async def stream(file: UploadFile):
-    tempfile = Path(
-        TEMP_DIR, f'{str(time.time())}{Path(file.filename).suffix}')
-    async with aiofiles.open(tempfile, 'wb') as out_file:
-        while content := await file.read(1024 * 1024):
-            await out_file.write(content)
-    return {'message': 'file uploaded successfully, playing', 'file': str(tempfile.resolve())}
+    # the body was already spooled by the form parser, copy it from there instead of rewriting it
+    digest = await run_in_threadpool(stream_blobs.add_fileobj, file.file)
+    spool_manager.notify()
+    return {'message': 'file uploaded successfully, playing', 'file': str(stream_blobs.path(digest).resolve())}
+
+
+@app.post('/stream/progressive', status_code=fast_status.HTTP_202_ACCEPTED, response_model=GenericItem)
+async def stream_progressive(filename: str, request: Request, content_length: Union[int, None] = Header(default=None)):
+    # raw request body, so playback can start before the upload is done
+    uri, spool = spool_registry.create(Path(filename).suffix, content_length)
+    started = False
+    digest = hashlib.sha256()
+    try:
+        async with aiofiles.open(spool.path, 'wb') as out_file:
+            async for content in request.stream():
+                if not content:
+                    continue
+                digest.update(content)
+                await out_file.write(content)
+                await out_file.flush()
+                spool.extend(len(content))
+                if not started and spool.received >= PROGRESSIVE_START_BYTES:
+                    await aplayer.command('loadfile', uri, 'replace')
+                    await aplayer.command('set', 'pause', 'no')
+                    started = True
+    finally:
+        spool.finish()
+    if not started:
+        await aplayer.command('loadfile', uri, 'replace')
+        await aplayer.command('set', 'pause', 'no')
+    try:
+        # readers keep their open handle, later opens use the blob
+        stream_blobs.root.mkdir(parents=True, exist_ok=True)
+        spool.path = stream_blobs.add(spool.path, digest.hexdigest())
+    except OSError:
+        pass  # still open on platforms that cannot move open files
+    spool_manager.notify()
+    return {'message': 'file uploaded successfully, playing'}
 
 
 @app.post('/upload/', status_code=fast_status.HTTP_201_CREATED, response_model=GenericItem)
 async def upload(file: UploadFile, response: Response):
     newfile = Path(MEDIA_DIR, file.filename)
     if not newfile.exists():
-        async with aiofiles.open(newfile, 'wb') as out_file:
-            while content := await file.read(1024 * 1024):
-                await out_file.write(content)
+        digest = await run_in_threadpool(media_blobs.add_fileobj, file.file)
+        media_blobs.link(digest, newfile)
         return {'message': f'new file {file.filename} uploaded successfully'}
     else:
         response.status_code = fast_status.HTTP_409_CONFLICT
         return {'message': f'file {file.filename} already exists'}
 
 
+@app.put('/upload/{filename}', status_code=fast_status.HTTP_201_CREATED, response_model=GenericItem)
+async def upload_raw(filename: str, request: Request, response: Response):
+    # raw request body, written once straight into the store next to its final name
+    filename = Path(filename).name
+    if Path(MEDIA_DIR, filename).exists():
+        response.status_code = fast_status.HTTP_409_CONFLICT
+        return {'message': f'file {filename} already exists'}
+    media_blobs.root.mkdir(parents=True, exist_ok=True)
+    tempfile = Path(media_blobs.root, f'{str(time.time())}.part')
+    digest = hashlib.sha256()
+    try:
+        async with aiofiles.open(tempfile, 'wb') as out_file:
+            async for content in request.stream():
+                if not content:
+                    continue
+                digest.update(content)
+                await out_file.write(content)
+    except:
+        tempfile.unlink(missing_ok=True)
+        raise
+    media_blobs.add(tempfile, digest.hexdigest())
+    if not publish_blob(digest.hexdigest(), filename):
+        # the name was taken while the body was uploading, nothing else refers to the content
+        media_blobs.discard_unlinked(digest.hexdigest())
+        response.status_code = fast_status.HTTP_409_CONFLICT
+        return {'message': f'file {filename} already exists'}
+    return {'message': f'new file {filename} uploaded successfully'}
+
+
+@app.post('/uploads', status_code=fast_status.HTTP_201_CREATED, response_model=UploadStatusItem)
+def create_upload(data: UploadCreateItem, response: Response):
+    filename = Path(data.filename).name
+    if data.size < 0 or not 0 < data.chunk_size <= MAX_UPLOAD_CHUNK_SIZE:
+        response.status_code = fast_status.HTTP_422_UNPROCESSABLE_ENTITY
+        return {'message': f'size must not be negative, chunk size must be between 1 and {MAX_UPLOAD_CHUNK_SIZE}'}
+    if data.target == 'media' and Path(MEDIA_DIR, filename).exists():
+        response.status_code = fast_status.HTTP_409_CONFLICT
+        return {'message': f'file {filename} already exists'}
+    session = upload_manager.create(filename, data.size, data.chunk_size, data.target, data.sha256)
+    return {'message': f'upload of {filename} started', **session.as_dict()}
+
+
+@app.get('/uploads/{upload_id}', status_code=fast_status.HTTP_200_OK, response_model=UploadStatusItem)
+def upload_status(upload_id: str, response: Response):
+    session = upload_manager.get(upload_id)
+    if session is None:
+        response.status_code = fast_status.HTTP_404_NOT_FOUND
+        return {'message': 'unknown upload'}
+    return {'message': f'{len(session.received)} of {session.chunk_count} chunks received', **session.as_dict()}
+
+
+@app.put('/uploads/{upload_id}', status_code=fast_status.HTTP_200_OK, response_model=UploadStatusItem)
+async def upload_chunk(upload_id: str, offset: int, request: Request, response: Response,
+                       x_chunk_sha256: Union[str, None] = Header(default=None)):
+    session = upload_manager.get(upload_id)
+    if session is None:
+        response.status_code = fast_status.HTTP_404_NOT_FOUND
+        return {'message': 'unknown upload'}
+    try:
+        await upload_manager.write_chunk(session, offset, request.stream(), x_chunk_sha256)
+    except ChecksumMismatchError as e:
+        response.status_code = fast_status.HTTP_422_UNPROCESSABLE_ENTITY
+        return {'message': str(e), **session.as_dict()}
+    except ValueError as e:
+        response.status_code = fast_status.HTTP_400_BAD_REQUEST
+        return {'message': str(e), **session.as_dict()}
+    return {'message': f'chunk at {offset} received', **session.as_dict()}
+
+
+@app.post('/uploads/{upload_id}/complete', status_code=fast_status.HTTP_201_CREATED, response_model=UploadStatusItem)
+async def complete_upload(upload_id: str, response: Response):
+    session = upload_manager.get(upload_id)
+    if session is None:
+        response.status_code = fast_status.HTTP_404_NOT_FOUND
+        return {'message': 'unknown upload'}
+    if not session.complete:
+        response.status_code = fast_status.HTTP_409_CONFLICT
+        return {'message': 'upload is missing chunks', **session.as_dict()}
+    digest = await upload_manager.finish_digest(session)
+    if digest is None:
+        response.status_code = fast_status.HTTP_409_CONFLICT
+        return {'message': 'upload is missing chunks', **session.as_dict()}
+    if session.sha256 is not None and session.sha256.lower() != digest:
+        upload_manager.remove(upload_id)
+        response.status_code = fast_status.HTTP_422_UNPROCESSABLE_ENTITY
+        return {'message': 'file checksum mismatch, upload discarded'}
+    if session.target == 'stream':
+        stream_blobs.root.mkdir(parents=True, exist_ok=True)
+        blob = stream_blobs.add(session.path, digest)
+        upload_manager.remove(upload_id)
+        spool_manager.notify()
+        await aplayer.command('loadfile', str(blob), 'replace')
+        await aplayer.command('set', 'pause', 'no')
+        response.status_code = fast_status.HTTP_202_ACCEPTED
+        return {'message': 'file uploaded successfully, playing', 'filename': session.filename}
+    media_blobs.root.mkdir(parents=True, exist_ok=True)
+    media_blobs.add(session.path, digest)
+    upload_manager.remove(upload_id)
+    if not publish_blob(digest, session.filename):
+        media_blobs.discard_unlinked(digest)
+        response.status_code = fast_status.HTTP_409_CONFLICT
+        return {'message': f'file {session.filename} already exists'}
+    return {'message': f'new file {session.filename} uploaded successfully', 'filename': session.filename}
+
+
+@app.delete('/uploads/{upload_id}', status_code=fast_status.HTTP_200_OK, response_model=GenericItem)
+def cancel_upload(upload_id: str, response: Response):
+    if upload_manager.get(upload_id) is None:
+        response.status_code = fast_status.HTTP_404_NOT_FOUND
+        return {'message': 'unknown upload'}
+    upload_manager.remove(upload_id)
+    return {'message': 'upload cancelled'}
+
+
+@app.get('/blobs/{digest}', status_code=fast_status.HTTP_200_OK, response_model=BlobItem)
+def blob_status(digest: str, response: Response):
+    media, stream = media_blobs.has(digest), stream_blobs.has(digest)
+    if not media and not stream:
+        response.status_code = fast_status.HTTP_404_NOT_FOUND
+        return {'message': 'content not stored', 'digest': digest, 'media': False, 'stream': False}
+    return {'message': 'content already stored', 'digest': digest, 'media': media, 'stream': stream}
+
+
+@app.post('/blobs/{digest}/media', status_code=fast_status.HTTP_201_CREATED, response_model=GenericItem)
+def blob_to_media(digest: str, filename: str, response: Response):
+    filename = Path(filename).name
+    if not media_blobs.has(digest) and not stream_blobs.has(digest):
+        response.status_code = fast_status.HTTP_404_NOT_FOUND
+        return {'message': 'content not stored, upload it first'}
+    if not publish_blob(digest, filename):
+        response.status_code = fast_status.HTTP_409_CONFLICT
+        return {'message': f'file {filename} already exists'}
+    return {'message': f'new file {filename} added from stored content'}
+
+
+@app.post('/blobs/{digest}/play', status_code=fast_status.HTTP_202_ACCEPTED, response_model=GenericItem)
+async def blob_play(digest: str, response: Response):
+    for store in (media_blobs, stream_blobs):
+        if store.has(digest):
+            await aplayer.command('loadfile', str(store.path(digest)), 'replace')
+            await aplayer.command('set', 'pause', 'no')
+            return {'message': 'file already on server, playing'}
+    response.status_code = fast_status.HTTP_404_NOT_FOUND
+    return {'message': 'content not stored, stream it first'}
+
+
+@app.get('/spool', status_code=fast_status.HTTP_200_OK, response_model=SpoolItem)
+def spool_usage():
+    usage = spool_manager.stats()
+    return {'message': f'{usage["used_bytes"]} of {usage["max_bytes"]} bytes in use', **usage}
+
+
+@app.get('/resolver/stats', status_code=fast_status.HTTP_200_OK, response_model=ResolverStatsItem)
+def resolver_stats():
+    stats = ytdl_resolver.stats()
+    return {'message': f'{stats["hits"]} hits, {stats["misses"]} misses, about {stats["saved_seconds"]:.1f}s saved', **stats}
+
+
 @app.get('/list', status_code=fast_status.HTTP_200_OK, response_model=ListItem)
-def list_files(response: Response):
-    print(MEDIA_DIR)
-    file_list = [str(x.stem + x.suffix)
-                 for x in MEDIA_DIR.glob('*') if x.is_file()]
-    if len(file_list) > 0:
-        return {'message': 'successfully listed files', 'files': file_list}
+def list_files(response: Response, offset: int = 0, limit: Union[int, None] = None, prefix: str = '',
+               sort: Literal['name', 'size', 'mtime', 'duration'] = 'name', order: Literal['asc', 'desc'] = 'asc',
+               details: bool = False):
+    total, entries = media_library.listing(offset, limit, prefix, sort, order == 'desc')
+    if total > 0:
+        result = {'message': 'successfully listed files', 'files': [x.name for x in entries], 'total': total}
+        if details:
+            result['entries'] = [x.as_dict() for x in entries]
+        return result
     else:
         response.status_code = fast_status.HTTP_204_NO_CONTENT
-        return {'message': 'no remote files to list', 'files': []}
+        return {'message': 'no remote files to list', 'files': [], 'total': 0}
+
+
+@app.api_route('/media/{name:path}', methods=['GET', 'HEAD'], status_code=fast_status.HTTP_200_OK)
+async def media(name: str, request: Request):
+    # only files known to the library can be served
+    entry = media_library.get(name)
+    if entry is None:
+        return JSONResponse({'message': f'file {name} not found'}, status_code=fast_status.HTTP_404_NOT_FOUND)
+    try:
+        return RangeFileResponse(Path(MEDIA_DIR, entry.name), request.headers)
+    except OSError:
+        return JSONResponse({'message': f'file {name} not found'}, status_code=fast_status.HTTP_404_NOT_FOUND)
 
 
 @app.post('/volume', response_model=GenericItem, status_code=fast_status.HTTP_202_ACCEPTED)
@@ -167,25 +520,101 @@ def volume(volume: int, response: Response):
         return {'message': f'cannot set volume to below zero or above 100'}
 
 
-@app.post('/playlist/', status_code=fast_status.HTTP_200_OK, response_model=GenericItem)
-def playlist(data: PlaylistItem, response: Response):
+@app.post('/playlist/', status_code=fast_status.HTTP_200_OK, response_model=PlaylistLoadItem)
+async def playlist(data: PlaylistItem, response: Response):
     if data.new and len(data.plist) > 0 and data.index < len(data.plist):
-        if player.playlist_pos > -1:  # type: ignore
-            player.stop()
-        parsed_list = [x if x[:4] == 'http' else str(
-            Path(MEDIA_DIR, x).resolve()) for x in data.plist]
-        player.playlist_clear()
-        for item in parsed_list:
-            player.playlist_append(item)
-        player.playlist_play_index(data.index)
-        player.wait_until_playing()
-        print(player.playlist_pos)
-        return {'message': f'playing playlist starting at index {data.index}'}
+        try:
+            return await load_playlist(data.plist, data.index)
+        except ValueError as e:
+            response.status_code = fast_status.HTTP_422_UNPROCESSABLE_ENTITY
+            return {'message': str(e)}
     else:
         response.status_code = fast_status.HTTP_406_NOT_ACCEPTABLE
         return {'message': 'cannot play a zero length playlist, or item outside of range'}
 
 
+@app.get('/playlists', status_code=fast_status.HTTP_200_OK, response_model=SavedPlaylistsItem)
+async def saved_playlists():
+    playlists = await run_in_threadpool(playlist_store.summaries)
+    return {'message': f'{len(playlists)} saved playlists', 'playlists': playlists}
+
+
+@app.put('/playlists/{name}', status_code=fast_status.HTTP_200_OK, response_model=GenericItem)
+async def save_playlist(name: str, data: PlaylistSaveItem, response: Response):
+    if len(data.plist) == 0:
+        response.status_code = fast_status.HTTP_406_NOT_ACCEPTABLE
+        return {'message': 'cannot save a zero length playlist'}
+    await run_in_threadpool(playlist_store.save, name, data.plist)
+    return {'message': f'saved playlist {name} with {len(data.plist)} items'}
+
+
+@app.get('/playlists/{name}', status_code=fast_status.HTTP_200_OK, response_model=SavedPlaylistContentItem)
+async def saved_playlist(name: str, response: Response):
+    items = await run_in_threadpool(playlist_store.items, name)
+    if items is None:
+        response.status_code = fast_status.HTTP_404_NOT_FOUND
+        return {'message': f'no saved playlist named {name}'}
+    return {'message': f'playlist {name} has {len(items)} items', 'plist': items}
+
+
+@app.post('/playlists/{name}/load', status_code=fast_status.HTTP_200_OK, response_model=PlaylistLoadItem)
+async def load_saved_playlist(name: str, response: Response, index: int = 0):
+    # goes straight from the store to mpv, the client never sends the items
+    items = await run_in_threadpool(playlist_store.items, name)
+    if items is None:
+        response.status_code = fast_status.HTTP_404_NOT_FOUND
+        return {'message': f'no saved playlist named {name}'}
+    if not 0 <= index < len(items):
+        response.status_code = fast_status.HTTP_406_NOT_ACCEPTABLE
+        return {'message': 'item outside of range'}
+    try:
+        return await load_playlist(items, index)
+    except ValueError as e:
+        response.status_code = fast_status.HTTP_422_UNPROCESSABLE_ENTITY
+        return {'message': str(e)}
+
+
+@app.delete('/playlists/{name}', status_code=fast_status.HTTP_200_OK, response_model=GenericItem)
+async def delete_saved_playlist(name: str, response: Response):
+    if not await run_in_threadpool(playlist_store.delete, name):
+        response.status_code = fast_status.HTTP_404_NOT_FOUND
+        return {'message': f'no saved playlist named {name}'}
+    return {'message': f'deleted playlist {name}'}
+
+
+@app.post('/playlist/ops', status_code=fast_status.HTTP_200_OK, response_model=PlaylistOpsResultItem)
+async def playlist_ops(data: PlaylistOpsItem, response: Response):
+    # applies changes in place, entries that are not touched keep playing
+    count = await aplayer.get('playlist-count') or 0
+    applied = 0
+    try:
+        for op in data.ops:
+            if op.op in ('append', 'insert'):
+                if op.item is None:
+                    raise ValueError('missing item')
+                await aplayer.command('loadfile', playlist_entry(op.item), 'append')
+                count += 1
+                if op.op == 'insert' and op.index is not None and op.index < count - 1:
+                    await aplayer.command('playlist-move', count - 1, op.index)
+            elif op.index is None:
+                raise ValueError('missing index')
+            elif op.op == 'move':
+                if op.to is None:
+                    raise ValueError('missing target index')
+                # mpv moves the entry in front of the one currently at the target
+                await aplayer.command('playlist-move', op.index, op.to + 1 if op.to > op.index else op.to)
+            elif op.op == 'remove':
+                await aplayer.command('playlist-remove', op.index)
+                count -= 1
+            elif op.op == 'jump':
+                await aplayer.command('playlist-play-index', op.index)
+            applied += 1
+    except Exception as e:
+        response.status_code = fast_status.HTTP_422_UNPROCESSABLE_ENTITY
+        return {'message': f'playlist operation {applied} failed: {e}', 'applied': applied}
+    return {'message': f'applied {applied} playlist operations', 'applied': applied}
+
+
 @app.post('/next', status_code=fast_status.HTTP_202_ACCEPTED, response_model=GenericItem)
 def next(response: Response):
     if player.playlist_pos != -1 and player.playlist_pos < len(player.playlist_filenames) - 1:  # type: ignore
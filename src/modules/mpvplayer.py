@@ -1,8 +1,130 @@
+import threading
+import time
 
-from .mpv import MPV
+from .mpv import MPV, MpvNodeView
 
 from settings.server_settings import FULLSCREEN, ON_TOP
 
+# mpv property name -> status field it feeds
+STATUS_PROPERTIES = {
+    'time-pos': 'time_pos',
+    'percent-pos': 'percent_pos',
+    'time-remaining': 'time_remaining',
+    'duration': 'duration',
+    'pause': 'pause',
+    'filename': 'filename',
+    'playlist': 'playlist_names',
+    'mute': 'mute',
+    'fullscreen': 'fullscreen',
+    'loop-playlist': 'repeat',
+    'volume': 'volume',
+    'playlist-pos': 'playlist_pos'
+}
+
+# native formats to read them in, None where a decoded node is needed
+STATUS_PROPERTY_FORMATS = {
+    'time-pos': float,
+    'percent-pos': float,
+    'time-remaining': float,
+    'duration': float,
+    'pause': bool,
+    'filename': None,
+    'mute': bool,
+    'fullscreen': bool,
+    'loop-playlist': None,
+    'volume': float,
+    'playlist-pos': int
+}
+
+# playback position fields change many times a second, the ETag only follows them in whole units
+COARSE_FIELDS = ('time_pos', 'percent_pos', 'time_remaining')
+
+
+def _coarse(field: str, value):
+    if field in COARSE_FIELDS and value is not None:
+        return int(value)
+    return value
+
+
+class PlayerStateCache():
+    def __init__(self, player: MPV, initial: dict) -> None:
+        """Keeps an always-current snapshot of the player status by
+            observing the underlying mpv properties, so reading the status
+            never has to call into libmpv.
+
+        Args:
+            player (MPV): the mpv instance to observe
+            initial (dict): status to start out with, observers fill in
+                changes from here on
+        """
+        self.player = player
+        self.state = dict(initial)
+        self.version = 0
+        self.boot_id = int(time.time())
+        self.listeners = []
+        self.lock = threading.Lock()
+        for name in STATUS_PROPERTIES:
+            if name == 'playlist':
+                # only the filenames are needed, skip decoding the rest of each entry
+                self.player.observe_property(name, self._on_playlist_change, lazy=True)
+            else:
+                self.player.observe_property(name, self._on_property_change)
+
+    def snapshot(self) -> dict:
+        """Copy of the current status
+
+        Returns:
+            dict: various attributes of the player instance
+        """
+        with self.lock:
+            return dict(self.state)
+
+    def snapshot_with_etag(self) -> tuple[dict, str]:
+        """Copy of the current status along with a weak ETag. It changes
+            whenever a field does, except for the playback position which
+            only counts once it passes a whole second or percent, so
+            clients polling during playback still get 304 responses.
+
+        Returns:
+            tuple[dict, str]: the status and its ETag
+        """
+        with self.lock:
+            return dict(self.state), f'W/"{self.boot_id}-{self.version}"'
+
+    def add_listener(self, listener) -> None:
+        """Registers a function called as listener(field, value) from mpv's
+            event thread each time a status field changes
+
+        Args:
+            listener (function): function to call on changes
+        """
+        with self.lock:
+            self.listeners.append(listener)
+
+    def remove_listener(self, listener) -> None:
+        """Unregisters a function added with add_listener
+
+        Args:
+            listener (function): function to remove
+        """
+        with self.lock:
+            self.listeners.remove(listener)
+
+    def _on_playlist_change(self, name: str, view: MpvNodeView) -> None:
+        self._on_property_change(name, view.project('filename'))
+
+    def _on_property_change(self, name: str, value) -> None:
+        field = STATUS_PROPERTIES[name]
+        with self.lock:
+            if field in self.state and self.state[field] == value:
+                return
+            if field not in self.state or _coarse(field, self.state[field]) != _coarse(field, value):
+                self.version += 1
+            self.state[field] = value
+            listeners = list(self.listeners)
+        for listener in listeners:
+            listener(field, value)
+
 
 class Player():
     def __init__(self) -> None:
@@ -17,6 +139,7 @@ class Player():
             ontop=ON_TOP,
             osc=False
         )
+        self.state = PlayerStateCache(self.player, self.poll_player_status())
 
     def get_player(self) -> MPV:
         """Exposes the initialized mpv instance
@@ -27,26 +150,24 @@ class Player():
         return self.player
 
     def get_player_status(self) -> dict:
-        """Pulls relevant properties from the play instance
+        """Returns the cached player status, kept current by property
+            observers
 
         Returns:
             dict: various attributes of the player instance
         """        
-        return {
-            'time_pos': self.player.time_pos,
-            'percent_pos': self.player.percent_pos,
-            'time_remaining': self.player.time_remaining,
-            'duration': self.player.duration,
-            'pause': self.player.pause,
-            'filename': self.player.filename,
-            'playlist_names': self.player.playlist_filenames,
-            'mute': self.player.mute,
-            'fullscreen': self.player.fullscreen,
-            'repeat': self.player.loop_playlist,
-            'volume': self.player.volume,
-            'playlist_pos': self.player.playlist_pos
-        }
+        return self.state.snapshot()
+
+    def poll_player_status(self) -> dict:
+        """Pulls relevant properties directly from the player instance
 
+        Returns:
+            dict: various attributes of the player instance
+        """        
+        props = self.player.get_properties(STATUS_PROPERTY_FORMATS)
+        status = {STATUS_PROPERTIES[name]: value for name, value in props.items()}
+        status['playlist_names'] = self.player.playlist_filenames
+        return status
 
 if __name__ == '__main__':
     pass
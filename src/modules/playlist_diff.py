@@ -0,0 +1,72 @@
+from difflib import SequenceMatcher
+
+
+def diff_playlist(old: list[str], new: list[str]) -> list[dict]:
+    """Computes the playlist operations that turn one playlist into
+        another, for the /playlist/ops endpoint. Unchanged runs of items
+        are left alone and items that changed places are moved rather than
+        removed and added again, so the item that is playing keeps playing
+        unless it was removed.
+
+    Args:
+        old (list[str]): playlist as it is on the server
+        new (list[str]): playlist as it should be
+
+    Returns:
+        list[dict]: operations to apply in order
+    """
+    matcher = SequenceMatcher(a=old, b=new, autojunk=False)
+    # entries of old that end up at each position of new, None for new items
+    sources = [None] * len(new)
+    removed = []
+    added = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            sources[j1:j2] = range(i1, i2)
+        else:
+            removed.extend(range(i1, i2))
+            added.extend(range(j1, j2))
+    # entries that were taken out in one place and put back in another are moves
+    stationary = {x for x in sources if x is not None}
+    unmatched = {}
+    for index in removed:
+        unmatched.setdefault(old[index], []).append(index)
+    for position in added:
+        candidates = unmatched.get(new[position])
+        if candidates:
+            sources[position] = candidates.pop(0)
+    kept = {x for x in sources if x is not None}
+    ops = []
+    current = list(range(len(old)))
+    for index in reversed(range(len(old))):
+        if index not in kept:
+            ops.append({'op': 'remove', 'index': index})
+            del current[index]
+    # placed from the end, each entry in front of the one that follows it
+    anchor = None
+    for position in reversed(range(len(new))):
+        source = sources[position]
+        if source in stationary:
+            anchor = source
+            continue
+        target = len(current) if anchor is None else current.index(anchor)
+        if source is None:
+            if anchor is None:
+                ops.append({'op': 'append', 'item': new[position]})
+            else:
+                ops.append({'op': 'insert', 'item': new[position], 'index': target})
+            current.insert(target, ('new', position))
+            anchor = ('new', position)
+            continue
+        index = current.index(source)
+        if index < target:
+            target -= 1
+        if index != target:
+            ops.append({'op': 'move', 'index': index, 'to': target})
+            current.insert(target, current.pop(index))
+        anchor = source
+    return ops
+
+
+if __name__ == '__main__':
+    pass
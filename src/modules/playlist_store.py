@@ -0,0 +1,98 @@
+from pathlib import Path
+from typing import Union
+import sqlite3
+import threading
+import time
+
+
+class PlaylistStore():
+    def __init__(self, db_file: Path) -> None:
+        """Named playlists kept in an sqlite database. Items are stored one
+            row per entry, clustered by playlist and position, so a whole
+            playlist is read back with a single index range scan.
+
+        Args:
+            db_file (Path): database file, created if missing
+        """
+        db_file.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(db_file, check_same_thread=False, isolation_level=None)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA foreign_keys=ON')
+        self.db.executescript('''
+            CREATE TABLE IF NOT EXISTS playlists (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL UNIQUE,
+                count INTEGER NOT NULL,
+                updated REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS playlist_items (
+                playlist_id INTEGER NOT NULL REFERENCES playlists(id) ON DELETE CASCADE,
+                position INTEGER NOT NULL,
+                item TEXT NOT NULL,
+                PRIMARY KEY (playlist_id, position)
+            ) WITHOUT ROWID;
+        ''')
+
+    def save(self, name: str, items: list[str]) -> None:
+        """Stores a playlist, replacing any playlist of the same name
+
+        Args:
+            name (str): name of the playlist
+            items (list[str]): entries as sent by the client
+        """
+        with self.lock:
+            self.db.execute('BEGIN IMMEDIATE')
+            try:
+                self.db.execute('DELETE FROM playlists WHERE name = ?', (name,))
+                playlist_id = self.db.execute('INSERT INTO playlists (name, count, updated) VALUES (?, ?, ?)',
+                                              (name, len(items), time.time())).lastrowid
+                self.db.executemany('INSERT INTO playlist_items (playlist_id, position, item) VALUES (?, ?, ?)',
+                                    ((playlist_id, position, item) for position, item in enumerate(items)))
+            except BaseException:
+                self.db.execute('ROLLBACK')
+                raise
+            self.db.execute('COMMIT')
+
+    def summaries(self) -> list[dict]:
+        """All stored playlists without their items
+
+        Returns:
+            list[dict]: name, count and updated of each playlist, by name
+        """
+        with self.lock:
+            rows = self.db.execute('SELECT name, count, updated FROM playlists ORDER BY name').fetchall()
+        return [{'name': name, 'count': count, 'updated': updated} for name, count, updated in rows]
+
+    def items(self, name: str) -> Union[list[str], None]:
+        """Entries of a stored playlist, in order
+
+        Args:
+            name (str): name of the playlist
+
+        Returns:
+            Union[list[str], None]: the entries, None if there is no such playlist
+        """
+        with self.lock:
+            row = self.db.execute('SELECT id FROM playlists WHERE name = ?', (name,)).fetchone()
+            if row is None:
+                return None
+            rows = self.db.execute('SELECT item FROM playlist_items WHERE playlist_id = ? ORDER BY position',
+                                   (row[0],)).fetchall()
+        return [x[0] for x in rows]
+
+    def delete(self, name: str) -> bool:
+        """Removes a stored playlist
+
+        Args:
+            name (str): name of the playlist
+
+        Returns:
+            bool: False if there was no such playlist
+        """
+        with self.lock:
+            return self.db.execute('DELETE FROM playlists WHERE name = ?', (name,)).rowcount > 0
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,148 @@
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import Union
+import mimetypes
+import os
+import re
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+CHUNK_SIZE = 256 * 1024
+
+_RANGE = re.compile(r'bytes=(\d*)-(\d*)')
+
+
+def parse_range(header: str, size: int) -> Union[tuple[int, int], None]:
+    """Parses a single byte range, see RFC 9110 14.2
+
+    Args:
+        header (str): value of the Range header
+        size (int): size of the file in bytes
+
+    Raises:
+        ValueError: if the range cannot be satisfied
+
+    Returns:
+        Union[tuple[int, int], None]: first and last byte position, None
+            for ranges that are ignored, like multiple ranges
+    """
+    match = _RANGE.fullmatch(header.strip())
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        length = int(last)
+        if length == 0 or size == 0:
+            raise ValueError('empty suffix range')
+        return max(size - length, 0), size - 1
+    first = int(first)
+    last = size - 1 if not last else min(int(last), size - 1)
+    if first >= size or first > last:
+        raise ValueError('range not satisfiable')
+    return first, last
+
+
+class RangeFileResponse(Response):
+    def __init__(self, path: Path, request_headers: Headers, cache_control: str = 'no-cache') -> None:
+        """Serves a file with support for Range, If-Range and conditional
+            requests. The body is read with pread in small chunks in a
+            thread, so files are never loaded into memory as a whole.
+
+        Args:
+            path (Path): the file to serve
+            request_headers (Headers): headers of the request
+            cache_control (str): value of the Cache-Control header
+
+        Raises:
+            OSError: if the file cannot be opened
+        """
+        self.background = None
+        self.body = b''
+        self.file = path.open('rb')
+        stat = os.fstat(self.file.fileno())
+        self.size = stat.st_size
+        self.etag = f'"{self.size:x}-{stat.st_mtime_ns:x}"'
+        self.last_modified = formatdate(stat.st_mtime, usegmt=True)
+        self.offset, self.count = 0, self.size
+        self.status_code = 200
+        headers = {
+            'Accept-Ranges': 'bytes',
+            'ETag': self.etag,
+            'Last-Modified': self.last_modified,
+            'Cache-Control': cache_control
+        }
+        if self._not_modified(request_headers, stat.st_mtime):
+            self.status_code = 304
+            self.count = 0
+        elif 'range' in request_headers and self._if_range(request_headers):
+            try:
+                byte_range = parse_range(request_headers['range'], self.size)
+            except ValueError:
+                self.status_code = 416
+                self.count = 0
+                headers['Content-Range'] = f'bytes */{self.size}'
+            else:
+                if byte_range is not None:
+                    first, last = byte_range
+                    self.status_code = 206
+                    self.offset, self.count = first, last - first + 1
+                    headers['Content-Range'] = f'bytes {first}-{last}/{self.size}'
+        if self.status_code != 304:
+            headers['Content-Length'] = str(self.count)
+        self.media_type = mimetypes.guess_type(path.name)[0] or 'application/octet-stream'
+        headers['Content-Type'] = self.media_type
+        self.init_headers(headers)
+
+    def _not_modified(self, request_headers: Headers, mtime: float) -> bool:
+        if 'if-none-match' in request_headers:
+            tags = [x.strip() for x in request_headers['if-none-match'].split(',')]
+            return self.etag in tags or '*' in tags
+        if 'if-modified-since' in request_headers:
+            try:
+                return int(mtime) <= parsedate_to_datetime(request_headers['if-modified-since']).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def _if_range(self, request_headers: Headers) -> bool:
+        # a changed file is sent whole instead of patching a stale copy
+        if 'if-range' not in request_headers:
+            return True
+        return request_headers['if-range'].strip() in (self.etag, self.last_modified)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await send({'type': 'http.response.start', 'status': self.status_code, 'headers': self.raw_headers})
+            if scope['method'] == 'HEAD' or self.count == 0:
+                await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+            else:
+                await self._send_chunks(send)
+        finally:
+            self.file.close()
+
+    def _read_at(self, offset: int, length: int) -> bytes:
+        if hasattr(os, 'pread'):
+            return os.pread(self.file.fileno(), length, offset)
+        self.file.seek(offset)
+        return self.file.read(length)
+
+    async def _send_chunks(self, send: Send) -> None:
+        offset, remaining = self.offset, self.count
+        while remaining > 0:
+            chunk = await run_in_threadpool(self._read_at, offset, min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break  # truncated while sending
+            offset += len(chunk)
+            remaining -= len(chunk)
+            await send({'type': 'http.response.body', 'body': chunk, 'more_body': remaining > 0})
+        if remaining > 0:
+            await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+
+
+if __name__ == '__main__':
+    pass
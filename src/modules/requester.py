@@ -1,24 +1,255 @@
 
+from concurrent.futures import ThreadPoolExecutor, FIRST_EXCEPTION, wait
+import hashlib
 import json
+import os
 from pathlib import Path
+import threading
+import time
+from typing import Union
+from urllib.parse import quote
 import requests
-from requests.exceptions import HTTPError
+from requests.adapters import HTTPAdapter
+from requests.exceptions import HTTPError, ConnectionError, Timeout
+from urllib3.util.retry import Retry
 
 from .b64_helper import encode_uri
+from settings.client_settings import UPLOAD_CHUNK_SIZE, UPLOAD_PARALLEL_CHUNKS, UPLOAD_CHUNK_RETRIES, VERIFY_TLS, \
+    REQUEST_POOL_SIZE, REQUEST_RETRIES, REQUEST_RETRY_BACKOFF, REQUEST_CONNECT_TIMEOUT, REQUEST_TIMEOUT, \
+    PLAY_REQUEST_TIMEOUT, UPLOAD_REQUEST_TIMEOUT, STATUS_STREAM_TIMEOUT, UPLOAD_STATE_FILE, UPLOAD_STATE_MAX_AGE
+
+
+# digests of files hashed by this process, by path, size and modification time
+_digests = {}
+
+
+def _digest_key(file: Path) -> tuple:
+    stat = file.stat()
+    return (str(file.resolve()), stat.st_size, stat.st_mtime_ns)
+
+
+def known_digest(file: Path) -> Union[str, None]:
+    """Digest of a file that was hashed before and has not changed since,
+        without reading it
+
+    Args:
+        file (Path): file to look up
+
+    Returns:
+        Union[str, None]: sha256 hex digest, None if it is not known
+    """
+    return _digests.get(_digest_key(file))
+
+
+def remember_digest(file: Path, digest: str) -> None:
+    """Records the digest of a file hashed while it was being sent
+
+    Args:
+        file (Path): the file
+        digest (str): its sha256 hex digest
+    """
+    _digests[_digest_key(file)] = digest
+
+
+def file_digest(file: Path) -> str:
+    """Hashes a file without reading it into memory at once. The digest is
+        remembered for as long as the file is unchanged.
+
+    Args:
+        file (Path): file to hash
+
+    Returns:
+        str: sha256 hex digest
+    """
+    digest = known_digest(file)
+    if digest is not None:
+        return digest
+    key = _digest_key(file)
+    hasher = hashlib.sha256()
+    with file.open('rb') as fo:
+        while content := fo.read(1024 * 1024):
+            hasher.update(content)
+    _digests[key] = hasher.hexdigest()
+    return _digests[key]
+
+
+class PendingUploads():
+    # shared by all instances, they may write the same file
+    _file_lock = threading.Lock()
+
+    def __init__(self, server: str, state_file: Path = UPLOAD_STATE_FILE, max_age: float = UPLOAD_STATE_MAX_AGE) -> None:
+        """Ids of chunked uploads to a server that have not completed yet,
+            by file and target, so a broken off upload can be resumed. They
+            are also kept in state_file, which holds the uploads to every
+            server, so they survive restarts of the client.
+
+        Args:
+            server (str): the server the uploads go to
+            state_file (Path): file to keep them in
+            max_age (float): seconds after which the server has forgotten
+                an idle upload and it is not resumed anymore
+        """
+        self.server = server
+        self.state_file = state_file
+        self.max_age = max_age
+        self.lock = threading.Lock()
+        cutoff = time.time() - max_age
+        self.uploads = {tuple(x['key']): x['upload_id'] for x in self._read()
+                        if x['server'] == server and x['time'] >= cutoff}
+
+    def get(self, key: tuple) -> Union[str, None]:
+        """Id of the unfinished upload of a file
+
+        Args:
+            key (tuple): path, size, modification time and target
+
+        Returns:
+            Union[str, None]: upload id, None if there is none
+        """
+        with self.lock:
+            return self.uploads.get(key)
+
+    def set(self, key: tuple, upload_id: str) -> None:
+        """Records the upload a file is being sent with
+
+        Args:
+            key (tuple): path, size, modification time and target
+            upload_id (str): upload id the server gave out
+        """
+        with self.lock:
+            self.uploads[key] = upload_id
+        self._update(key, upload_id)
+
+    def discard(self, key: tuple) -> None:
+        """Forgets the upload of a file once it completed
+
+        Args:
+            key (tuple): path, size, modification time and target
+        """
+        with self.lock:
+            self.uploads.pop(key, None)
+        self._update(key, None)
+
+    def _read(self) -> list[dict]:
+        try:
+            return json.loads(self.state_file.read_text())
+        except (OSError, ValueError):
+            return []
+
+    def _update(self, key: tuple, upload_id: Union[str, None]) -> None:
+        # read back and changed in place, other clients keep their entries
+        with self._file_lock:
+            cutoff = time.time() - self.max_age
+            entries = [x for x in self._read() if x['time'] >= cutoff
+                       and not (x['server'] == self.server and tuple(x['key']) == key)]
+            if upload_id is not None:
+                entries.append({'server': self.server, 'key': list(key), 'upload_id': upload_id, 'time': time.time()})
+            tempfile = self.state_file.with_suffix('.part')
+            try:
+                tempfile.write_text(json.dumps(entries))
+                os.replace(tempfile, self.state_file)
+            except OSError:
+                pass  # resuming after a restart is best effort
+
+
+class _HashingReader():
+    def __init__(self, file: Path) -> None:
+        """Request body that hashes a file while it is being sent, and
+            remembers the digest once all of it was read
+
+        Args:
+            file (Path): file to send
+        """
+        self.file = file
+        self.fo = file.open('rb')
+        self.size = file.stat().st_size
+        self.digest = hashlib.sha256()
+
+    def __len__(self) -> int:
+        return self.size
+
+    def read(self, size: int = -1) -> bytes:
+        content = self.fo.read(size)
+        self.digest.update(content)
+        if not content or self.fo.tell() >= self.size:
+            remember_digest(self.file, self.digest.hexdigest())
+        return content
+
+    def close(self) -> None:
+        self.fo.close()
+
+
+class _TimeoutSession(requests.Session):
+    def __init__(self, timeout: tuple[float, float]) -> None:
+        super().__init__()
+        self.timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        # requests waits forever unless told otherwise
+        kwargs.setdefault('timeout', self.timeout)
+        return super().request(method, url, **kwargs)
 
 
 class Requester():
     def __init__(self, server: str) -> None:
-        """Creates a session with the server and abstracts api
-            calls away from the main client code.
+        """Abstracts api calls away from the main client code. Every thread
+            gets its own session, since sessions are not safe to share,
+            but all of them draw on one pool of keep-alive connections.
+            Calls time out after REQUEST_TIMEOUT unless they are expected
+            to take longer, and GET requests are retried with backoff.
 
         Args:
             server (str): the server address and port to connect with, 
                 for example 'http://127.0.0.1:5555'
         """
-        self.session = requests.Session()
-        self.session.verify = False
         self.server = server
+        self.verify = VERIFY_TLS
+        self.play_timeout = (REQUEST_CONNECT_TIMEOUT, PLAY_REQUEST_TIMEOUT)
+        self.upload_timeout = (REQUEST_CONNECT_TIMEOUT, UPLOAD_REQUEST_TIMEOUT)
+        # only idempotent requests are sent again once they reached the server
+        retry = Retry(total=REQUEST_RETRIES, backoff_factor=REQUEST_RETRY_BACKOFF, allowed_methods=frozenset(['GET', 'HEAD']),
+                      status_forcelist=(502, 503, 504), raise_on_status=False)
+        # blocking keeps bursts within the pool instead of opening connections that are thrown away afterwards
+        self.adapter = HTTPAdapter(pool_connections=1, pool_maxsize=REQUEST_POOL_SIZE, pool_block=True, max_retries=retry)
+        self.local = threading.local()
+        self.pending_uploads = PendingUploads(server)
+
+    @property
+    def session(self) -> requests.Session:
+        """Session of the calling thread, created on first use
+
+        Returns:
+            requests.Session: session using the shared connection pool
+        """
+        session = getattr(self.local, 'session', None)
+        if session is None:
+            session = _TimeoutSession((REQUEST_CONNECT_TIMEOUT, REQUEST_TIMEOUT))
+            session.verify = self.verify
+            session.mount('http://', self.adapter)
+            session.mount('https://', self.adapter)
+            self.local.session = session
+        return session
+
+    def pool_stats(self) -> dict:
+        """Connection reuse of the shared pool, e.g. to check that bursts of
+            commands do not open new connections
+
+        Returns:
+            dict: requests sent, connections opened, requests that reused a
+                kept-alive connection, idle connections and the pool size
+        """
+        stats = {'requests': 0, 'connections': 0, 'idle': 0, 'max_size': REQUEST_POOL_SIZE}
+        pools = self.adapter.poolmanager.pools
+        for key in pools.keys():
+            try:
+                pool = pools[key]
+            except KeyError:
+                continue
+            stats['requests'] += pool.num_requests
+            stats['connections'] += pool.num_connections
+            stats['idle'] += sum(1 for x in list(pool.pool.queue) if x is not None)
+        stats['reused'] = stats['requests'] - stats['connections']
+        return stats
 
     def play(self, uri: str, local: bool, replace: bool) -> requests.Response:
         """Play or stream a file immediately
@@ -33,7 +264,7 @@ class Requester():
             requests.Response: Generic response item
         """
         encoded_uri = encode_uri(uri)
-        return self.session.post(f'{self.server}/play?uri={encoded_uri}&replace={replace}&local={local}')
+        return self.session.post(f'{self.server}/play?uri={encoded_uri}&replace={replace}&local={local}', timeout=self.play_timeout)
 
     def stop(self) -> requests.Response:
         """Stops playing the current playlist/file, if possible
@@ -52,6 +283,18 @@ class Requester():
         """
         return self.session.get(self.server + '/status')
 
+    def status_stream(self) -> requests.Response:
+        """Opens the server-sent event stream of status changes. The first
+            event holds the full status, later events only the changed
+            fields. The server sends keep-alive comments, so a read that
+            times out means the connection is gone.
+
+        Returns:
+            requests.Response: Streamed response, read it with iter_lines()
+        """
+        return self.session.get(self.server + '/status/stream', stream=True,
+                                timeout=(REQUEST_CONNECT_TIMEOUT, STATUS_STREAM_TIMEOUT))
+
     def pause(self) -> requests.Response:
         """Toggles pause status
 
@@ -61,8 +304,12 @@ class Requester():
         return self.session.post(self.server + '/pause')
 
     def stream(self, file: Path) -> requests.Response:
-        """Posts a file to server into a temp folder, then plays
-            it immediately.
+        """Streams a file to the server, which starts playing it as soon
+            as the first chunks arrive while the rest is still uploading.
+            Nothing is sent if the file was hashed before and the server
+            already has the same content. Files are not hashed up front,
+            that would delay playback by a full read of the file; the
+            upload hashes them on the way instead.
 
         Args:
             file (Path): Client-side file to upload
@@ -70,37 +317,122 @@ class Requester():
         Returns:
             requests.Response: Generic response item
         """
-        files = {
-            'file': file.open('rb'),
-            'Content-Disposition': 'form-data; name="file"; filename="' + str(file) + '"',
-            'Content-Type': 'text/xml'
-        }
-        res = self.session.post(f'{self.server}/stream', files=files).json()
-        return self.play(res.get('file'), local=True, replace=True)
-
-    def flist(self) -> requests.Response:
+        digest = known_digest(file)
+        if digest is not None:
+            res = self.session.post(f'{self.server}/blobs/{digest}/play', timeout=self.play_timeout)
+            if res.status_code != 404:
+                return res
+        body = _HashingReader(file)
+        try:
+            return self.session.post(f'{self.server}/stream/progressive', params={'filename': file.name}, data=body,
+                                     headers={'Content-Type': 'application/octet-stream'}, timeout=self.upload_timeout)
+        finally:
+            body.close()
+
+    def flist(self, offset: int = 0, limit: Union[int, None] = None, prefix: str = '', sort: str = 'name', order: str = 'asc') -> requests.Response:
         """Gets list of files in the server's media directory
 
+        Args:
+            offset (int): number of files to skip
+            limit (Union[int, None]): maximum number of files, None for all
+            prefix (str): only list files whose name starts with this
+            sort (str): sort by 'name', 'size', 'mtime' or 'duration'
+            order (str): 'asc' or 'desc'
+
         Returns:
             requests.Response: Generic response item
         """
-        return self.session.get(self.server + '/list')
+        params = {'offset': offset, 'prefix': prefix, 'sort': sort, 'order': order}
+        if limit is not None:
+            params['limit'] = limit
+        return self.session.get(self.server + '/list', params=params)
 
-    def upload(self, file: Path) -> requests.Response:
-        """Uploads a file to server, into the media directory
+    def media_url(self, name: str) -> str:
+        """Url a file in the server's media directory can be downloaded or
+            streamed from, e.g. by a local mpv instance. Supports range
+            requests.
 
         Args:
-            file (Path): Client-side files to upload
+            name (str): name as returned by flist()
+
+        Returns:
+            str: the url
+        """
+        return f'{self.server}/media/{quote(name)}'
+
+    def upload(self, file: Path, target: str = 'media') -> requests.Response:
+        """Uploads a file to the server in chunks, several at a time. Each
+            chunk carries its sha256 and is retried on failure. Once a
+            chunk fails for good, the chunks not sent yet are dropped and
+            the error is raised. If an earlier upload of the same file
+            broke off, it is resumed and only the missing chunks are sent,
+            also after the client restarted as long as the server still
+            has the upload. If the server already has the same content,
+            only the name is sent.
+
+        Args:
+            file (Path): Client-side file to upload
+            target (str): 'media' to store it in the media directory,
+                'stream' to play it once uploaded
 
         Returns:
             requests.Response: Generic response item
         """
-        files = {
-            'file': file.open('rb'),
-            'Content-Disposition': 'form-data; name="file"; filename="' + str(file) + '"',
-            'Content-Type': 'text/xml'
-        }
-        return self.session.post(f'{self.server}/upload', files=files)
+        stat = file.stat()
+        digest = file_digest(file)
+        if target == 'media':
+            res = self.session.get(f'{self.server}/blobs/{digest}')
+            if res.status_code == 200:
+                return self.session.post(f'{self.server}/blobs/{digest}/media', params={'filename': file.name})
+        else:
+            res = self.session.post(f'{self.server}/blobs/{digest}/play', timeout=self.play_timeout)
+            if res.status_code != 404:
+                return res
+        key = (str(file.resolve()), stat.st_size, stat.st_mtime, target)
+        session_status = None
+        pending = self.pending_uploads.get(key)
+        if pending is not None:
+            res = self.session.get(f'{self.server}/uploads/{pending}')
+            if res.status_code == 200:
+                session_status = res.json()
+        if session_status is None:
+            res = self.session.post(f'{self.server}/uploads', json={
+                'filename': file.name, 'size': stat.st_size, 'chunk_size': UPLOAD_CHUNK_SIZE, 'target': target,
+                'sha256': digest})
+            if res.status_code != 201:
+                return res
+            session_status = res.json()
+        upload_id = session_status['upload_id']
+        self.pending_uploads.set(key, upload_id)
+        chunk_size = session_status['chunk_size']
+        with ThreadPoolExecutor(max_workers=UPLOAD_PARALLEL_CHUNKS) as executor:
+            futures = [executor.submit(self._upload_chunk, file, upload_id, index * chunk_size, chunk_size)
+                       for index in session_status['missing']]
+            done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+            failed = [x.exception() for x in done if x.exception() is not None]
+            if failed:
+                # chunks not started yet are dropped, the upload resumes from what the server has
+                for future in futures:
+                    future.cancel()
+                raise failed[0]
+        res = self.session.post(f'{self.server}/uploads/{upload_id}/complete', timeout=self.upload_timeout)
+        self.pending_uploads.discard(key)
+        return res
+
+    def _upload_chunk(self, file: Path, upload_id: str, offset: int, chunk_size: int) -> None:
+        with file.open('rb') as fo:
+            fo.seek(offset)
+            data = fo.read(chunk_size)
+        headers = {'Content-Type': 'application/octet-stream', 'X-Chunk-Sha256': hashlib.sha256(data).hexdigest()}
+        for attempt in range(UPLOAD_CHUNK_RETRIES + 1):
+            try:
+                res = self.session.put(f'{self.server}/uploads/{upload_id}', params={'offset': offset}, data=data, headers=headers,
+                                       timeout=self.upload_timeout)
+                res.raise_for_status()
+                return
+            except (ConnectionError, Timeout, HTTPError):
+                if attempt == UPLOAD_CHUNK_RETRIES:
+                    raise
 
     def mute(self) -> requests.Response:
         """Toggle mute status on the player
@@ -126,16 +458,18 @@ class Requester():
         """
         return self.session.post(self.server + '/repeat')
 
-    def seek(self, percent: float) -> requests.Response:
+    def seek(self, percent: float, exact: bool = True) -> requests.Response:
         """Seek to the specified place in file, if possible
 
         Args:
             percent (float): absolute percent position to seek too
+            exact (bool): seek to the exact position, otherwise to the
+                nearest keyframe, which is faster
 
         Returns:
             requests.Response: Generic response item
         """
-        return self.session.post(f'{self.server}/seek?percent_pos={percent}')
+        return self.session.post(f'{self.server}/seek?percent_pos={percent}&exact={str(exact).lower()}')
 
     def volume(self, volume: int) -> requests.Response:
         """Sets volume on the player
@@ -156,10 +490,83 @@ class Requester():
             new (bool): whether this is a new or updated playlist
             index (int): the index item to start playing, starting at zero
         Returns:
-            requests.Response: Generic response item
+            requests.Response: response item with the entry count and how
+                long the server took to load the playlist in elapsed_ms
         """
         plist_json = json.dumps({'plist': plist, 'new': new, 'index': index})
-        return self.session.post(f'{self.server}/playlist', data=plist_json, headers={'Content-type': 'application/json', 'Accept': 'application/json'})
+        return self.session.post(f'{self.server}/playlist/', data=plist_json, headers={'Content-type': 'application/json', 'Accept': 'application/json'})
+
+    def playlist_ops(self, ops: list[dict]) -> requests.Response:
+        """Changes the playlist on the server in place, see
+            modules.playlist_diff for computing the operations
+
+        Args:
+            ops (list[dict]): operations like {'op': 'append', 'item': uri},
+                {'op': 'insert', 'item': uri, 'index': 2},
+                {'op': 'move', 'index': 0, 'to': 3}, {'op': 'remove', 'index': 1}
+                or {'op': 'jump', 'index': 0}
+
+        Returns:
+            requests.Response: Generic response item
+        """
+        return self.session.post(f'{self.server}/playlist/ops', json={'ops': ops})
+
+    def saved_playlists(self) -> requests.Response:
+        """Lists the playlists saved on the server
+
+        Returns:
+            requests.Response: response item with 'playlists', each with
+                name, count and updated
+        """
+        return self.session.get(f'{self.server}/playlists')
+
+    def save_playlist(self, name: str, plist: list[str]) -> requests.Response:
+        """Saves a playlist on the server, replacing one of the same name
+
+        Args:
+            name (str): name to save the playlist as
+            plist (list[str]): items of the playlist
+
+        Returns:
+            requests.Response: Generic response item
+        """
+        return self.session.put(f'{self.server}/playlists/{quote(name, safe="")}', json={'plist': plist})
+
+    def saved_playlist(self, name: str) -> requests.Response:
+        """Gets the items of a saved playlist
+
+        Args:
+            name (str): name of the playlist
+
+        Returns:
+            requests.Response: response item with the items in 'plist'
+        """
+        return self.session.get(f'{self.server}/playlists/{quote(name, safe="")}')
+
+    def load_playlist(self, name: str, index: int = 0) -> requests.Response:
+        """Plays a saved playlist, the server loads it without the items
+            being sent again
+
+        Args:
+            name (str): name of the playlist
+            index (int): the index item to start playing, starting at zero
+
+        Returns:
+            requests.Response: response item with the entry count and
+                elapsed_ms
+        """
+        return self.session.post(f'{self.server}/playlists/{quote(name, safe="")}/load?index={index}')
+
+    def delete_playlist(self, name: str) -> requests.Response:
+        """Deletes a saved playlist
+
+        Args:
+            name (str): name of the playlist
+
+        Returns:
+            requests.Response: Generic response item
+        """
+        return self.session.delete(f'{self.server}/playlists/{quote(name, safe="")}')
 
     def next(self) -> requests.Response:
         """Plays next playlist item, if possible
@@ -0,0 +1,172 @@
+from pathlib import Path
+from typing import Union
+import os
+import threading
+import time
+import traceback
+
+from .mpv import MPV
+from .mpvplayer import PlayerStateCache
+
+
+class SpoolManager():
+    def __init__(self, spool_dirs: list[Path], player: MPV, state: PlayerStateCache, max_bytes: int, max_age: float,
+                 check_interval: float = 60.0, resolve_uri=None) -> None:
+        """Keeps the spool directories within a byte budget. Files older
+            than max_age are removed, then the least recently used ones
+            until the rest fits into max_bytes. Whatever mpv is playing or
+            has queued in its playlist is never removed. Only files below
+            spool_dirs are considered, anything else next to them is left
+            to whoever manages it.
+
+        Args:
+            spool_dirs (list[Path]): directories holding streamed files
+            player (MPV): the mpv instance, to learn what is being played
+            state (PlayerStateCache): status cache holding the playlist
+            max_bytes (int): byte budget for the whole directory
+            max_age (float): seconds after their last use files are removed
+            check_interval (float): seconds between checks
+            resolve_uri (function): maps a playlist entry to the local file
+                behind it, or None. Defaults to treating entries without a
+                scheme as paths.
+        """
+        self.spool_dirs = [x.resolve() for x in spool_dirs]
+        self.state = state
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.check_interval = check_interval
+        self.resolve_uri = resolve_uri or self._resolve_path
+        self.protectors = []
+        self.cleanups = []
+        self.last_used = {}
+        self.playing = None
+        self.usage = {'used_bytes': 0, 'files': 0, 'evicted_files': 0, 'evicted_bytes': 0}
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        player.observe_property('path', self._on_path_change)
+        threading.Thread(target=self._check_loop, name='SpoolManager', daemon=True).start()
+
+    def add_protector(self, protector) -> None:
+        """Registers a function returning paths that must not be removed,
+            e.g. files that are still being written
+
+        Args:
+            protector (function): called without arguments before each check
+        """
+        self.protectors.append(protector)
+
+    def add_cleanup(self, cleanup) -> None:
+        """Registers a function that is called after each check with the
+            playlist entries mpv still uses, e.g. to forget streams that
+            are no longer queued
+
+        Args:
+            cleanup (function): called with a set of playlist entries
+        """
+        self.cleanups.append(cleanup)
+
+    def notify(self) -> None:
+        """Requests a check soon, e.g. after a new file was spooled
+        """
+        self.wakeup.set()
+
+    def stats(self) -> dict:
+        """Spool usage as of the last check
+
+        Returns:
+            dict: used bytes, file count, limits and eviction counters
+        """
+        with self.lock:
+            return dict(self.usage, max_bytes=self.max_bytes, max_age=self.max_age)
+
+    def enforce(self) -> None:
+        """Removes files until the spool is within its limits
+        """
+        entries = self._entries()
+        protected = self._protected(entries)
+        now = time.time()
+        files = []
+        for spool_dir in self.spool_dirs:
+            for root, _dirs, names in os.walk(spool_dir):
+                for name in names:
+                    path = Path(root, name)
+                    try:
+                        stat = path.stat()
+                    except OSError:
+                        continue
+                    last_used = max(stat.st_mtime, self.last_used.get(path, 0))
+                    files.append((last_used, stat.st_size, path))
+        files.sort(key=lambda x: x[0])
+        used = sum(x[1] for x in files)
+        evicted_files = evicted_bytes = 0
+        for last_used, size, path in files:
+            if used <= self.max_bytes and now - last_used <= self.max_age:
+                break
+            if path in protected:
+                continue
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            self.last_used.pop(path, None)
+            used -= size
+            evicted_files += 1
+            evicted_bytes += size
+            self._remove_empty_parents(path)
+        with self.lock:
+            self.usage['used_bytes'] = used
+            self.usage['files'] = len(files) - evicted_files
+            self.usage['evicted_files'] += evicted_files
+            self.usage['evicted_bytes'] += evicted_bytes
+        for cleanup in self.cleanups:
+            cleanup(entries)
+
+    def _remove_empty_parents(self, path: Path) -> None:
+        parent = path.parent
+        while parent not in self.spool_dirs and any(x in parent.parents for x in self.spool_dirs):
+            try:
+                parent.rmdir()
+            except OSError:
+                return
+            parent = parent.parent
+
+    def _entries(self) -> set:
+        entries = set(self.state.snapshot().get('playlist_names') or [])
+        if self.playing is not None:
+            entries.add(self.playing)
+        return entries
+
+    def _protected(self, entries: set) -> set:
+        protected = set()
+        for entry in entries:
+            path = self.resolve_uri(entry)
+            if path is not None:
+                protected.add(path.resolve())
+        for protector in self.protectors:
+            protected.update(x.resolve() for x in protector())
+        return protected
+
+    def _resolve_path(self, uri: str) -> Union[Path, None]:
+        if '://' in uri:
+            return None
+        return Path(uri)
+
+    def _on_path_change(self, _name: str, path: Union[str, None]) -> None:
+        self.playing = path
+        if path is not None:
+            local = self.resolve_uri(path)
+            if local is not None:
+                self.last_used[local.resolve()] = time.time()
+
+    def _check_loop(self) -> None:
+        while True:
+            self.wakeup.wait(self.check_interval)
+            self.wakeup.clear()
+            try:
+                self.enforce()
+            except Exception:
+                traceback.print_exc()
+
+
+if __name__ == '__main__':
+    pass
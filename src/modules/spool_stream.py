@@ -0,0 +1,190 @@
+from pathlib import Path
+from typing import Union
+import re
+import threading
+import time
+
+from .mpv import MPV, ErrorCode
+
+# seconds a finished spool is kept for mpv to open it before it can be pruned
+PRUNE_GRACE = 30
+
+
+class SpoolFile():
+    def __init__(self, path: Path, size: Union[int, None]) -> None:
+        """A file that is still being written by an upload while mpv
+            is already reading from it.
+
+        Args:
+            path (Path): location of the spool file
+            size (Union[int, None]): final size in bytes, if known
+        """
+        self.path = path
+        self.size = size
+        self.received = 0
+        self.complete = False
+        self.finished = None
+        self.condition = threading.Condition()
+
+    def extend(self, length: int) -> None:
+        """Marks another chunk as written and flushed, waking up readers
+
+        Args:
+            length (int): number of bytes that were appended
+        """
+        with self.condition:
+            self.received += length
+            self.condition.notify_all()
+
+    def finish(self) -> None:
+        """Marks the upload as done, readers get EOF once they reach
+            the end of what was received
+        """
+        with self.condition:
+            self.complete = True
+            self.finished = time.monotonic()
+            if self.size is None or self.size > self.received:
+                self.size = self.received
+            self.condition.notify_all()
+
+
+class SpoolStream():
+    def __init__(self, spool: SpoolFile) -> None:
+        """mpv stream frontend reading from a SpoolFile, blocks until
+            the requested data has been uploaded.
+
+        Args:
+            spool (SpoolFile): the spool to read from
+        """
+        self.spool = spool
+        self.fo = spool.path.open('rb')
+        self.pos = 0
+        self.cancelled = False
+
+    @property
+    def size(self) -> Union[int, None]:
+        return self.spool.size
+
+    def _wait_for_data(self) -> int:
+        with self.spool.condition:
+            self.spool.condition.wait_for(
+                lambda: self.spool.received > self.pos or self.spool.complete or self.cancelled)
+            return self.spool.received - self.pos
+
+    def readinto(self, buf: memoryview) -> int:
+        available = self._wait_for_data()
+        if available <= 0 or self.cancelled:
+            return 0
+        read = self.fo.readinto(buf[:available]) or 0
+        self.pos += read
+        return read
+
+    def read(self, size: int) -> bytes:
+        available = self._wait_for_data()
+        if available <= 0 or self.cancelled:
+            return b''
+        data = self.fo.read(min(size, available))
+        self.pos += len(data)
+        return data
+
+    def seek(self, offset: int) -> int:
+        # only the part that has already been received can be seeked into
+        if offset > self.spool.received:
+            return ErrorCode.GENERIC
+        self.fo.seek(offset)
+        self.pos = offset
+        return offset
+
+    def close(self) -> None:
+        self.fo.close()
+
+    def cancel(self) -> None:
+        with self.spool.condition:
+            self.cancelled = True
+            self.spool.condition.notify_all()
+
+
+class SpoolRegistry():
+    def __init__(self, player: MPV, spool_dir: Path, protocol: str = 'spool') -> None:
+        """Keeps track of spool files and makes them playable through
+            a custom mpv stream protocol, e.g. spool://1670000000.0.mkv
+
+        Args:
+            player (MPV): the mpv instance to register the protocol with
+            spool_dir (Path): directory to create spool files in
+            protocol (str): name of the stream protocol
+        """
+        self.spool_dir = spool_dir
+        self.protocol = protocol
+        self.spools = {}
+        player.register_stream_protocol(protocol, self._open)
+
+    def create(self, suffix: str, size: Union[int, None]) -> tuple[str, SpoolFile]:
+        """Creates a new, empty spool
+
+        Args:
+            suffix (str): file extension to keep, helps mpv's probing
+            size (Union[int, None]): final size in bytes, if known
+
+        Returns:
+            tuple[str, SpoolFile]: the uri to play and the spool itself
+        """
+        name = f'{str(time.time())}{suffix}'
+        spool = SpoolFile(Path(self.spool_dir, name), size)
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        spool.path.touch()
+        self.spools[name] = spool
+        return f'{self.protocol}://{name}', spool
+
+    def remove(self, name: str) -> None:
+        """Forgets about a spool, it can no longer be opened by mpv
+
+        Args:
+            name (str): file name of the spool
+        """
+        self.spools.pop(name, None)
+
+    def prune(self, entries: set) -> None:
+        """Forgets finished spools that mpv no longer plays or has queued,
+            e.g. ones replaced by another file or evicted from the spool
+            directory. Streams mpv already opened keep reading.
+
+        Args:
+            entries (set): playlist entries and the path mpv is playing
+        """
+        cutoff = time.monotonic() - PRUNE_GRACE
+        for name, spool in list(self.spools.items()):
+            if spool.complete and spool.finished < cutoff and f'{self.protocol}://{name}' not in entries:
+                self.remove(name)
+
+    def resolve(self, uri: str) -> Union[Path, None]:
+        """Maps a spool uri to the file behind it
+
+        Args:
+            uri (str): e.g. spool://1670000000.0.mkv
+
+        Returns:
+            Union[Path, None]: the spool file, None for unknown uris
+        """
+        match = re.fullmatch(f'{self.protocol}://(.*)', uri)
+        if match is None or match.group(1) not in self.spools:
+            return None
+        return self.spools[match.group(1)].path
+
+    def active_paths(self) -> list[Path]:
+        """Spool files that are still being uploaded
+
+        Returns:
+            list[Path]: the incomplete spool files
+        """
+        return [x.path for x in list(self.spools.values()) if not x.complete]
+
+    def _open(self, uri: str) -> SpoolStream:
+        name, = re.fullmatch(f'{self.protocol}://(.*)', uri).groups()
+        if name not in self.spools:
+            raise ValueError('Unknown spool')
+        return SpoolStream(self.spools[name])
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,92 @@
+import asyncio
+import threading
+
+from .mpvplayer import PlayerStateCache
+
+
+class StatusSubscriber():
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Collects status changes for a single streaming client. Changes
+            of the same field are merged until the client picks them up.
+
+        Args:
+            loop (asyncio.AbstractEventLoop): event loop the client's
+                response is being served from
+        """
+        self.loop = loop
+        self.pending = {}
+        self.ready = asyncio.Event()
+
+    def push(self, field: str, value) -> None:
+        """Hands a changed field over to the subscriber's event loop, safe
+            to call from mpv's event thread
+
+        Args:
+            field (str): StatusItem field that changed
+            value: the new value of the field
+        """
+        try:
+            self.loop.call_soon_threadsafe(self._merge, field, value)
+        except RuntimeError:
+            pass  # loop already closed, client is gone
+
+    def _merge(self, field: str, value) -> None:
+        self.pending[field] = value
+        self.ready.set()
+
+    async def changes(self) -> dict:
+        """Waits until at least one field has changed
+
+        Returns:
+            dict: all fields that changed since the last call
+        """
+        await self.ready.wait()
+        self.ready.clear()
+        changes, self.pending = self.pending, {}
+        return changes
+
+
+class StatusBroadcaster():
+    def __init__(self, state: PlayerStateCache) -> None:
+        """Listens for changes of the cached player status and fans them
+            out to all subscribed clients.
+
+        Args:
+            state (PlayerStateCache): the status cache to listen to
+        """
+        self.subscribers = set()
+        self.lock = threading.Lock()
+        state.add_listener(self._on_status_change)
+
+    def subscribe(self, loop: asyncio.AbstractEventLoop) -> StatusSubscriber:
+        """Registers a new client
+
+        Args:
+            loop (asyncio.AbstractEventLoop): the client's event loop
+
+        Returns:
+            StatusSubscriber: receives every status change from now on
+        """
+        subscriber = StatusSubscriber(loop)
+        with self.lock:
+            self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: StatusSubscriber) -> None:
+        """Removes a client, further changes are no longer delivered to it
+
+        Args:
+            subscriber (StatusSubscriber): subscriber returned by subscribe()
+        """
+        with self.lock:
+            self.subscribers.discard(subscriber)
+
+    def _on_status_change(self, field: str, value) -> None:
+        with self.lock:
+            subscribers = list(self.subscribers)
+        for subscriber in subscribers:
+            subscriber.push(field, value)
+
+
+if __name__ == '__main__':
+    pass
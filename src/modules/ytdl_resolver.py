@@ -0,0 +1,337 @@
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path, PurePosixPath
+from typing import Union
+from urllib.parse import parse_qs, urlsplit
+import json
+import multiprocessing
+import re
+import sqlite3
+import threading
+import time
+import traceback
+
+from .mpv import MPV
+from .mpvplayer import PlayerStateCache
+from .ytdl_worker import yt_dlp, extract_stream, init_worker, ping
+
+# urls ending in these are played directly, there is nothing to resolve
+DIRECT_EXTENSIONS = {'.mkv', '.mp4', '.m4v', '.webm', '.mov', '.avi', '.mpeg', '.mpg', '.ts', '.m3u8', '.mpd',
+                     '.mp3', '.m4a', '.opus', '.ogg', '.flac', '.wav', '.mka', '.aac'}
+# signed urls are dropped this many seconds before they expire
+EXPIRY_MARGIN = 60
+
+_PATH_EXPIRY = re.compile(r'/expire/(\d+)')
+
+
+def url_expiry(url: str) -> Union[float, None]:
+    """Expiry time embedded in a signed url, like youtube's expire=
+
+    Args:
+        url (str): a stream url
+
+    Returns:
+        Union[float, None]: unix time the url stops working, None if unknown
+    """
+    parts = urlsplit(url)
+    query = parse_qs(parts.query)
+    for key in ('expire', 'expires', 'Expires'):
+        if key in query:
+            try:
+                return float(query[key][0])
+            except ValueError:
+                pass
+    match = _PATH_EXPIRY.search(parts.path)
+    return float(match.group(1)) if match else None
+
+
+class ExtractionCache():
+    def __init__(self, db_file: Path) -> None:
+        """Resolved stream urls kept in an sqlite database, so they survive
+            restarts of the server
+
+        Args:
+            db_file (Path): database file, created if missing
+        """
+        db_file.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(db_file, check_same_thread=False, isolation_level=None)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('''
+            CREATE TABLE IF NOT EXISTS extractions (
+                url TEXT PRIMARY KEY,
+                expires REAL NOT NULL,
+                result TEXT NOT NULL
+            )
+        ''')
+        self.purge()
+
+    def get(self, url: str) -> Union[tuple[float, dict], None]:
+        """Stored result for a url
+
+        Args:
+            url (str): page url
+
+        Returns:
+            Union[tuple[float, dict], None]: expiry time and result, None if
+                missing or expired
+        """
+        with self.lock:
+            row = self.db.execute('SELECT expires, result FROM extractions WHERE url = ? AND expires > ?',
+                                  (url, time.time())).fetchone()
+        return None if row is None else (row[0], json.loads(row[1]))
+
+    def put(self, url: str, expires: float, result: dict) -> None:
+        """Stores the result for a url
+
+        Args:
+            url (str): page url
+            expires (float): unix time the result stops being valid
+            result (dict): the result of extract_stream
+        """
+        with self.lock:
+            self.db.execute('INSERT OR REPLACE INTO extractions (url, expires, result) VALUES (?, ?, ?)',
+                            (url, expires, json.dumps(result)))
+
+    def purge(self) -> None:
+        """Removes expired results
+        """
+        with self.lock:
+            self.db.execute('DELETE FROM extractions WHERE expires <= ?', (time.time(),))
+
+
+class YtdlResolver():
+    def __init__(self, player: MPV, state: PlayerStateCache, ytdl_format: str, ttl: float, max_workers: int = 2,
+                 prefetch_count: int = 2, hook_timeout: float = 20.0, cache_file: Union[Path, None] = None) -> None:
+        """Resolves remote playlist items to direct stream urls before mpv
+            reaches them. Whenever the playlist position changes the next
+            prefetch_count items are resolved in a pool of worker processes
+            that keep yt-dlp and its extractors loaded, and an
+            on_load hook hands the cached result to mpv so it can open the
+            stream right away instead of running yt-dlp itself. Without
+            yt_dlp installed mpv's own ytdl hook is left to do the work.
+            Results are kept in memory and, given a cache_file, on disk
+            until the signed urls in them expire or ttl has passed.
+
+        Args:
+            player (MPV): the mpv instance
+            state (PlayerStateCache): status cache holding the playlist
+            ytdl_format (str): yt-dlp format selection
+            ttl (float): seconds a resolved url is reused for
+            max_workers (int): number of worker processes
+            prefetch_count (int): how many upcoming items to resolve
+            hook_timeout (float): seconds mpv is held up waiting for an
+                item that is not resolved yet, mpv's ytdl hook resolves it
+                after that
+            cache_file (Union[Path, None]): database to persist results in
+        """
+        self.player = player
+        self.state = state
+        self.ytdl_format = ytdl_format
+        self.ttl = ttl
+        self.max_workers = max_workers
+        self.prefetch_count = prefetch_count
+        self.hook_timeout = hook_timeout
+        self.cache = {}
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.counters = {'hits': 0, 'misses': 0, 'disk_hits': 0, 'extractions': 0, 'failures': 0,
+                         'extract_seconds': 0.0, 'wait_seconds': 0.0}
+        self.available = yt_dlp is not None
+        self.disk_cache = ExtractionCache(cache_file) if self.available and cache_file is not None else None
+        if self.available:
+            self.executor = self._new_executor()
+            # runs before mpv's ytdl hook, which has priority 10
+            player.register_hook('on_load', self._on_load, priority=5)
+            player.observe_property('playlist-pos', self._on_playlist_pos_change)
+
+    def close(self) -> None:
+        """Stops the worker processes, extractions in progress are abandoned
+        """
+        if self.available:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        # spawned rather than forked, forking a process running libmpv threads is not safe
+        executor = ProcessPoolExecutor(self.max_workers, mp_context=multiprocessing.get_context('spawn'),
+                                       initializer=init_worker, initargs=(self.ytdl_format,))
+        # workers are started on demand, start them now so the first url does not pay for it
+        for _ in range(self.max_workers):
+            executor.submit(ping)
+        return executor
+
+    def wants(self, url: Union[str, None]) -> bool:
+        """Checks whether a url should go through yt-dlp
+
+        Args:
+            url (Union[str, None]): a playlist entry
+
+        Returns:
+            bool: True for http urls that are not media files
+        """
+        if not self.available or not url or url[:4] != 'http':
+            return False
+        return PurePosixPath(urlsplit(url).path).suffix.lower() not in DIRECT_EXTENSIONS
+
+    def lookup(self, url: str) -> Union[dict, None]:
+        """Cached result for a url, without resolving it. Results found on
+            disk are kept in memory from then on.
+
+        Args:
+            url (str): page url
+
+        Returns:
+            Union[dict, None]: the result, None if not cached or expired
+        """
+        with self.lock:
+            entry = self.cache.get(url)
+            if entry is not None and entry[0] < time.time():
+                del self.cache[url]
+                entry = None
+        if entry is None and self.disk_cache is not None:
+            entry = self.disk_cache.get(url)
+            if entry is not None:
+                with self.lock:
+                    self.cache[url] = entry
+                    self.counters['disk_hits'] += 1
+        return None if entry is None else entry[1]
+
+    def stats(self) -> dict:
+        """Counters of the cache as consulted when mpv loads an item. Hits
+            are items that were resolved ahead of time, misses had to wait
+            for yt-dlp for wait_seconds in total.
+
+        Returns:
+            dict: counters, along with an estimate of the seconds saved
+        """
+        with self.lock:
+            stats = dict(self.counters, cached=len(self.cache), pending=len(self.pending), available=self.available)
+        extractions = stats['extractions'] - stats['failures']
+        average = stats['extract_seconds'] / extractions if extractions > 0 else 0.0
+        stats['saved_seconds'] = stats['hits'] * average
+        return stats
+
+    def prefetch(self, url: str) -> Union[Future, None]:
+        """Starts resolving a url in the background unless it is cached or
+            already being resolved
+
+        Args:
+            url (str): page url
+
+        Returns:
+            Union[Future, None]: the pending result, None if cached
+        """
+        if self.lookup(url) is not None:
+            return None
+        with self.lock:
+            future = self.pending.get(url)
+            if future is None:
+                try:
+                    future = self.executor.submit(extract_stream, url, self.ytdl_format)
+                except BrokenProcessPool:
+                    # a worker died, e.g. killed for running out of memory
+                    self.executor = self._new_executor()
+                    future = self.executor.submit(extract_stream, url, self.ytdl_format)
+                self.pending[url] = future
+                started = time.perf_counter()
+                future.add_done_callback(lambda done: self._extracted(url, started, done))
+            return future
+
+    def resolve(self, url: str, timeout: Union[float, None] = None) -> Union[dict, None]:
+        """Result for a url, resolving it if needed
+
+        Args:
+            url (str): page url
+            timeout (Union[float, None]): seconds to wait at most
+
+        Raises:
+            TimeoutError: if the url is still being resolved after timeout
+
+        Returns:
+            Union[dict, None]: the result, None if it could not be resolved
+        """
+        result = self.lookup(url)
+        if result is not None:
+            self._count('hits')
+            return result
+        self._count('misses')
+        future = self.prefetch(url)
+        if future is None:
+            return self.lookup(url)
+        started = time.perf_counter()
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            raise
+        except Exception:
+            traceback.print_exc()
+            return None
+        finally:
+            self._count('wait_seconds', time.perf_counter() - started)
+
+    def _count(self, name: str, amount: Union[int, float] = 1) -> None:
+        with self.lock:
+            self.counters[name] += amount
+
+    def _expiry(self, result: dict) -> float:
+        expires = time.time() + self.ttl
+        for url in (result['url'], result['audio_url']):
+            signed = url_expiry(url) if url else None
+            if signed is not None:
+                expires = min(expires, signed - EXPIRY_MARGIN)
+        return expires
+
+    def _extracted(self, url: str, started: float, future: Future) -> None:
+        try:
+            if future.cancelled():
+                return
+            if future.exception() is not None:
+                self._count('failures')
+                return
+            self._count('extract_seconds', time.perf_counter() - started)
+            result = future.result()
+            if result is not None:
+                expires = self._expiry(result)
+                now = time.time()
+                with self.lock:
+                    self.cache = {k: v for k, v in self.cache.items() if v[0] >= now}
+                    self.cache[url] = (expires, result)
+                if self.disk_cache is not None:
+                    self.disk_cache.put(url, expires, result)
+        finally:
+            self._count('extractions')
+            # only once the result is cached, so nobody starts a second extraction
+            with self.lock:
+                self.pending.pop(url, None)
+
+    def _on_playlist_pos_change(self, _name: str, pos: Union[int, None]) -> None:
+        if pos is None or pos < 0:
+            return
+        entries = self.state.snapshot().get('playlist_names') or []
+        for url in entries[pos:pos + 1 + self.prefetch_count]:
+            if self.wants(url):
+                self.prefetch(url)
+
+    def _on_load(self, _name: str) -> None:
+        url = self.player.stream_open_filename
+        if not self.wants(url):
+            return
+        try:
+            result = self.resolve(url, self.hook_timeout)
+        except TimeoutError:
+            # left to mpv's own ytdl hook, so slow extractions still play
+            return
+        if result is None:
+            return
+        self.player.stream_open_filename = result['url']
+        self.player.file_local['ytdl'] = False
+        if result['audio_url'] is not None:
+            self.player.file_local['audio-files'] = [result['audio_url']]
+        if result['headers']:
+            self.player.file_local['http-header-fields'] = [f'{k}: {v}' for k, v in result['headers'].items()]
+        if result['title']:
+            self.player.file_local['force-media-title'] = result['title']
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,72 @@
+from typing import Union
+import os
+
+try:
+    import yt_dlp
+except ImportError:
+    yt_dlp = None
+
+# extractors imported when a worker starts instead of on the first url
+WARM_EXTRACTORS = ('Youtube', 'YoutubeTab', 'Generic')
+
+# these run in worker processes, so the module must not import mpv or the server settings
+_ydl = None
+_ydl_format = None
+
+
+def init_worker(ytdl_format: str) -> None:
+    """Prepares a worker process, the yt-dlp instance and its extractors
+        are kept for every url the worker resolves
+
+    Args:
+        ytdl_format (str): yt-dlp format selection
+    """
+    global _ydl, _ydl_format
+    _ydl = yt_dlp.YoutubeDL({'format': ytdl_format, 'quiet': True, 'no_warnings': True, 'noplaylist': True})
+    _ydl_format = ytdl_format
+    for key in WARM_EXTRACTORS:
+        try:
+            _ydl.get_info_extractor(key)
+        except Exception:
+            pass
+
+
+def ping() -> int:
+    """Does nothing, used to start workers ahead of the first url
+
+    Returns:
+        int: process id of the worker
+    """
+    return os.getpid()
+
+
+def extract_stream(url: str, ytdl_format: str) -> Union[dict, None]:
+    """Asks yt-dlp for the direct stream urls behind a page url
+
+    Args:
+        url (str): page url, e.g. a youtube video
+        ytdl_format (str): yt-dlp format selection
+
+    Returns:
+        Union[dict, None]: url, audio_url (None unless audio is separate),
+            headers and title, None for playlists and other results mpv
+            has to expand itself
+    """
+    if _ydl is None or _ydl_format != ytdl_format:
+        init_worker(ytdl_format)
+    info = _ydl.extract_info(url, download=False)
+    if info is None or info.get('_type', 'video') != 'video':
+        return None
+    formats = info.get('requested_formats') or [info]
+    if not formats[0].get('url'):
+        return None
+    return {
+        'url': formats[0]['url'],
+        'audio_url': formats[1]['url'] if len(formats) > 1 else None,
+        'headers': formats[0].get('http_headers') or info.get('http_headers') or {},
+        'title': info.get('title')
+    }
+
+
+if __name__ == '__main__':
+    pass
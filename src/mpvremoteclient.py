@@ -5,8 +5,9 @@ import sys
 from PyQt6 import QtWidgets
 
 from qt.client_main_ui import ClientMain
-from settings.client_settings import SERVER
+from settings.client_settings import SERVER, REQUEST_BACKEND
 from modules.requester import Requester
+from modules.async_requester import AsyncRequester
 
 # To compile resources from qrc
 # pyside6-rcc resources.qrc | sed '0,/PySide6/s//PyQt6/' > resources.py
@@ -17,7 +18,7 @@ def main():
     """    
     app = QtWidgets.QApplication([])
     main_window = QtWidgets.QMainWindow()
-    requester = Requester(SERVER)
+    requester = AsyncRequester(SERVER) if REQUEST_BACKEND == 'httpx' else Requester(SERVER)
     ui = ClientMain(main_window, requester)
     main_window.show()
     sys.exit(app.exec())
@@ -1,13 +1,17 @@
-import sys
 import os
 from pathlib import Path
+from typing import Union
 
 from PyQt6 import QtWidgets, QtCore, QtGui
 
 from modules.file_io import save_urls, load_urls
 from modules.requester import Requester
+from modules.async_requester import AsyncRequester
+from modules.playlist_diff import diff_playlist
+from settings.client_settings import SLIDER_SEND_INTERVAL
 from qt.main_window import Ui_MainWindow
-from qt.upload_worker import UploadWorker
+from qt.request_worker import RequestDispatcher, AsyncRequestDispatcher, CommandCoalescer, start_event_loop
+from qt.status_worker import StatusWorker
 import qt.resources
 
 # to compile .ui modules into python
@@ -15,12 +19,12 @@ import qt.resources
 
 
 class ClientMain(Ui_MainWindow):
-    def __init__(self, main_window: QtWidgets.QMainWindow, requester: Requester) -> None:
+    def __init__(self, main_window: QtWidgets.QMainWindow, requester: Union[Requester, AsyncRequester]) -> None:
         """Main Ui window widget, inherits from auto-generated Ui_MainWindow class
 
         Args:
             main_window (QtWidgets.QMainWindow): Parent main window to this widget
-            requester (Requester): The requester instance used to make api calls. All current responses have a status_code property and json() method which returns a dict with key 'message'
+            requester (Union[Requester, AsyncRequester]): The requester instance used to make api calls. All current responses have a status_code property and json() method which returns a dict with key 'message'
         """
         self.mw = main_window
         self.mw.setWindowIcon(QtGui.QIcon(
@@ -28,17 +32,43 @@ class ClientMain(Ui_MainWindow):
         self.mw.setWindowTitle('pympvclient')
         self.media_filter = 'Media (*.mkv *.mp4 *.mpeg *.vob *.mpeg2 *.mp3 *.opus *.flac *.mp2 *.ac3 *.eac3 *.dts *.mov *.webm *.mka *.wav *.avi *.mpeg4 *.vorbis)'
         self.requester = requester
-        self.get_stats_timer = QtCore.QTimer()
-        self.get_stats_timer.setInterval(1000)
+        self.player_status = {}
+        # items the server's playlist is known to hold, None if unknown
+        self.synced_playlist = None
+        # playlists sent since the status stream last reported synced_playlist
+        self.sent_playlists = []
         self.setupUi(self.mw)
-        self.thread_pool = QtCore.QThreadPool()
+        self.status_thread_pool = QtCore.QThreadPool()
+        self.status_thread_pool.setMaxThreadCount(1)
+        if isinstance(requester, AsyncRequester):
+            # requests are coroutines on one event loop instead of a thread each
+            loop = start_event_loop()
+            self.dispatcher = AsyncRequestDispatcher(loop, self.request_failed_callback)
+            # playlist changes build on each other, so they are sent one at a time and in order
+            self.playlist_dispatcher = AsyncRequestDispatcher(loop, self.request_failed_callback, serial=True)
+        else:
+            self.thread_pool = QtCore.QThreadPool()
+            # long running uploads must not starve control commands on small machines
+            self.thread_pool.setMaxThreadCount(
+                max(self.thread_pool.maxThreadCount(), 4))
+            self.dispatcher = RequestDispatcher(
+                self.thread_pool, self.request_failed_callback)
+            # playlist changes build on each other, so they are sent one at a time and in order
+            self.playlist_thread_pool = QtCore.QThreadPool()
+            self.playlist_thread_pool.setMaxThreadCount(1)
+            self.playlist_dispatcher = RequestDispatcher(
+                self.playlist_thread_pool, self.request_failed_callback)
+        # slider drags send their latest value at a bounded rate instead of one request per step
+        self.slider_commands = CommandCoalescer(self.dispatcher, SLIDER_SEND_INTERVAL)
         self.tabWidget.setCurrentIndex(0)
         self.init_status_bar()
+        self.init_playlist_actions()
         self.load_urls_and_populate()
         self.connect_events()
         self.get_remote_file_list()
         self.get_initial_player_state()
         self.init_file_chooser()
+        self.init_status_worker()
 
     def connect_events(self) -> None:
         """Connect all ui needed elements to self methods
@@ -59,7 +89,7 @@ class ClientMain(Ui_MainWindow):
         self.actionMute.triggered.connect(self.toggle_mute)
         self.actionFullscreen.triggered.connect(self.toggle_fullscreen)
         self.actionRepeat.triggered.connect(self.toggle_repeat)
-        self.get_stats_timer.timeout.connect(self.get_stats_callback)
+        self.horizontalSliderPlayBack.sliderMoved.connect(self.scrub_to_pos)
         self.horizontalSliderPlayBack.sliderReleased.connect(self.seek_to_pos)
         self.actionClear.triggered.connect(self.clear_playlist)
         self.actionAppend.triggered.connect(self.append_to_playlist)
@@ -69,6 +99,27 @@ class ClientMain(Ui_MainWindow):
             self.play_current_playlist_item)
         self.actionNext.triggered.connect(self.play_next_item)
         self.actionPrevious.triggered.connect(self.play_previous_item)
+        self.actionSavePlaylist.triggered.connect(self.save_playlist)
+        self.actionLoadPlaylist.triggered.connect(self.choose_saved_playlist)
+
+    def init_playlist_actions(self) -> None:
+        """Adds the save and load playlist actions, which are not part of 
+            the generated ui
+        """        
+        style = self.mw.style()
+        self.actionSavePlaylist = QtGui.QAction(self.mw)
+        self.actionSavePlaylist.setIcon(style.standardIcon(
+            QtWidgets.QStyle.StandardPixmap.SP_DialogSaveButton))
+        self.actionSavePlaylist.setText('Save Playlist')
+        self.actionSavePlaylist.setToolTip('Save Playlist On The Server')
+        self.actionLoadPlaylist = QtGui.QAction(self.mw)
+        self.actionLoadPlaylist.setIcon(style.standardIcon(
+            QtWidgets.QStyle.StandardPixmap.SP_DialogOpenButton))
+        self.actionLoadPlaylist.setText('Load Playlist')
+        self.actionLoadPlaylist.setToolTip('Play A Playlist Saved On The Server')
+        self.toolBarRight.addSeparator()
+        self.toolBarRight.addAction(self.actionSavePlaylist)
+        self.toolBarRight.addAction(self.actionLoadPlaylist)
 
     def init_file_chooser(self) -> None:
         """Initializes the file chooser widget
@@ -79,11 +130,30 @@ class ClientMain(Ui_MainWindow):
             QtWidgets.QFileDialog.FileMode.ExistingFiles)
         self.file_chooser.setViewMode(QtWidgets.QFileDialog.ViewMode.List)
 
+    def init_status_worker(self) -> None:
+        """Starts a worker thread that listens for status changes pushed by 
+            the server
+        """        
+        self.status_worker = StatusWorker(self.requester.status_stream)
+        self.status_worker.signals.changed.connect(self.status_changed_callback)
+        QtCore.QCoreApplication.instance().aboutToQuit.connect(
+            self.status_worker.stop)
+        self.status_thread_pool.start(self.status_worker)
+
     def get_initial_player_state(self) -> None:
-        """Gets player state and sets UI element properties, runs
+        """Requests player state to set UI element properties, runs
             only on initial load
         """        
-        res = self.requester.status().json()
+        self.dispatcher.dispatch(
+            self.requester.status, callback=self.initial_player_state_callback)
+
+    def initial_player_state_callback(self, res) -> None:
+        """Sets UI element properties from the initial player state
+
+        Args:
+            res (Requests.response): The response object returned by the api
+        """        
+        res = res.json()
         if res.get('mute'):
             self.actionMute.setChecked(True)
         if res.get('fullscreen'):
@@ -120,35 +190,65 @@ class ClientMain(Ui_MainWindow):
         self.statusbar.addPermanentWidget(self.labelPermStatusBar)
         self.statusbar.addPermanentWidget(self.statusbarSpacer)
         self.statusbar.addPermanentWidget(self.horizontalSliderVolume)
+        self.horizontalSliderVolume.sliderMoved.connect(self.drag_volume)
         self.horizontalSliderVolume.sliderReleased.connect(self.change_volume)
 
+    def response_message_callback(self, res) -> None:
+        """Shows the message of an api response in the status bar
+
+        Args:
+            res (Requests.response): The response object returned by the api
+        """        
+        self.temp_status_message(res.json())
+
+    def request_failed_callback(self, error: Exception) -> None:
+        """Called by the dispatcher when a request could not be completed
+
+        Args:
+            error (Exception): the exception raised while making the request
+        """        
+        self.statusbar.showMessage(f'request failed: {error}')
+
     def toggle_repeat(self) -> None:
         """Toggles repeat on the player
         """        
-        res = self.requester.repeat().json()
-        self.temp_status_message(res)
+        self.dispatcher.dispatch(
+            self.requester.repeat, callback=self.response_message_callback)
 
     def toggle_mute(self) -> None:
         """Toggles mute on the player
         """        
-        res = self.requester.mute().json()
-        self.temp_status_message(res)
+        self.dispatcher.dispatch(
+            self.requester.mute, callback=self.response_message_callback)
 
     def toggle_pause(self) -> None:
         """Toggles pause on player
         """        
-        res_full = self.requester.pause()
+        self.dispatcher.dispatch(
+            self.requester.pause, callback=self.pause_callback)
+
+    def pause_callback(self, res_full) -> None:
+        """Shows result of toggling pause
+
+        Args:
+            res_full (Requests.response): The response object returned by the api
+        """        
         if res_full.status_code == 200:
             res = res_full.json()
-            if not self.actionPause.isChecked():
-                self.get_stats_timer.start()
             self.temp_status_message(res)
 
     def get_remote_file_list(self) -> None:
-        """Gets list of all files in media directory on server and displays
-            them in in a listWidgetRemoteFiles
+        """Requests list of all files in media directory on server
+        """        
+        self.dispatcher.dispatch(
+            self.requester.flist, callback=self.remote_file_list_callback, key='flist')
+
+    def remote_file_list_callback(self, res_full) -> None:
+        """Displays the remote files in listWidgetRemoteFiles
+
+        Args:
+            res_full (Requests.response): The response object returned by the api
         """        
-        res_full = self.requester.flist()
         if res_full.status_code == 200:
             res = res_full.json()
             self.listWidgetRemoteFiles.clear()
@@ -175,15 +275,15 @@ class ClientMain(Ui_MainWindow):
         selected_file = Path(self.file_chooser.getOpenFileName(
             self.mw, filter=self.media_filter)[0])
         if Path(selected_file).is_file():
-            worker = UploadWorker(self.requester.upload, selected_file)
-            worker.signals.result.connect(self.upload_callback)
-            self.thread_pool.start(worker)
+            self.dispatcher.dispatch(
+                self.requester.upload, selected_file, callback=self.upload_callback)
 
     def exit_program(self) -> None:
         """Safely exists the program, ensuring nothing is playing at the time
         """        
-        self.stop_playing()
-        sys.exit(0)
+        self.status_worker.stop()
+        self.dispatcher.dispatch(self.requester.stop, callback=lambda res: QtCore.QCoreApplication.quit(),
+                                 error_callback=lambda e: QtCore.QCoreApplication.quit())
 
     def temp_status_message(self, res: dict) -> None:
         """Displays status message indicating return from api in the status
@@ -197,17 +297,19 @@ class ClientMain(Ui_MainWindow):
     def toggle_fullscreen(self) -> None:
         """Toggles fullscreen on the player
         """        
-        res = self.requester.fullscreen().json()
-        self.temp_status_message(res)
+        self.dispatcher.dispatch(
+            self.requester.fullscreen, callback=self.response_message_callback)
 
     def stop_playing(self) -> None:
         """Stops playing the current file/playlist, if any
         """        
-        res = self.requester.stop().json()
+        self.dispatcher.dispatch(
+            self.requester.stop, callback=self.response_message_callback, key='play')
+        # stopping clears the server's playlist
+        self.synced_playlist = None
         self.actionNext.setEnabled(False)
         self.actionPrevious.setEnabled(False)
         self.actionPause.setChecked(False)
-        self.temp_status_message(res)
 
     def add_url_list(self) -> None:
         """Splits user-entered URLs from plainTextEditURL, add the entries to
@@ -250,16 +352,14 @@ class ClientMain(Ui_MainWindow):
             method to play it
         """        
         curr_url = self.listWidgetURL.currentItem().text()
-        res = self.play_single(curr_url, replace=True, local=False)
-        self.temp_status_message(res)
+        self.play_single(curr_url, replace=True, local=False)
 
     def play_item_from_file_list(self) -> None:
         """Gets double-clicked item from listWidgetRemoteFiles and 
             calls request method to play it
         """        
         curr_file = self.listWidgetRemoteFiles.currentItem().text()
-        res = self.play_single(curr_file, local=True, replace=True)
-        self.temp_status_message(res)
+        self.play_single(curr_file, local=True, replace=True)
 
     def stream_callback(self, res) -> None:
         """Called by upload worker once complete, updates ui elements to 
@@ -270,7 +370,6 @@ class ClientMain(Ui_MainWindow):
         """        
         res = res.json()
         self.temp_status_message(res)
-        self.get_stats_timer.start()
         self.actionPause.setChecked(False)
         self.temp_status_message(res)
 
@@ -281,49 +380,59 @@ class ClientMain(Ui_MainWindow):
         selected_file = Path(self.file_chooser.getOpenFileName(
             self.mw, filter=self.media_filter)[0])
         if Path(selected_file).is_file():
-            worker = UploadWorker(self.requester.stream, selected_file)
-            worker.signals.result.connect(self.stream_callback)
-            self.thread_pool.start(worker)
+            self.dispatcher.dispatch(
+                self.requester.stream, selected_file, callback=self.stream_callback)
 
-    def play_single(self, uri: str, replace: bool, local: bool):
+    def play_single(self, uri: str, replace: bool, local: bool) -> None:
         """Play a single item selected by user
 
         Args:
             uri (str): Local or remote uri to play
             replace (bool): Controls clobber, if replace is true then the selected file will replace currently playing one, if any
             local (bool): Whether this is a local or remote uri
-
-        Returns:
-            Requests.response: returns the api response back to parent method
         """        
-        res = self.requester.play(uri, local=local, replace=replace).json()
-        if not self.get_stats_timer.isActive():
-            self.get_stats_timer.start()
+        self.dispatcher.dispatch(self.requester.play, uri, local=local, replace=replace,
+                                 callback=self.response_message_callback, key='play')
+        if replace:
+            self.synced_playlist = None
         self.actionPause.setChecked(False)
         self.horizontalSliderPlayBack.setEnabled(True)
-        return res
 
-    def get_stats_callback(self) -> None:
-        """Called by status timer to update UI elements to reflect current 
-            player status
+    def status_changed_callback(self, changes: dict) -> None:
+        """Called by status worker whenever the server pushes changed player 
+            properties, updates UI elements to reflect current player status
+
+        Args:
+            changes (dict): status fields that changed, the first event after 
+                connecting contains all of them
         """        
-        res = self.requester.status().json()
+        self.player_status.update(changes)
+        res = self.player_status
         if res.get('filename') is None:
-            self.get_stats_timer.stop()
             self.horizontalSliderPlayBack.setEnabled(False)
             self.horizontalSliderPlayBack.setSliderPosition(0)
             self.actionPause.setEnabled(False)
             self.actionPause.setChecked(False)
-        elif res.get('pause'):
-            self.get_stats_timer.stop()
         else:
             if not self.horizontalSliderPlayBack.isSliderDown() and res.get('percent_pos') is not None:
                 self.horizontalSliderPlayBack.setSliderPosition(
                     int(res.get('percent_pos')))
+            self.horizontalSliderPlayBack.setEnabled(True)
             self.actionPause.setEnabled(True)
-        plist_length = len(res.get('playlist_names'))
+            self.actionPause.setChecked(bool(res.get('pause')))
+        if 'mute' in changes:
+            self.actionMute.setChecked(bool(res.get('mute')))
+        if 'fullscreen' in changes:
+            self.actionFullscreen.setChecked(bool(res.get('fullscreen')))
+        if 'repeat' in changes:
+            self.actionRepeat.setChecked(bool(res.get('repeat')))
+        if 'playlist_names' in changes:
+            self.check_synced_playlist(res.get('playlist_names') or [])
+        if 'volume' in changes and not self.horizontalSliderVolume.isSliderDown() and res.get('volume') is not None:
+            self.horizontalSliderVolume.setSliderPosition(int(res.get('volume')))
+        plist_length = len(res.get('playlist_names') or [])
         plist_pos = res.get('playlist_pos')
-        if plist_length > 1 and res.get('filename') is not None:
+        if plist_length > 1 and res.get('filename') is not None and self.listWidgetPlaylist.item(plist_pos) is not None:
             self.listWidgetPlaylist.item(plist_pos).setSelected(True)
             if plist_pos < plist_length - 1:
                 self.actionNext.setEnabled(True)
@@ -337,21 +446,39 @@ class ClientMain(Ui_MainWindow):
             self.actionNext.setEnabled(False)
             self.actionPrevious.setEnabled(False)
 
+    def scrub_to_pos(self, position: int) -> None:
+        """Seeks to the nearest keyframe while horizontalSliderPlayback is 
+            being dragged, at most once every SLIDER_SEND_INTERVAL seconds
+
+        Args:
+            position (int): current slider position
+        """        
+        self.slider_commands.submit('seek', self.requester.seek, float(position), exact=False)
+
     def seek_to_pos(self) -> None:
-        """Seeks to position that user has dragged horizontalSliderPlayback 
-            to
+        """Seeks exactly to position that user has dragged 
+            horizontalSliderPlayback to
         """        
         slider_position = float(self.horizontalSliderPlayBack.sliderPosition())
-        res = self.requester.seek(slider_position).json()
-        self.temp_status_message(res)
+        self.slider_commands.submit('seek', self.requester.seek, slider_position, exact=True,
+                                    callback=self.response_message_callback, final=True)
+
+    def drag_volume(self, position: int) -> None:
+        """Changes volume while horizontalSliderVolume is being dragged, at 
+            most once every SLIDER_SEND_INTERVAL seconds
+
+        Args:
+            position (int): current slider position
+        """        
+        self.slider_commands.submit('volume', self.requester.volume, position)
 
     def change_volume(self) -> None:
         """Changes volume to position that user has dragged 
             horizontalSliderVolume to
         """        
         slider_position = int(self.horizontalSliderVolume.sliderPosition())
-        res = self.requester.volume(slider_position).json()
-        self.temp_status_message(res)
+        self.slider_commands.submit('volume', self.requester.volume, slider_position,
+                                    callback=self.response_message_callback, final=True)
 
     def rebuild_playlist(self, playlist: list[str]) -> None:
         """Attempts to rebuild playlist if GUI is exited, but server is kept 
@@ -363,13 +490,14 @@ class ClientMain(Ui_MainWindow):
         self.listWidgetPlaylist.clear()
         for item in playlist:
             self.listWidgetPlaylist.addItem(QtWidgets.QListWidgetItem(item))
+        self.synced_playlist = list(playlist)
+        self.sent_playlists = []
 
     def clear_playlist(self) -> None:
         """Clears all items from playlist and stops playing, is possible
         """        
         self.listWidgetPlaylist.clear()
-        res = self.requester.status().json()
-        if res.get('filename') is not None:
+        if self.player_status.get('filename') is not None:
             self.stop_playing()
 
     def append_to_playlist(self) -> None:
@@ -386,22 +514,190 @@ class ClientMain(Ui_MainWindow):
             for item in items:
                 self.listWidgetPlaylist.addItem(
                     QtWidgets.QListWidgetItem(item))
+            self.sync_playlist()
 
     def play_playlist(self) -> None:
         """Gets playlist items from listWidgetPlaylist and plays starting 
             from index 0
         """        
-        plist = [self.listWidgetPlaylist.item(
-            x).text() for x in range(self.listWidgetPlaylist.count())]
-        res = self.requester.playlist(plist, new=True, index=0).json()
-        if not self.get_stats_timer.isActive():
-            self.get_stats_timer.start()
-        self.temp_status_message(res)
+        plist = self.playlist_items()
+        self.start_playlist(plist, 0)
         if len(plist) > 1:
             self.actionNext.setEnabled(True)
         self.actionPause.setChecked(False)
         self.horizontalSliderPlayBack.setEnabled(True)
 
+    def playlist_items(self) -> list[str]:
+        """Items currently in listWidgetPlaylist
+
+        Returns:
+            list[str]: the playlist, in order
+        """        
+        return [self.listWidgetPlaylist.item(
+            x).text() for x in range(self.listWidgetPlaylist.count())]
+
+    def playlist_matches_server(self) -> bool:
+        """Checks whether the server is still playing the playlist that was 
+            last sent. The local mirror is trusted, the status stream lags 
+            behind the changes this client sends
+
+        Returns:
+            bool: True if only the changes need to be sent
+        """        
+        return self.synced_playlist is not None
+
+    def same_playlist(self, server_names: list[str], plist: list[str]) -> bool:
+        """Compares a playlist reported by the status stream with one sent 
+            by this client. Local files are reported as absolute paths on 
+            the server.
+
+        Args:
+            server_names (list[str]): playlist_names from the status stream
+            plist (list[str]): items as sent
+
+        Returns:
+            bool: True if both hold the same items
+        """        
+        if len(server_names) != len(plist):
+            return False
+        for server_name, item in zip(server_names, plist):
+            if server_name != item and not server_name.replace('\\', '/').endswith(f'/{item}'):
+                return False
+        return True
+
+    def check_synced_playlist(self, server_names: list[str]) -> None:
+        """Forgets synced_playlist when the status stream reports a playlist 
+            this client did not send, e.g. one changed by another client. 
+            Reports while sent changes are still unconfirmed may show them 
+            half applied and are not held against it
+
+        Args:
+            server_names (list[str]): playlist_names from the status stream
+        """        
+        if self.synced_playlist is None:
+            return
+        if self.same_playlist(server_names, self.synced_playlist):
+            self.sent_playlists = []
+        elif len(self.sent_playlists) == 0:
+            self.synced_playlist = None
+            self.statusbar.showMessage('playlist was changed on the server, it will be sent again in full')
+
+    def start_playlist(self, plist: list[str], index: int) -> None:
+        """Plays the playlist starting at index. If the server already has 
+            an earlier version of it, only the differences are sent
+
+        Args:
+            plist (list[str]): the playlist
+            index (int): item to start playing
+        """        
+        if self.playlist_matches_server():
+            ops = diff_playlist(self.synced_playlist, plist) + [{'op': 'jump', 'index': index}]
+            self.playlist_dispatcher.dispatch(self.requester.playlist_ops, ops, callback=self.playlist_ops_callback,
+                                              error_callback=self.playlist_ops_failed)
+        else:
+            self.playlist_dispatcher.dispatch(self.requester.playlist, plist, new=True, index=index,
+                                              callback=self.response_message_callback,
+                                              error_callback=self.playlist_ops_failed)
+            self.sent_playlists = []
+        self.synced_playlist = plist
+        self.sent_playlists.append(plist)
+
+    def sync_playlist(self) -> None:
+        """Sends changes to listWidgetPlaylist right away if the server is 
+            playing it, without interrupting the current item
+        """        
+        if not self.playlist_matches_server():
+            return
+        plist = self.playlist_items()
+        ops = diff_playlist(self.synced_playlist, plist)
+        if len(ops) > 0:
+            self.playlist_dispatcher.dispatch(self.requester.playlist_ops, ops, callback=self.playlist_ops_callback,
+                                              error_callback=self.playlist_ops_failed)
+            self.synced_playlist = plist
+            self.sent_playlists.append(plist)
+
+    def playlist_ops_callback(self, res_full) -> None:
+        """Shows the result of a playlist change, forgets what the server's 
+            playlist holds if it could not be applied
+
+        Args:
+            res_full (Requests.response): The response object returned by the api
+        """        
+        if res_full.status_code != 200:
+            self.synced_playlist = None
+        self.temp_status_message(res_full.json())
+
+    def playlist_ops_failed(self, e: Exception) -> None:
+        """Forgets what the server's playlist holds after a failed change
+
+        Args:
+            e (Exception): the error raised by the request
+        """        
+        self.synced_playlist = None
+        self.request_failed_callback(e)
+
+    def save_playlist(self) -> None:
+        """Asks for a name and saves listWidgetPlaylist on the server under it
+        """        
+        plist = self.playlist_items()
+        if len(plist) == 0:
+            self.statusbar.showMessage('cannot save an empty playlist')
+            return
+        name, ok = QtWidgets.QInputDialog.getText(
+            self.mw, 'Save Playlist', 'Playlist name:')
+        if ok and name.strip():
+            self.dispatcher.dispatch(self.requester.save_playlist, name.strip(), plist,
+                                     callback=self.response_message_callback)
+
+    def choose_saved_playlist(self) -> None:
+        """Requests the saved playlists so one can be chosen to play
+        """        
+        self.dispatcher.dispatch(
+            self.requester.saved_playlists, callback=self.saved_playlists_callback, key='saved_playlists')
+
+    def saved_playlists_callback(self, res_full) -> None:
+        """Lets the user pick one of the saved playlists and plays it
+
+        Args:
+            res_full (Requests.response): The response object returned by the api
+        """        
+        if res_full.status_code != 200:
+            return
+        names = [x['name'] for x in res_full.json().get('playlists')]
+        if len(names) == 0:
+            self.statusbar.showMessage('no saved playlists')
+            return
+        name, ok = QtWidgets.QInputDialog.getItem(
+            self.mw, 'Load Playlist', 'Playlist:', names, 0, False)
+        if ok:
+            self.playlist_dispatcher.dispatch(self.requester.load_playlist, name,
+                                              callback=lambda res: self.saved_playlist_loaded_callback(res, name),
+                                              error_callback=self.playlist_ops_failed)
+
+    def saved_playlist_loaded_callback(self, res_full, name: str) -> None:
+        """Shows the result of loading a saved playlist and fetches its 
+            items to show them in listWidgetPlaylist
+
+        Args:
+            res_full (Requests.response): The response object returned by the api
+            name (str): name of the loaded playlist
+        """        
+        self.temp_status_message(res_full.json())
+        if res_full.status_code == 200:
+            self.actionPause.setChecked(False)
+            self.horizontalSliderPlayBack.setEnabled(True)
+            self.dispatcher.dispatch(self.requester.saved_playlist, name,
+                                     callback=self.saved_playlist_items_callback)
+
+    def saved_playlist_items_callback(self, res_full) -> None:
+        """Shows the items of a loaded playlist in listWidgetPlaylist
+
+        Args:
+            res_full (Requests.response): The response object returned by the api
+        """        
+        if res_full.status_code == 200:
+            self.rebuild_playlist(res_full.json().get('plist'))
+
     def remove_selected_from_playlist(self) -> None:
         """Removes currently selected items from listWidgetPlaylist
         """        
@@ -409,34 +705,31 @@ class ClientMain(Ui_MainWindow):
             for item in self.listWidgetPlaylist.selectedItems():
                 self.listWidgetPlaylist.takeItem(
                     self.listWidgetPlaylist.row(item))
+            self.sync_playlist()
 
     def play_next_item(self) -> None:
         """Plays next playlist item, if possible
         """        
-        res = self.requester.next().json()
-        self.temp_status_message(res)
+        self.dispatcher.dispatch(
+            self.requester.next, callback=self.response_message_callback)
 
     def play_previous_item(self) -> None:
         """Plays previous playlist item, if possible
         """        
-        res = self.requester.previous().json()
-        self.temp_status_message(res)
+        self.dispatcher.dispatch(
+            self.requester.previous, callback=self.response_message_callback)
 
     def play_current_playlist_item(self) -> None:
         """Gets items from listWidgetPlaylist and plays starting on 
             whichever item the user double-clicked
         """        
-        plist = [self.listWidgetPlaylist.item(
-            x).text() for x in range(self.listWidgetPlaylist.count())]
+        plist = self.playlist_items()
         curr_index = self.listWidgetPlaylist.selectedIndexes()[0].row()
-        res = self.requester.playlist(plist, new=True, index=curr_index).json()
-        self.temp_status_message(res)
+        self.start_playlist(plist, curr_index)
         if curr_index > 1:
             self.actionPrevious.setEnabled(True)
         if curr_index < len(plist):
             self.actionNext.setEnabled(True)
-        if not self.get_stats_timer.isActive():
-            self.get_stats_timer.start()
         self.actionPause.setChecked(False)
         self.horizontalSliderPlayBack.setEnabled(True)
 
@@ -0,0 +1,264 @@
+from concurrent.futures import Future
+import asyncio
+import threading
+import time
+import traceback
+
+from PyQt6 import QtCore
+
+class RequestWorkerSignals(QtCore.QObject):
+    finished = QtCore.pyqtSignal()
+    result = QtCore.pyqtSignal(object)
+    error = QtCore.pyqtSignal(object)
+
+class RequestWorker(QtCore.QRunnable):
+    def __init__(self, fn, *args, **kwargs) -> None:
+        """Initializes request worker with a function to run, and the
+            arguments to call it with.
+
+        Args:
+            fn (function): function to call when started
+        """
+        super(RequestWorker, self).__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = RequestWorkerSignals()
+        self.setAutoDelete(False)
+
+    @QtCore.pyqtSlot()
+    def run(self):
+        """Runs the provided function, emits result if successfull, error
+            otherwise and finished in any case
+        """
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            traceback.print_exc()
+            self.signals.error.emit(e)
+        else:
+            self.signals.result.emit(result)
+        finally:
+            self.signals.finished.emit()
+
+class RequestDispatcher(QtCore.QObject):
+    def __init__(self, thread_pool: QtCore.QThreadPool, error_callback=None) -> None:
+        """Runs api calls on a thread pool and hands their results back to
+            the GUI thread through signals.
+
+        Args:
+            thread_pool (QtCore.QThreadPool): pool to run requests on
+            error_callback (function): called with the exception if a
+                request fails and no error callback was given to dispatch()
+        """
+        super(RequestDispatcher, self).__init__()
+        self.thread_pool = thread_pool
+        self.error_callback = error_callback
+        self.active = set()
+        self.queued = {}
+        self.generations = {}
+
+    def dispatch(self, fn, *args, callback=None, error_callback=None, key: str = None, **kwargs) -> RequestWorker:
+        """Runs fn(*args, **kwargs) in the background and calls callback
+            with its result on the GUI thread.
+
+            Requests sharing a key are coalesced: a new one replaces an older
+            one that has not started yet, and results of older ones that
+            were already running are dropped.
+
+        Args:
+            fn (function): function making the request
+            callback (function): called with the result, optional
+            error_callback (function): called with the exception on failure,
+                optional
+            key (str): coalescing key, e.g. 'seek', optional
+
+        Returns:
+            RequestWorker: the worker that was started
+        """
+        worker = RequestWorker(fn, *args, **kwargs)
+        generation = None
+        if key is not None:
+            generation = self.generations.get(key, 0) + 1
+            self.generations[key] = generation
+            stale = self.queued.pop(key, None)
+            if stale is not None and self.thread_pool.tryTake(stale):
+                self.active.discard(stale)
+            self.queued[key] = worker
+        self.active.add(worker)
+        worker.signals.result.connect(
+            lambda res: self._deliver(key, generation, callback, res))
+        worker.signals.error.connect(
+            lambda e: self._deliver(key, generation, error_callback or self.error_callback, e))
+        worker.signals.finished.connect(lambda: self._finished(key, worker))
+        self.thread_pool.start(worker)
+        return worker
+
+    def _deliver(self, key, generation, callback, value) -> None:
+        if callback is None:
+            return
+        if key is not None and self.generations.get(key) != generation:
+            return  # a newer request with the same key superseded this one
+        callback(value)
+
+    def _finished(self, key, worker: RequestWorker) -> None:
+        self.active.discard(worker)
+        if key is not None and self.queued.get(key) is worker:
+            del self.queued[key]
+
+
+class CommandCoalescer(QtCore.QObject):
+    def __init__(self, dispatcher, interval: float) -> None:
+        """Rate limits commands sent while a slider is being dragged. Only the
+            latest value of each command is kept, and it is sent once the
+            previous request of that command has completed and at least
+            interval seconds have passed since it was sent.
+
+        Args:
+            dispatcher (Union[RequestDispatcher, AsyncRequestDispatcher]):
+                dispatcher the commands are sent through
+            interval (float): minimum seconds between two requests of the
+                same command
+        """
+        super(CommandCoalescer, self).__init__()
+        self.dispatcher = dispatcher
+        self.interval = interval
+        self.pending = {}
+        self.in_flight = set()
+        self.last_sent = {}
+        self.timers = {}
+
+    def submit(self, key: str, fn, *args, callback=None, final: bool = False, **kwargs) -> None:
+        """Queues fn(*args, **kwargs) as the latest value of a command,
+            replacing one that was queued before and not sent yet
+
+        Args:
+            key (str): the command, e.g. 'seek'
+            fn (function): function making the request
+            callback (function): called with the result, optional
+            final (bool): the last value of a drag, sent as soon as the
+                previous request has completed, without waiting for interval
+        """
+        self.pending[key] = (fn, args, kwargs, callback, final)
+        self._send(key)
+
+    def _send(self, key: str) -> None:
+        if key in self.in_flight or key not in self.pending:
+            return
+        final = self.pending[key][4]
+        wait = self.last_sent.get(key, 0.0) + self.interval - time.monotonic()
+        if wait > 0 and not final:
+            timer = self.timers.get(key)
+            if timer is None:
+                timer = self.timers[key] = QtCore.QTimer(self)
+                timer.setSingleShot(True)
+                timer.timeout.connect(lambda: self._send(key))
+            if not timer.isActive():
+                timer.start(int(wait * 1000) + 1)
+            return
+        if key in self.timers:
+            self.timers[key].stop()
+        fn, args, kwargs, callback, final = self.pending.pop(key)
+        self.in_flight.add(key)
+        self.last_sent[key] = time.monotonic()
+        error_callback = self.dispatcher.error_callback
+        self.dispatcher.dispatch(fn, *args, callback=lambda res: self._done(key, callback, res),
+                                 error_callback=lambda e: self._done(key, error_callback, e), key=key, **kwargs)
+
+    def _done(self, key: str, callback, value) -> None:
+        self.in_flight.discard(key)
+        if callback is not None:
+            callback(value)
+        self._send(key)
+
+
+def start_event_loop() -> asyncio.AbstractEventLoop:
+    """Runs a new asyncio event loop on a daemon thread, for the async
+        request backend
+
+    Returns:
+        asyncio.AbstractEventLoop: the running loop
+    """
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name='AsyncRequests', daemon=True).start()
+    return loop
+
+class AsyncRequestDispatcher(QtCore.QObject):
+    deliver = QtCore.pyqtSignal(object)
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, error_callback=None, serial: bool = False) -> None:
+        """Runs api coroutines of an AsyncRequester on an event loop and
+            hands their results back to the GUI thread through a signal.
+            Works like RequestDispatcher, without a thread per request.
+
+        Args:
+            loop (asyncio.AbstractEventLoop): loop running on another thread,
+                see start_event_loop()
+            error_callback (function): called with the exception if a
+                request fails and no error callback was given to dispatch()
+            serial (bool): send one request at a time, in the order they
+                were dispatched
+        """
+        super(AsyncRequestDispatcher, self).__init__()
+        self.loop = loop
+        self.error_callback = error_callback
+        self.generations = {}
+        self.serial = serial
+        self._lock = None
+        self.deliver.connect(lambda deliver: deliver())
+
+    @property
+    def lock(self) -> asyncio.Lock:
+        """Serializes requests if serial was set, created on first use from
+            the event loop since the dispatcher is created on the GUI thread"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    def dispatch(self, fn, *args, callback=None, error_callback=None, key: str = None, **kwargs) -> Future:
+        """Runs the coroutine fn(*args, **kwargs) and calls callback with its
+            result on the GUI thread.
+
+            Requests sharing a key are coalesced: a new one replaces an older
+            one that has not been sent yet, and results of older ones that
+            were already sent are dropped.
+
+        Args:
+            fn (function): coroutine function making the request
+            callback (function): called with the result, optional
+            error_callback (function): called with the exception on failure,
+                optional
+            key (str): coalescing key, e.g. 'seek', optional
+
+        Returns:
+            Future: the pending request
+        """
+        generation = None
+        if key is not None:
+            generation = self.generations.get(key, 0) + 1
+            self.generations[key] = generation
+        return asyncio.run_coroutine_threadsafe(
+            self._run(fn, args, kwargs, key, generation, callback, error_callback or self.error_callback), self.loop)
+
+    async def _run(self, fn, args, kwargs, key, generation, callback, error_callback) -> None:
+        if key is not None and self.generations.get(key) != generation:
+            return  # superseded before it was sent
+        try:
+            if self.serial:
+                async with self.lock:
+                    result = await fn(*args, **kwargs)
+            else:
+                result = await fn(*args, **kwargs)
+        except Exception as e:
+            traceback.print_exc()
+            error = e  # e is unbound once the except block ends
+            self.deliver.emit(lambda: self._deliver(key, generation, error_callback, error))
+        else:
+            self.deliver.emit(lambda: self._deliver(key, generation, callback, result))
+
+    def _deliver(self, key, generation, callback, value) -> None:
+        if callback is None:
+            return
+        if key is not None and self.generations.get(key) != generation:
+            return  # a newer request with the same key superseded this one
+        callback(value)
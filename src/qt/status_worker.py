@@ -0,0 +1,56 @@
+import json
+import time
+import traceback
+
+from PyQt6 import QtCore
+
+class StatusWorkerSignals(QtCore.QObject):
+    changed = QtCore.pyqtSignal(dict)
+
+class StatusWorker(QtCore.QRunnable):
+    def __init__(self, fn, retry_delay: float = 2.0) -> None:
+        """Initializes status worker with a function that opens the
+            status event stream.
+
+        Args:
+            fn (function): function returning a streamed response of
+                server-sent events
+            retry_delay (float): seconds to wait before reconnecting after
+                the stream broke
+        """
+        super(StatusWorker, self).__init__()
+        self.fn = fn
+        self.retry_delay = retry_delay
+        self.response = None
+        self.running = True
+        self.signals = StatusWorkerSignals()
+        self.setAutoDelete(True)
+
+    def stop(self) -> None:
+        """Stops listening, closing the stream unblocks a pending read
+        """
+        self.running = False
+        if self.response is not None:
+            self.response.close()
+
+    @QtCore.pyqtSlot()
+    def run(self):
+        """Reads status events until stopped and emits the changed fields
+            of each one, reconnects if the connection is lost
+        """
+        while self.running:
+            try:
+                self.response = self.fn()
+                for line in self.response.iter_lines(decode_unicode=True):
+                    if not self.running:
+                        break
+                    if line and line.startswith('data:'):
+                        self.signals.changed.emit(json.loads(line[5:]))
+            except:
+                if self.running:
+                    traceback.print_exc()
+            finally:
+                if self.response is not None:
+                    self.response.close()
+            if self.running:
+                time.sleep(self.retry_delay)
@@ -1,4 +1,26 @@
+from pathlib import Path
+
 SERVER = 'http://127.0.0.1:5555'
+# 'requests', or 'httpx' for the asyncio backend with HTTP/2, needs httpx and h2 from requirements.txt
+REQUEST_BACKEND = 'requests'
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+UPLOAD_PARALLEL_CHUNKS = 4
+UPLOAD_CHUNK_RETRIES = 3
+# ids of chunked uploads that broke off, so they can be resumed after the client restarts
+UPLOAD_STATE_FILE = Path.home() / '.pympvremote_uploads.json'
+# the server forgets idle uploads after a day
+UPLOAD_STATE_MAX_AGE = 24 * 60 * 60
+VERIFY_TLS = True
+REQUEST_POOL_SIZE = 16
+REQUEST_RETRIES = 3
+REQUEST_RETRY_BACKOFF = 0.25
+REQUEST_CONNECT_TIMEOUT = 3.05
+REQUEST_TIMEOUT = 10.0
+PLAY_REQUEST_TIMEOUT = 45.0
+UPLOAD_REQUEST_TIMEOUT = 300.0
+STATUS_STREAM_TIMEOUT = 45.0
+# seconds between seek or volume requests while a slider is dragged
+SLIDER_SEND_INTERVAL = 0.1
 
 if __name__ == '__main__':
     pass
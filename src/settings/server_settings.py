@@ -6,6 +6,23 @@ LOG_LEVEL = 'info'
 FULLSCREEN = False
 ON_TOP = False
 MEDIA_DIR = Path(__file__).parent.parent.parent / 'media'
+STATUS_STREAM_INTERVAL = 0.1
+STATUS_STREAM_KEEPALIVE = 15
+PROGRESSIVE_START_BYTES = 4 * 1024 * 1024
+PLAY_TIMEOUT = 30.0
+PAUSE_TIMEOUT = 5.0
+LIBRARY_RESCAN_INTERVAL = 300.0
+MAX_UPLOAD_CHUNK_SIZE = 64 * 1024 * 1024
+SPOOL_MAX_BYTES = 20 * 1024 * 1024 * 1024
+SPOOL_MAX_AGE = 24 * 60 * 60
+SPOOL_CHECK_INTERVAL = 60.0
+PLAYLIST_DB = Path(__file__).parent.parent.parent / '.playlists.sqlite3'
+YTDL_FORMAT = 'bestvideo[height<=?1080]+bestaudio/best'
+YTDL_CACHE_TTL = 30 * 60
+YTDL_WORKERS = 2
+YTDL_PREFETCH_COUNT = 2
+YTDL_HOOK_TIMEOUT = 20.0
+YTDL_CACHE_DB = Path(__file__).parent.parent.parent / '.ytdl_cache.sqlite3'
 
 if __name__ == '__main__':
     pass
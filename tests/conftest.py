@@ -0,0 +1,5 @@
+from pathlib import Path
+import sys
+
+# the modules are imported the way the server and client import them
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
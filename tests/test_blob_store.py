@@ -0,0 +1,59 @@
+from pathlib import Path
+import hashlib
+import io
+import os
+
+import pytest
+
+from modules.blob_store import BlobStore
+
+
+def sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def test_path_rejects_invalid_digests(tmp_path):
+    store = BlobStore(tmp_path)
+    with pytest.raises(ValueError):
+        store.path('../etc/passwd')
+    assert not store.has('not-a-digest')
+    digest = sha256(b'')
+    assert store.path(digest) == Path(tmp_path, digest[:2], digest)
+
+
+def test_add_moves_file_and_drops_duplicates(tmp_path):
+    store = BlobStore(Path(tmp_path, 'blobs'))
+    digest = sha256(b'content')
+    for name in ('first', 'second'):
+        source = Path(tmp_path, name)
+        source.write_bytes(b'content')
+        assert store.add(source, digest) == store.path(digest)
+        assert not source.exists()
+    assert store.path(digest).read_bytes() == b'content'
+
+
+def test_add_fileobj_hashes_and_stores(tmp_path):
+    store = BlobStore(tmp_path)
+    data = os.urandom(3 * 1024 * 1024 + 5)
+    fo = io.BytesIO(data)
+    fo.seek(100)
+    digest = store.add_fileobj(fo)
+    assert digest == sha256(data)
+    assert store.path(digest).read_bytes() == data
+    assert store.add_fileobj(io.BytesIO(data)) == digest
+    assert not list(tmp_path.glob('*.part'))
+
+
+def test_link_and_discard_unlinked(tmp_path):
+    store = BlobStore(Path(tmp_path, 'blobs'))
+    digest = store.add_fileobj(io.BytesIO(b'shared'))
+    name = Path(tmp_path, 'video.mkv')
+    store.link(digest, name)
+    assert name.read_bytes() == b'shared'
+    if store.is_linked(digest, name):
+        # still published under a name, so it stays
+        assert not store.discard_unlinked(digest)
+        name.unlink()
+    assert store.discard_unlinked(digest)
+    assert not store.has(digest)
+    assert not store.discard_unlinked(digest)
@@ -0,0 +1,82 @@
+from pathlib import Path
+import asyncio
+import hashlib
+import os
+import time
+
+import pytest
+
+from modules.chunked_upload import ChecksumMismatchError, UploadManager
+
+CHUNK = 1024
+
+
+async def parts(data: bytes, size: int = 300):
+    for offset in range(0, len(data), size):
+        yield data[offset:offset + size]
+
+
+def write(manager, session, index, data, checksum=True):
+    chunk = data[index * CHUNK:(index + 1) * CHUNK]
+    digest = hashlib.sha256(chunk).hexdigest() if checksum else None
+    asyncio.run(manager.write_chunk(session, index * CHUNK, parts(chunk), digest))
+
+
+@pytest.fixture
+def upload(tmp_path):
+    manager = UploadManager(Path(tmp_path, 'uploads'))
+    data = os.urandom(4 * CHUNK + 100)
+    session = manager.create('clip.mkv', len(data), CHUNK, 'media', hashlib.sha256(data).hexdigest())
+    return manager, session, data
+
+
+def test_chunks_in_any_order(upload):
+    manager, session, data = upload
+    assert session.chunk_count == 5
+    for index in (3, 0, 4, 1):
+        write(manager, session, index, data)
+    assert session.missing == [2]
+    assert session.offset == 2 * CHUNK
+    assert not session.complete
+    assert session.hexdigest is None
+    write(manager, session, 2, data)
+    assert session.complete
+    assert asyncio.run(manager.finish_digest(session)) == hashlib.sha256(data).hexdigest()
+    assert session.path.read_bytes() == data
+
+
+def test_checksum_mismatch_is_not_received(upload):
+    manager, session, data = upload
+    with pytest.raises(ChecksumMismatchError):
+        asyncio.run(manager.write_chunk(session, 0, parts(data[:CHUNK]), hashlib.sha256(b'other').hexdigest()))
+    assert 0 in session.missing
+
+
+@pytest.mark.parametrize('offset, length', [(1, CHUNK), (5 * CHUNK, 100), (0, CHUNK - 1), (4 * CHUNK, 101)])
+def test_rejects_bad_offsets_and_lengths(upload, offset, length):
+    manager, session, _data = upload
+    with pytest.raises(ValueError):
+        asyncio.run(manager.write_chunk(session, offset, parts(b'x' * length), None))
+
+
+def test_rewritten_chunk_counts_once_verified(upload):
+    manager, session, data = upload
+    write(manager, session, 0, data)
+    with pytest.raises(ChecksumMismatchError):
+        asyncio.run(manager.write_chunk(session, 0, parts(data[:CHUNK]), hashlib.sha256(b'other').hexdigest()))
+    assert 0 in session.missing
+    write(manager, session, 0, data, checksum=False)
+    assert 0 not in session.missing
+
+
+def test_expire_and_remove(tmp_path):
+    manager = UploadManager(Path(tmp_path, 'uploads'), max_idle=60)
+    idle = manager.create('a', 10, CHUNK, 'media')
+    active = manager.create('b', 10, CHUNK, 'media')
+    idle.updated = time.time() - 120
+    manager.expire()
+    assert manager.get(idle.upload_id) is None
+    assert not idle.path.exists()
+    assert manager.get(active.upload_id) is active
+    manager.remove(active.upload_id)
+    assert not active.path.exists()
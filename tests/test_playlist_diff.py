@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+from modules.playlist_diff import diff_playlist
+
+
+def apply_ops(playlist: list[str], ops: list[dict]) -> list[str]:
+    """Applies operations the way /playlist/ops does"""
+    playlist = list(playlist)
+    for op in ops:
+        if op['op'] == 'append':
+            playlist.append(op['item'])
+        elif op['op'] == 'insert':
+            playlist.insert(op['index'], op['item'])
+        elif op['op'] == 'move':
+            playlist.insert(op['to'], playlist.pop(op['index']))
+        elif op['op'] == 'remove':
+            del playlist[op['index']]
+    return playlist
+
+
+@pytest.mark.parametrize('old, new', [
+    ([], []),
+    ([], ['a', 'b']),
+    (['a', 'b'], []),
+    (['a', 'b', 'c'], ['a', 'b', 'c']),
+    (['a', 'b', 'c'], ['a', 'x', 'c']),
+    (['a', 'b', 'c'], ['c', 'a', 'b']),
+    (['a', 'b', 'c', 'd'], ['d', 'c', 'b', 'a']),
+    (['a', 'a', 'b'], ['b', 'a', 'a', 'a']),
+])
+def test_ops_turn_old_into_new(old, new):
+    assert apply_ops(old, diff_playlist(old, new)) == new
+
+
+def test_unchanged_playlist_needs_no_ops():
+    assert diff_playlist(['a', 'b', 'c'], ['a', 'b', 'c']) == []
+
+
+def test_append_at_end():
+    assert diff_playlist(['a'], ['a', 'b']) == [{'op': 'append', 'item': 'b'}]
+
+
+def test_reordered_item_is_moved_not_reloaded():
+    ops = diff_playlist(['a', 'b', 'c', 'd'], ['a', 'c', 'd', 'b'])
+    assert [x['op'] for x in ops] == ['move']
+
+
+def test_random_playlists():
+    rng = random.Random(0)
+    for _ in range(2000):
+        old = [rng.choice('abcdefg') for _ in range(rng.randrange(12))]
+        new = [rng.choice('abcdefgh') for _ in range(rng.randrange(12))]
+        if rng.random() < 0.5:
+            new = rng.sample(old, len(old))
+        ops = diff_playlist(old, new)
+        assert apply_ops(old, ops) == new, (old, new, ops)
+        # items are only removed and added again if their count changed
+        assert sum(x['op'] == 'remove' for x in ops) == sum(max(old.count(x) - new.count(x), 0) for x in set(old))
@@ -0,0 +1,45 @@
+from pathlib import Path
+
+import pytest
+
+from modules.playlist_store import PlaylistStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return PlaylistStore(Path(tmp_path, 'data', 'playlists.sqlite3'))
+
+
+def test_save_and_read_back(store):
+    items = [f'https://example.com/{x}' for x in range(1000)] + ['a.mkv', 'a.mkv']
+    store.save('evening', items)
+    assert store.items('evening') == items
+    assert store.items('missing') is None
+
+
+def test_save_replaces(store):
+    store.save('list', ['a', 'b', 'c'])
+    store.save('list', ['c'])
+    assert store.items('list') == ['c']
+    assert [(x['name'], x['count']) for x in store.summaries()] == [('list', 1)]
+
+
+def test_summaries_sorted_by_name(store):
+    store.save('b', ['x'])
+    store.save('a', [])
+    assert [x['name'] for x in store.summaries()] == ['a', 'b']
+    assert store.items('a') == []
+
+
+def test_delete_removes_items(store):
+    store.save('gone', ['a', 'b'])
+    assert store.delete('gone')
+    assert not store.delete('gone')
+    assert store.items('gone') is None
+    assert store.db.execute('SELECT COUNT(*) FROM playlist_items').fetchone()[0] == 0
+
+
+def test_survives_reopening(tmp_path):
+    db_file = Path(tmp_path, 'playlists.sqlite3')
+    PlaylistStore(db_file).save('kept', ['a'])
+    assert PlaylistStore(db_file).items('kept') == ['a']
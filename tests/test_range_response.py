@@ -0,0 +1,96 @@
+from pathlib import Path
+
+import pytest
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from modules.range_response import RangeFileResponse, parse_range, CHUNK_SIZE
+
+
+@pytest.mark.parametrize('header, expected', [
+    ('bytes=0-99', (0, 99)),
+    ('bytes=100-', (100, 999)),
+    ('bytes=-100', (900, 999)),
+    ('bytes=-5000', (0, 999)),
+    ('bytes=900-5000', (900, 999)),
+    ('bytes=0-0', (0, 0)),
+    (' bytes=1-2 ', (1, 2)),
+    ('bytes=0-1,5-6', None),
+    ('bytes=-', None),
+    ('items=0-1', None),
+])
+def test_parse_range(header, expected):
+    assert parse_range(header, 1000) == expected
+
+
+@pytest.mark.parametrize('header, size', [
+    ('bytes=1000-', 1000),
+    ('bytes=5-4', 1000),
+    ('bytes=-0', 1000),
+    ('bytes=-10', 0),
+])
+def test_parse_range_not_satisfiable(header, size):
+    with pytest.raises(ValueError):
+        parse_range(header, size)
+
+
+@pytest.fixture
+def media(tmp_path):
+    data = bytes(range(256)) * (3 * CHUNK_SIZE // 256 + 7)
+    path = Path(tmp_path, 'clip.mkv')
+    path.write_bytes(data)
+
+    async def serve(request: Request):
+        return RangeFileResponse(path, request.headers)
+    client = TestClient(Starlette(routes=[Route('/clip', serve, methods=['GET', 'HEAD'])]))
+    return client, data
+
+
+def test_whole_file(media):
+    client, data = media
+    res = client.get('/clip')
+    assert res.status_code == 200
+    assert res.content == data
+    assert res.headers['content-length'] == str(len(data))
+    assert res.headers['accept-ranges'] == 'bytes'
+
+
+def test_range_across_chunks(media):
+    client, data = media
+    first, last = CHUNK_SIZE - 10, 2 * CHUNK_SIZE + 10
+    res = client.get('/clip', headers={'Range': f'bytes={first}-{last}'})
+    assert res.status_code == 206
+    assert res.content == data[first:last + 1]
+    assert res.headers['content-range'] == f'bytes {first}-{last}/{len(data)}'
+
+
+def test_unsatisfiable_range(media):
+    client, data = media
+    res = client.get('/clip', headers={'Range': f'bytes={len(data)}-'})
+    assert res.status_code == 416
+    assert res.headers['content-range'] == f'bytes */{len(data)}'
+
+
+def test_not_modified(media):
+    client, _data = media
+    etag = client.get('/clip').headers['etag']
+    res = client.get('/clip', headers={'If-None-Match': etag})
+    assert res.status_code == 304
+    assert res.content == b''
+
+
+def test_stale_if_range_sends_whole_file(media):
+    client, data = media
+    res = client.get('/clip', headers={'Range': 'bytes=0-9', 'If-Range': '"stale"'})
+    assert res.status_code == 200
+    assert res.content == data
+
+
+def test_head_has_no_body(media):
+    client, data = media
+    res = client.head('/clip')
+    assert res.status_code == 200
+    assert res.content == b''
+    assert res.headers['content-length'] == str(len(data))
@@ -0,0 +1,80 @@
+from pathlib import Path
+import threading
+import time
+
+import pytest
+
+try:
+    from modules.spool_stream import SpoolFile, SpoolStream
+except OSError:
+    # modules.mpv raises OSError when libmpv is missing
+    pytest.skip('libmpv is not installed', allow_module_level=True)
+
+
+@pytest.fixture
+def spool(tmp_path):
+    path = Path(tmp_path, 'spool.mkv')
+    path.touch()
+    return SpoolFile(path, None)
+
+
+def append(spool, data: bytes) -> None:
+    with spool.path.open('ab') as fo:
+        fo.write(data)
+    spool.extend(len(data))
+
+
+def test_finish_settles_size(spool):
+    append(spool, b'abc')
+    assert spool.finished is None
+    spool.finish()
+    assert spool.complete
+    assert spool.size == 3
+    assert spool.finished is not None
+
+
+def test_finish_caps_announced_size(tmp_path):
+    path = Path(tmp_path, 'short.mkv')
+    path.touch()
+    spool = SpoolFile(path, 100)
+    spool.extend(0)
+    spool.finish()
+    assert spool.size == 0
+
+
+def test_reader_waits_for_data(spool):
+    stream = SpoolStream(spool)
+    received = []
+    reader = threading.Thread(target=lambda: received.append(stream.read(10)))
+    reader.start()
+    time.sleep(0.05)
+    assert not received
+    append(spool, b'hello')
+    reader.join(1)
+    assert received == [b'hello']
+    spool.finish()
+    assert stream.read(10) == b''
+    stream.close()
+
+
+def test_readinto_and_seek(spool):
+    append(spool, b'0123456789')
+    spool.finish()
+    stream = SpoolStream(spool)
+    buf = bytearray(4)
+    assert stream.seek(6) == 6
+    assert stream.readinto(memoryview(buf)) == 4
+    assert bytes(buf) == b'6789'
+    assert stream.seek(11) < 0
+    stream.close()
+
+
+def test_cancel_wakes_reader(spool):
+    stream = SpoolStream(spool)
+    received = []
+    reader = threading.Thread(target=lambda: received.append(stream.read(10)))
+    reader.start()
+    stream.cancel()
+    reader.join(1)
+    assert received == [b'']
+    stream.close()